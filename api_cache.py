@@ -0,0 +1,370 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+import contextvars
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import fast_json
+
+log = logging.getLogger("DataMind")
+
+_MISSING = object()
+
+# Resultados ya obtenidos en la petición en curso (la precarga asíncrona de
+# /predict), también los vacíos que la caché no guarda: get_or_load los sirve
+# antes de mirar la caché o llamar a la red.
+_request_values: contextvars.ContextVar[Optional[Dict[Tuple[str, str], Any]]] = contextvars.ContextVar(
+    "datamind_request_values", default=None
+)
+
+
+@contextmanager
+def request_values(values: Optional[Dict[Tuple[str, str], Any]] = None):
+    """Abre (o reanuda, si se pasa `values`) los resultados de una petición."""
+    if values is None:
+        values = {}
+    token = _request_values.set(values)
+    try:
+        yield values
+    finally:
+        _request_values.reset(token)
+
+
+def remember(namespace: str, key: str, value: Any) -> None:
+    """Anota `value` en los resultados de la petición en curso, si la hay."""
+    values = _request_values.get()
+    if values is not None:
+        values[(namespace, key)] = value
+
+
+# ==========================================
+#  CACHÉ TTL + LRU PARA API-FOOTBALL
+# ==========================================
+class _InFlight:
+    """Llamada en curso para una clave: los demás hilos esperan su resultado."""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """
+    Caché en memoria con caducidad por espacio de nombres y desalojo LRU
+    acotado por número de entradas y por bytes aproximados (tamaño del JSON).
+    Opcionalmente persiste en SQLite para sobrevivir reinicios, y une los
+    fallos concurrentes de una misma clave en una sola llamada real.
+    Las entradas caducadas se conservan (hasta `max_stale` s, o hasta que
+    el LRU las desaloje) para servirlas si el proveedor no responde.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        max_bytes: int = 16 * 1024 * 1024,
+        db_path: Optional[str] = None,
+        max_stale: float = 7 * 24 * 3600,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.max_stale = max_stale
+
+        # (namespace, key) -> (expires_at, size, value)
+        self._data: "OrderedDict[Tuple[str, str], Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], _InFlight] = {}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._db_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.db_hits = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.stale_served = 0
+        self.request_hits = 0
+
+    # ---------- memoria ----------
+    def _get_mem(self, ck: Tuple[str, str], stale: bool = False) -> Any:
+        with self._lock:
+            entry = self._data.get(ck)
+            if entry is None:
+                return _MISSING
+            expires_at, size, value = entry
+            now = time.time()
+            if expires_at < now - (self.max_stale if stale else 0):
+                if expires_at < now - self.max_stale:
+                    del self._data[ck]
+                    self._bytes -= size
+                return _MISSING
+            self._data.move_to_end(ck)
+            return value
+
+    def _set_mem(self, ck: Tuple[str, str], value: Any, expires_at: float, size: int) -> None:
+        with self._lock:
+            old = self._data.pop(ck, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[ck] = (expires_at, size, value)
+            self._bytes += size
+            while self._data and (
+                len(self._data) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, old_size, _) = self._data.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    # ---------- SQLite ----------
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Tabla compartida entre workers: sin fsync por cada entrada
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = pid
+        return self._conn
+
+    def _get_db(self, ck: Tuple[str, str], stale: bool = False) -> Tuple[Any, float, int]:
+        try:
+            with self._db_lock:
+                conn = self._db()
+                if conn is None:
+                    return _MISSING, 0.0, 0
+                row = conn.execute(
+                    "SELECT value, expires_at FROM api_cache WHERE namespace = ? AND key = ?",
+                    ck,
+                ).fetchone()
+        except Exception as e:
+            log.error(f"Error leyendo caché persistente: {e}")
+            return _MISSING, 0.0, 0
+        if row is None or row[1] < time.time() - (self.max_stale if stale else 0):
+            return _MISSING, 0.0, 0
+        return fast_json.loads(row[0]), row[1], len(row[0])
+
+    def _set_db(self, ck: Tuple[str, str], payload: str, expires_at: float) -> None:
+        try:
+            with self._db_lock:
+                conn = self._db()
+                if conn is None:
+                    return
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO api_cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                        (ck[0], ck[1], payload, expires_at),
+                    )
+        except Exception as e:
+            log.error(f"Error guardando caché persistente: {e}")
+
+    # ---------- API pública ----------
+    def get(self, namespace: str, key: str) -> Any:
+        """Valor vigente o None (busca en memoria y luego en SQLite)."""
+        ck = (namespace, key)
+        value = self._get_mem(ck)
+        if value is not _MISSING:
+            return value
+        value, expires_at, size = self._get_db(ck)
+        if value is _MISSING:
+            return None
+        self._set_mem(ck, value, expires_at, size)
+        return value
+
+    def get_memory(self, namespace: str, key: str) -> Any:
+        """Valor vigente en memoria o None, sin tocar SQLite (servidor asíncrono)."""
+        value = self._get_mem((namespace, key))
+        return None if value is _MISSING else value
+
+    def get_stale(self, namespace: str, key: str) -> Any:
+        """Último valor conocido aunque haya caducado (hasta `max_stale`), o None."""
+        ck = (namespace, key)
+        value = self._get_mem(ck, stale=True)
+        if value is _MISSING:
+            value = self._get_db(ck, stale=True)[0]
+        return None if value is _MISSING else value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        ck = (namespace, key)
+        payload = fast_json.dumps(value)
+        expires_at = time.time() + ttl
+        self._set_mem(ck, value, expires_at, len(payload))
+        self._set_db(ck, payload, expires_at)
+
+    def ttl_left(self, namespace: str, key: str) -> Optional[float]:
+        """Segundos hasta que caduque la entrada, o None si no hay una vigente."""
+        ck = (namespace, key)
+        with self._lock:
+            entry = self._data.get(ck)
+        expires_at = entry[0] if entry is not None else self._get_db(ck)[1]
+        left = expires_at - time.time()
+        return left if left > 0 else None
+
+    def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Any],
+        stale_on: Tuple[type, ...] = (),
+    ) -> Any:
+        """
+        Devuelve el valor cacheado o llama a `loader` una sola vez aunque
+        varios hilos pidan la misma clave a la vez.
+        Los resultados vacíos (None, {}, []) no se guardan: los helpers
+        devuelven eso también cuando falla la red.
+        Si `loader` lanza una de `stale_on` se sirve el valor caducado, si lo hay.
+        Dentro de request_values() sirve primero lo anotado para la petición.
+        """
+        ck = (namespace, key)
+        values = _request_values.get()
+        if values is not None and ck in values:
+            self.request_hits += 1
+            return values[ck]
+
+        value = self._get_mem(ck)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(ck)
+            leader = flight is None
+            if leader:
+                flight = _InFlight()
+                self._inflight[ck] = flight
+
+        if not leader:
+            self.coalesced += 1
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value, expires_at, size = self._get_db(ck)
+            if value is not _MISSING:
+                self.db_hits += 1
+                self._set_mem(ck, value, expires_at, size)
+            else:
+                self.misses += 1
+                try:
+                    value = loader()
+                except stale_on:
+                    value = self.get_stale(namespace, key)
+                    if value is None:
+                        raise
+                    self.stale_served += 1
+                else:
+                    if value:
+                        self.set(namespace, key, value, ttl)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(ck, None)
+            flight.event.set()
+
+    def clear(self) -> None:
+        """Vacía la memoria (no toca SQLite)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Elimina entradas caducadas hace más de `max_stale` de memoria y de SQLite."""
+        now = time.time() - self.max_stale
+        removed = 0
+        with self._lock:
+            for ck in [ck for ck, entry in self._data.items() if entry[0] < now]:
+                self._bytes -= self._data.pop(ck)[1]
+                removed += 1
+        try:
+            with self._db_lock:
+                conn = self._db()
+                if conn is not None:
+                    with conn:
+                        removed += conn.execute(
+                            "DELETE FROM api_cache WHERE expires_at < ?", (now,)
+                        ).rowcount
+        except Exception as e:
+            log.error(f"Error purgando caché persistente: {e}")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "stale_served": self.stale_served,
+            "request_hits": self.request_hits,
+            "persistent": bool(self.db_path),
+        }
+
+
+def cache_key(*args: Any) -> str:
+    """Clave de caché para unos argumentos (la misma que usa @cached)."""
+    return json.dumps(args, ensure_ascii=False, default=str)
+
+
+def cached(cache: TTLCache, namespace: str, ttl: float, stale_on: Tuple[type, ...] = ()) -> Callable:
+    """
+    Decorador: cachea la función por sus argumentos posicionales.
+    Las excepciones de `stale_on` se cambian por el último valor conocido.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args: Any) -> Any:
+            key = cache_key(*args)
+            return cache.get_or_load(namespace, key, ttl, lambda: fn(*args), stale_on)
+
+        def prime(value: Any, *args: Any) -> None:
+            """Guarda `value` como resultado de fn(*args) (precarga)."""
+            cache.set(namespace, cache_key(*args), value, ttl)
+
+        def ttl_left(*args: Any) -> Optional[float]:
+            return cache.ttl_left(namespace, cache_key(*args))
+
+        wrapper.uncached = fn
+        wrapper.prime = prime
+        wrapper.ttl_left = ttl_left
+        return wrapper
+
+    return decorator
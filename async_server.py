@@ -0,0 +1,412 @@
+import os
+import asyncio
+import logging
+import itertools
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+
+import datamind_server as dm
+import fast_json
+from api_cache import cache_key, remember, request_values
+from http_client import deadline
+from upstream import UpstreamUnavailable
+
+log = logging.getLogger("DataMind")
+# httpx registra cada petición en INFO; demasiado ruido para el log del servicio
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+ASYNC_CLIENT_SHARDS = int(os.getenv("ASYNC_CLIENT_SHARDS", 16))
+ASYNC_CONNECTIONS_PER_SHARD = int(os.getenv("ASYNC_CONNECTIONS_PER_SHARD", 8))
+ASYNC_MAX_BODY = int(os.getenv("ASYNC_MAX_BODY", 1024 * 1024))
+
+
+# ==========================================
+#  CLIENTE ASÍNCRONO DE API-FOOTBALL
+# ==========================================
+class AsyncFootballClient:
+    """
+    Versión asíncrona de los helpers de API-FOOTBALL sobre httpx.AsyncClient.
+    Usa la misma caché (y las mismas claves) que los helpers síncronos, de modo
+    que lo que trae aquí lo encuentran los build_*_analysis sin tocar la red.
+    Dentro de api_cache.request_values() anota además cada resultado, también
+    los vacíos que la caché no guarda, para que el builder de esa petición
+    no repita la llamada.
+    En el bucle sólo se consulta la memoria; lo que toca SQLite (caché
+    persistente, índice de equipos) va a un hilo con asyncio.to_thread.
+    """
+
+    def __init__(self, base_url: str = "", api_key: str = "") -> None:
+        self.base_url = (base_url or dm.API_FOOTBALL_BASE).rstrip("/")
+        self.api_key = api_key or dm.API_FOOTBALL_KEY
+        self.cache = dm.api_cache
+        # Mismo cupo, breaker y cola que los helpers síncronos
+        self.upstream = dm.upstream_scheduler
+        # El pool de httpcore recorre todas sus conexiones en cada petición y se
+        # degrada con pools grandes; varios clientes pequeños escalan mejor.
+        self._clients = [
+            httpx.AsyncClient(
+                headers={"x-apisports-key": self.api_key},
+                limits=httpx.Limits(
+                    max_connections=ASYNC_CONNECTIONS_PER_SHARD,
+                    max_keepalive_connections=ASYNC_CONNECTIONS_PER_SHARD,
+                ),
+            )
+            for _ in range(max(1, ASYNC_CLIENT_SHARDS))
+        ]
+        self._next_client = itertools.cycle(self._clients)
+        self._inflight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(c.aclose() for c in self._clients))
+
+    async def _cached(
+        self, namespace: str, ttl: float, args: Tuple[Any, ...], load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        key = cache_key(*args)
+        value = await self._lookup(namespace, key, ttl, load)
+        remember(namespace, key, value)
+        return value
+
+    async def _lookup(
+        self, namespace: str, key: str, ttl: float, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = self.cache.get_memory(namespace, key)
+        if value is not None:
+            self.cache.hits += 1
+            return value
+
+        # Una sola llamada real por clave aunque lleguen muchas a la vez
+        ck = (namespace, key)
+        pending = self._inflight.get(ck)
+        if pending is not None:
+            self.cache.coalesced += 1
+            return await asyncio.shield(pending)
+
+        fut: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._inflight[ck] = fut
+        try:
+            if self.cache.db_path:
+                # Lo que ya trajo otro worker (tabla api_cache)
+                value = await asyncio.to_thread(self.cache.get, namespace, key)
+            if value is not None:
+                self.cache.hits += 1
+            else:
+                self.cache.misses += 1
+                try:
+                    value = await load()
+                except UpstreamUnavailable:
+                    value = await asyncio.to_thread(self.cache.get_stale, namespace, key)
+                    if value is None:
+                        raise
+                    self.cache.stale_served += 1
+                else:
+                    if value:
+                        await asyncio.to_thread(self.cache.set, namespace, key, value, ttl)
+            fut.set_result(value)
+            return value
+        except BaseException as e:
+            fut.set_exception(e)
+            # Evita el aviso "exception was never retrieved" si nadie esperaba
+            fut.exception()
+            raise
+        finally:
+            self._inflight.pop(ck, None)
+
+    async def _get(self, path: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        await self.upstream.acquire_async()
+        self.upstream.requests += 1
+        try:
+            try:
+                r = await next(self._next_client).get(f"{self.base_url}{path}", params=params, timeout=timeout)
+                data = r.json() if r.status_code < 500 and r.status_code != 429 else None
+            except (httpx.HTTPError, ValueError) as e:
+                self.upstream.record_failure()
+                raise UpstreamUnavailable(f"Error de red con API-FOOTBALL: {e}") from e
+            return self.upstream.check_response(r.status_code, r.headers, data)
+        finally:
+            self.upstream.breaker.release()
+
+    async def get_team_id(self, team_name: str) -> Optional[int]:
+        if not team_name:
+            return None
+        team_id = dm.team_index.resolve(team_name)
+        # Alias que otro worker acaba de añadir antes de ir a la red
+        if not team_id and await asyncio.to_thread(dm.team_index.refresh):
+            team_id = dm.team_index.resolve(team_name)
+        if team_id:
+            return team_id
+        if not self.api_key:
+            return None
+
+        async def load() -> Optional[int]:
+            try:
+                data = await self._get("/teams", {"search": team_name}, 10)
+                res = data.get("response") or []
+                if not res:
+                    return None
+                team = res[0]["team"]
+                await asyncio.to_thread(dm.team_index.add, team_name, team["id"], canonical=team.get("name"))
+                return team["id"]
+            except UpstreamUnavailable:
+                raise
+            except Exception as e:
+                log.error(f"Error buscando ID de equipo '{team_name}': {e}")
+                return None
+
+        return await self._cached("team_id", dm.API_CACHE_TTL_TEAMS, (team_name,), load)
+
+    async def get_h2h_fixture(self, id_a: int, id_b: int) -> Dict[str, Any]:
+        """Mismo espacio de caché que dm.get_h2h_fixture (IDs en orden ascendente)."""
+
+        async def load() -> Dict[str, Any]:
+            try:
+                data = await self._get(
+                    "/fixtures",
+                    {"h2h": f"{id_a}-{id_b}", "next": 1, "timezone": dm.TIMEZONE},
+                    15,
+                )
+                fixtures = data.get("response") or []
+                if not fixtures:
+                    return {}
+                return dm.fixture_summary(fixtures[0])
+            except UpstreamUnavailable:
+                raise
+            except Exception as e:
+                log.error(f"Error obteniendo fixture head-to-head: {e}")
+                return {}
+
+        return await self._cached("h2h_fixture", dm.API_CACHE_TTL_FIXTURES, (id_a, id_b), load)
+
+    async def get_next_fixture(self, team1_name: str, team2_name: str) -> Dict[str, Any]:
+        if not self.api_key:
+            return {}
+
+        async def load() -> Dict[str, Any]:
+            id1, id2 = await asyncio.gather(
+                self.get_team_id(team1_name), self.get_team_id(team2_name)
+            )
+            if not id1 or not id2:
+                return {}
+            return await self.get_h2h_fixture(min(id1, id2), max(id1, id2))
+
+        return await self._cached(
+            "next_fixture", dm.API_CACHE_TTL_FIXTURES, (team1_name, team2_name), load
+        )
+
+    async def get_team_statistics(self, team_id: int, league_id: int, season: int) -> Dict[str, Any]:
+        if not self.api_key:
+            return {}
+
+        async def load() -> Dict[str, Any]:
+            try:
+                data = await self._get(
+                    "/teams/statistics",
+                    {"team": team_id, "league": league_id, "season": season},
+                    15,
+                )
+                return data.get("response") or {}
+            except UpstreamUnavailable:
+                raise
+            except Exception as e:
+                log.error(f"Error obteniendo estadísticas de equipo: {e}")
+                return {}
+
+        return await self._cached(
+            "team_statistics", dm.API_CACHE_TTL_STATS, (team_id, league_id, season), load
+        )
+
+    async def prefetch_soccer(self, user_text: str) -> None:
+        """Trae fixture y estadísticas del partido del texto a la caché compartida."""
+        team1, team2 = dm.split_teams(user_text)
+        fixture = await self.get_next_fixture(team1, team2)
+        if not fixture or not fixture.get("home_id") or not fixture.get("away_id"):
+            return
+        league_id = fixture.get("league_id")
+        season = fixture.get("season")
+        await asyncio.gather(
+            self.get_team_statistics(fixture["home_id"], league_id, season),
+            self.get_team_statistics(fixture["away_id"], league_id, season),
+        )
+
+
+# ==========================================
+#  PIPELINE /predict ASÍNCRONO
+# ==========================================
+def _build_with_deadline(
+    sport: str, user_text: str, seconds: float, prefetched: Dict[Tuple[str, str], Any]
+) -> Dict[str, Any]:
+    # Lo que trajo la precarga (también "no hay partido") no se vuelve a pedir;
+    # con el plazo agotado lo que falte no llega a gastar cupo
+    with deadline(seconds), request_values(prefetched):
+        return dm.build_analysis(sport, user_text)
+
+
+async def predict_async(
+    client: AsyncFootballClient, data: Dict[str, Any]
+) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """Mismo contrato que POST /predict: devuelve (status, cuerpo JSON, cabeceras)."""
+    user_text = data.get("query") or data.get("text")
+    if not user_text:
+        return 400, {
+            "ok": False,
+            "error": "Falta el campo 'query' o 'text' en el cuerpo JSON",
+        }, {}
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        sport = dm.detect_sport(user_text)
+
+        with request_values() as prefetched:
+            if sport == "futbol":
+                try:
+                    await asyncio.wait_for(
+                        client.prefetch_soccer(user_text), dm.PREDICT_DEADLINE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    log.warning("Prefetch de API-FOOTBALL fuera de plazo")
+
+        # Con lo precargado los builders sólo calculan; aun así se ejecutan
+        # fuera del bucle para que un fallo de caché no lo bloquee.
+        left = max(0.0, dm.PREDICT_DEADLINE_SECONDS - (loop.time() - start))
+        result = await loop.run_in_executor(None, _build_with_deadline, sport, user_text, left, prefetched)
+
+        # ensure_db, encolado y aprendizaje tocan SQLite: fuera del bucle
+        await asyncio.to_thread(
+            dm.log_prediction,
+            sport=result["sport"],
+            query=user_text,
+            match_date=result.get("match_date", ""),
+            main_pick=result.get("main_pick", ""),
+            extra_info=result.get("extra_info", {}),
+            block=False,
+        )
+        return 200, dm.prediction_response(result), {}
+
+    except UpstreamUnavailable as e:
+        log.warning(f"API-FOOTBALL no disponible en /predict: {e}")
+        return 503, {"ok": False, "error": str(e)}, {"Retry-After": str(max(1, int(e.retry_after)))}
+
+    except Exception as e:
+        log.error(f"Error general en /predict: {e}")
+        return 500, {"ok": False, "error": str(e)}, {}
+
+
+# ==========================================
+#  SERVIDOR HTTP ASÍNCRONO MÍNIMO
+# ==========================================
+REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+async def dispatch(
+    client: AsyncFootballClient, method: str, path: str, body: bytes
+) -> Tuple[int, Any, Dict[str, str]]:
+    if path == "/":
+        if method != "GET":
+            return 405, {"ok": False, "error": "Método no permitido"}, {}
+        return 200, {"status": "DataMind activo", "message": "OK"}, {}
+
+    if path == "/predict":
+        if method != "POST":
+            return 405, {"ok": False, "error": "Método no permitido"}, {}
+        try:
+            data = fast_json.loads(body or b"{}")
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        return await predict_async(client, data)
+
+    return 404, {"ok": False, "error": "No encontrado"}, {}
+
+
+def _response(status: int, payload: Any, keep_alive: bool, headers: Optional[Dict[str, str]] = None) -> bytes:
+    # Mismos bytes que jsonify en el servidor Flask
+    body = b""
+    if payload is not None:
+        body = fast_json.dumps_bytes(payload, ensure_ascii=fast_json.ENSURE_ASCII, sort_keys=True) + b"\n"
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Access-Control-Allow-Headers: Content-Type\r\n"
+        "Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+        + "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        + f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def handle_connection(
+    client: AsyncFootballClient, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                writer.write(_response(400, {"ok": False, "error": "Petición inválida"}, False))
+                break
+            method, target, version = parts
+
+            headers: Dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            length = int(headers.get("content-length") or 0)
+            if length > ASYNC_MAX_BODY:
+                writer.write(_response(413, {"ok": False, "error": "Cuerpo demasiado grande"}, False))
+                break
+            body = await reader.readexactly(length) if length else b""
+
+            if method == "OPTIONS":
+                status, payload, extra = 204, None, {}
+            else:
+                status, payload, extra = await dispatch(client, method, target.split("?", 1)[0], body)
+
+            writer.write(_response(status, payload, keep_alive, extra))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "0.0.0.0", port: int = dm.PORT) -> None:
+    """Modo de servicio asíncrono: un proceso, cientos de predicciones en vuelo."""
+    dm.init_services()
+    dm.start_background_services()
+    client = AsyncFootballClient()
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(client, r, w), host, port, limit=ASYNC_MAX_BODY
+    )
+    log.info(f"🚀 DataMind (async) ejecutándose en puerto {port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
@@ -0,0 +1,221 @@
+"""
+Ejecuta /predict en lote sobre un log de consultas, sin pasar por HTTP.
+
+    python batch_predict.py consultas.jsonl -o predicciones.jsonl --workers 16
+
+Entrada: líneas JSON {"query": ...} (o {"text": ...}) o texto plano.
+Salida: una línea JSON por consulta con su número de línea de entrada.
+Si la salida ya existe se reanuda: se saltan las líneas ya procesadas.
+Las filas de `predictions` se anotan por lote (--batch-id, por defecto la
+ruta de la salida) y línea, así que un bloque repetido al reanudar no se
+guarda dos veces.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import datamind_server as dm
+import fast_json
+from http_client import deadline
+from prediction_log import write_rows
+from upstream import PRIORITY_BACKGROUND, priority
+
+# (número de línea, texto, deporte, equipo 1, equipo 2)
+Item = Tuple[int, str, str, str, str]
+
+
+# ==========================================
+#  ENTRADA / REANUDACIÓN
+# ==========================================
+def iter_input(path: str, skip: Set[int]) -> Iterator[Tuple[int, str]]:
+    """(número de línea, consulta) en streaming; omite las líneas de `skip`."""
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with source:
+        for line_no, line in enumerate(source, 1):
+            if line_no in skip:
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    data = fast_json.loads(line)
+                except ValueError:
+                    dm.log.warning(f"Línea {line_no} no es JSON válido; se omite")
+                    continue
+                query = data.get("query") or data.get("text") or ""
+            else:
+                query = line
+            if query:
+                yield line_no, query
+
+
+def completed_lines(output_path: str) -> Set[int]:
+    """
+    Líneas de entrada ya presentes en la salida. Si la última línea quedó
+    a medias por una interrupción, se recorta para poder seguir anexando.
+    """
+    done: Set[int] = set()
+    if not os.path.exists(output_path):
+        return done
+
+    # Línea a línea: la salida de un lote grande no se carga entera
+    with open(output_path, "rb+") as f:
+        end = 0
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                # Sólo la última puede quedar sin salto de línea
+                f.truncate(end)
+                break
+            end += len(raw)
+            try:
+                done.add(fast_json.loads(raw)["line"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+# ==========================================
+#  PRECARGA DEDUPLICADA
+# ==========================================
+def prefetch(pool: ThreadPoolExecutor, items: List[Item]) -> None:
+    """
+    Trae a la caché de API-FOOTBALL lo que van a pedir los build_*_analysis:
+    cada equipo, cada cruce y cada estadística distintos del bloque se piden
+    una sola vez. Después los análisis encuentran todo en caché.
+    """
+    if not dm.API_FOOTBALL_KEY:
+        return
+    soccer = [it for it in items if it[2] == "futbol" and it[4]]
+    if not soccer:
+        return
+
+    def background(fn):
+        # Los hilos del pool no heredan el contexto: la prioridad se fija en cada uno
+        def run(args):
+            with priority(PRIORITY_BACKGROUND):
+                try:
+                    return fn(*args)
+                except Exception as e:
+                    dm.log.warning(f"Precarga incompleta: {e}")
+                    return None
+        return run
+
+    teams = {name for it in soccer for name in (it[3], it[4])}
+    list(pool.map(background(dm.get_team_id), [(t,) for t in teams]))
+
+    pairs = {(it[3], it[4]) for it in soccer}
+    fixtures = list(pool.map(background(dm.get_next_fixture), pairs))
+
+    stats = set()
+    for fx in fixtures:
+        if fx and fx.get("home_id") and fx.get("away_id"):
+            stats.add((fx["home_id"], fx.get("league_id"), fx.get("season")))
+            stats.add((fx["away_id"], fx.get("league_id"), fx.get("season")))
+    list(pool.map(background(dm.get_team_statistics), stats))
+
+
+# ==========================================
+#  PREDICCIÓN
+# ==========================================
+def predict_one(item: Item, deadline_seconds: float) -> Tuple[Dict[str, Any], Optional[tuple]]:
+    """Registro de salida y fila para `predictions` (None si falló)."""
+    line_no, query, sport = item[0], item[1], item[2]
+    try:
+        with priority(PRIORITY_BACKGROUND), deadline(deadline_seconds):
+            result = dm.build_analysis(sport, query)
+    except Exception as e:
+        return {"line": line_no, "query": query, "ok": False, "error": str(e)}, None
+
+    row = (
+        datetime.utcnow().isoformat(),
+        result["sport"],
+        query,
+        result.get("match_date", ""),
+        result.get("main_pick", ""),
+        fast_json.dumps(result.get("extra_info", {})),
+    )
+    return {"line": line_no, "query": query, **dm.prediction_response(result)}, row
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    done = completed_lines(args.output) if args.output != "-" else set()
+    if done:
+        dm.log.info(f"Reanudando: {len(done)} consultas ya procesadas")
+
+    batch_id = args.batch_id or (os.path.abspath(args.output) if args.output != "-" else None)
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    totals = {"processed": 0, "ok": 0, "errors": 0, "logged": 0, "skipped": len(done)}
+    start = time.perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="batch-predict") as pool:
+            source = iter_input(args.input, done)
+            while True:
+                chunk = list(itertools.islice(source, args.chunk_size))
+                if not chunk:
+                    break
+
+                items: List[Item] = [(n, q, *dm.parse_query(q)[:3]) for n, q in chunk]
+                prefetch(pool, items)
+                results = list(pool.map(lambda it: predict_one(it, args.deadline), items))
+
+                logged = [(rec["line"], row) for rec, row in results if row is not None]
+                rows = [row for _, row in logged]
+                if rows and not args.no_db:
+                    dm.ensure_db()
+                    totals["logged"] += write_rows(
+                        dm.DB_PATH, rows, batch_id=batch_id, lines=[line for line, _ in logged]
+                    )
+
+                # La salida se escribe después de la DB: una interrupción entre
+                # ambas repite ese bloque al reanudar, nunca lo pierde (y sus
+                # filas ya anotadas en batch_lines no se vuelven a insertar).
+                out.write("".join(fast_json.dumps(rec) + "\n" for rec, _ in results))
+                out.flush()
+                if out is not sys.stdout:
+                    os.fsync(out.fileno())
+
+                totals["processed"] += len(results)
+                totals["ok"] += len(rows)
+                totals["errors"] += len(results) - len(rows)
+                elapsed = time.perf_counter() - start
+                dm.log.info(
+                    f"{totals['processed']} consultas ({totals['errors']} errores) "
+                    f"en {elapsed:.1f}s → {totals['processed'] / elapsed:.1f}/s"
+                )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    totals["seconds"] = round(elapsed, 3)
+    totals["per_second"] = round(totals["processed"] / elapsed, 2) if elapsed else 0.0
+    totals["api_cache"] = dm.api_cache.stats()
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="archivo JSONL de consultas ('-' para stdin)")
+    parser.add_argument("-o", "--output", default="-", help="archivo JSONL de salida ('-' para stdout)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_PREDICT_WORKERS", 8)))
+    parser.add_argument("--chunk-size", type=int, default=500, help="consultas por bloque de precarga y transacción")
+    parser.add_argument("--deadline", type=float, default=dm.PREDICT_DEADLINE_SECONDS, help="plazo por consulta (s)")
+    parser.add_argument("--no-db", action="store_true", help="no guardar en la tabla predictions")
+    parser.add_argument("--batch-id", help="identificador del lote en batch_lines (por defecto, la ruta de la salida)")
+    args = parser.parse_args()
+
+    totals = run(args)
+    sys.stderr.write(json.dumps(totals, ensure_ascii=False, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Rutas para ejecutar los benchmarks desde el repositorio.
+El paquete de la app web se importa como `app` (app.logic, app.datamind...);
+en este checkout vive en logic/, así que si `app` no existe se registra
+ese directorio con ese nombre.
+"""
+
+import os
+import sys
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_paths() -> None:
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if importlib.util.find_spec("app") is not None:
+        return
+    pkg_dir = os.path.join(ROOT, "logic")
+    spec = importlib.util.spec_from_file_location(
+        "app", os.path.join(pkg_dir, "__init__.py"), submodule_search_locations=[pkg_dir]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["app"] = module
+    spec.loader.exec_module(module)
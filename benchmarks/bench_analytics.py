@@ -0,0 +1,187 @@
+"""
+Benchmark de prediction_analytics sobre una DB temporal con N predicciones.
+
+Compara, para "predicciones por deporte, liga y mes":
+- escaneo completo + json.loads de extra_info en Python (lo que había)
+- GROUP BY sobre las columnas generadas (escaneo, pero sin JSON en Python)
+- lectura de los agregados incrementales (summary)
+y las últimas predicciones por deporte / fecha de partido con y sin índices.
+También mide lo que el trigger de agregados añade a cada inserción.
+Antes de medir comprueba que los tres resúmenes coinciden y que los
+agregados mantenidos por el trigger son iguales a rebuild().
+
+    python benchmarks/bench_analytics.py --n 200000
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import tempfile
+import argparse
+from collections import Counter
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+import prediction_analytics  # noqa: E402
+from prediction_log import connect, INSERT_SQL  # noqa: E402
+
+SPORTS = ["futbol", "basket", "beisbol", "nfl"]
+LEAGUES = [(262, "Liga MX"), (39, "Premier League"), (140, "La Liga"), (253, "MLS")]
+PICKS = ["Local", "Empate", "Visitante", "Over 2.5", ""]
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT,
+        sport TEXT,
+        raw_query TEXT,
+        match_date TEXT,
+        main_pick TEXT,
+        extra_info TEXT
+    )
+"""
+
+
+def make_rows(n: int, seed: int = 11) -> list:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        sport = rnd.choice(SPORTS)
+        extra = {"model": "v1", "confidence": round(rnd.random(), 3), "notes": "x" * rnd.randint(50, 300)}
+        if sport == "futbol" and rnd.random() < 0.9:
+            league_id, league_name = rnd.choice(LEAGUES)
+            extra["fixture"] = {"fixture_id": i, "league_id": league_id, "league_name": league_name, "season": 2025}
+        month = rnd.randint(1, 12)
+        day = rnd.randint(1, 28)
+        rows.append((
+            f"2025-{month:02d}-{day:02d}T{rnd.randint(0, 23):02d}:00:00",
+            sport,
+            f"Equipo {i % 50} vs Equipo {(i * 7) % 50}",
+            f"{day:02d}/{month:02d}/2025" if rnd.random() < 0.7 else "",
+            rnd.choice(PICKS),
+            json.dumps(extra) if rnd.random() < 0.99 else "no es json",
+        ))
+    # Llegan en orden de created_at, como en producción
+    rows.sort()
+    return rows
+
+
+def new_db(migrated: bool) -> str:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+    if migrated:
+        prediction_analytics.migrate(path)
+    return path
+
+
+def insert_us(path: str, rows: list, batch: int = 200) -> float:
+    """Como el escritor de predicciones: una conexión y un executemany por lote."""
+    conn = connect(path)
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch):
+        with conn:
+            conn.executemany(INSERT_SQL, rows[i:i + batch])
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed / len(rows) * 1e6
+
+
+# ---------- resúmenes ----------
+def legacy_summary(conn) -> Counter:
+    counts = Counter()
+    for created_at, sport, extra_info in conn.execute("SELECT created_at, sport, extra_info FROM predictions"):
+        try:
+            extra = json.loads(extra_info)
+        except ValueError:
+            extra = {}
+        league = (extra.get("fixture") or {}).get("league_id") or extra.get("league_id")
+        counts[(sport, league, created_at[:7])] += 1
+    return counts
+
+
+def generated_summary(conn) -> Counter:
+    rows = conn.execute(
+        "SELECT sport, league_id, substr(created_at, 1, 7), count(*) FROM predictions GROUP BY 1, 2, 3"
+    )
+    return Counter({(s, l, m): n for s, l, m, n in rows})
+
+
+def rollup_summary(analytics) -> Counter:
+    result = analytics.summary(by=("sport", "league", "month"))
+    return Counter({(r["sport"], r["league"], r["month"]): r["predictions"] for r in result["rows"]})
+
+
+def best_ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.n)
+    plain, migrated = new_db(False), new_db(True)
+    insert_plain = insert_us(plain, rows)
+    insert_migrated = insert_us(migrated, rows)
+
+    # Una DB ya poblada que se migra después (rellena los agregados de golpe)
+    start = time.perf_counter()
+    prediction_analytics.migrate(plain)
+    migrate_s = time.perf_counter() - start
+
+    analytics = prediction_analytics.PredictionAnalytics(migrated)
+    conn = sqlite3.connect(migrated)
+    expected = legacy_summary(conn)
+    assert generated_summary(conn) == expected
+    assert rollup_summary(analytics) == expected
+    by_trigger = conn.execute("SELECT * FROM prediction_rollup ORDER BY 1, 2, 3, 4").fetchall()
+    analytics.rebuild()
+    assert conn.execute("SELECT * FROM prediction_rollup ORDER BY 1, 2, 3, 4").fetchall() == by_trigger
+    assert prediction_analytics.PredictionAnalytics(plain).summary(by=("sport", "league", "month")) == \
+        analytics.summary(by=("sport", "league", "month"))
+    print(f"{args.n} predicciones: los tres resúmenes coinciden y el trigger da lo mismo que rebuild()\n")
+
+    # Índices: la misma consulta sobre una tabla sin ellos
+    bare = sqlite3.connect(new_db(False))
+    with bare:
+        bare.executemany(INSERT_SQL, rows)
+
+    def bare_recent(where: str, value: str, order: str):
+        return bare.execute(
+            f"SELECT id, created_at, sport, match_date, main_pick FROM predictions WHERE {where} = ? "
+            f"ORDER BY {order} DESC LIMIT 50", (value,)
+        ).fetchall()
+
+    print(f"{'medida':<40} {'antes':>10} {'ahora':>10} {'x':>8}")
+    table = [
+        ("resumen deporte/liga/mes ms", best_ms(lambda: legacy_summary(conn), args.repeat),
+         best_ms(lambda: rollup_summary(analytics), args.repeat)),
+        ("  (GROUP BY columnas generadas) ms", best_ms(lambda: legacy_summary(conn), 1),
+         best_ms(lambda: generated_summary(conn), args.repeat)),
+        ("recientes por deporte ms", best_ms(lambda: bare_recent("sport", "nfl", "created_at"), args.repeat),
+         best_ms(lambda: analytics.recent(sport="nfl"), args.repeat)),
+        ("recientes por fecha de partido ms", best_ms(lambda: bare_recent("match_date", "12/05/2025", "id"), args.repeat),
+         best_ms(lambda: analytics.recent(match_date="12/05/2025"), args.repeat)),
+        ("inserción µs/fila (escritor, lotes de 200)", insert_plain, insert_migrated),
+    ]
+    for label, old, new in table:
+        print(f"{label:<40} {old:>10.3f} {new:>10.3f} {old / new:>8.1f}")
+    print(f"\nmigrar una tabla ya poblada ({args.n} filas): {migrate_s * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
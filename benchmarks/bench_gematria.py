@@ -0,0 +1,96 @@
+"""
+Gematría unificada (gematria_core) frente a las cuatro versiones que había:
+- gematria_service.gematria_value / predictor.gematria_value
+  (clean_text + A1Z26 + dígitos; acentos y Ñ valían 0)
+- numerology_service.numerology_from_name (ord(c.upper()) - 64: Á=129,
+  Ñ=145 y 'ß' fallaba con TypeError)
+- utils.simple_gematria (sólo letras ASCII, 'ß' contaba como 'SS')
+- batch_service (tablas que copiaban las dos primeras)
+
+Muestra los ejemplos que cambian, cuenta cuántos resultados cambian
+respecto a la versión antigua en nombres con acentos y mide el coste por
+llamada. La equivalencia y las propiedades se comprueban en
+tests/test_gematria.py.
+
+    python benchmarks/bench_gematria.py --n 20000
+"""
+
+import re
+import time
+import random
+import argparse
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+from app.datamind.services import gematria_core  # noqa: E402
+from app.datamind.services.gematria_core import gematria_value  # noqa: E402
+
+
+# ---------- versiones antiguas (copiadas tal cual) ----------
+LETTER_MAP = {chr(i + 65): i + 1 for i in range(26)}
+
+
+def legacy_gematria(text):
+    text = re.sub(r"[^A-Za-z0-9ÁÉÍÓÚáéíóúÑñ ]", "", text).strip().upper()
+    total = 0
+    for ch in text:
+        if ch.isalpha():
+            total += LETTER_MAP.get(ch, 0)
+        elif ch.isdigit():
+            total += int(ch)
+    return total
+
+
+def legacy_name(name):
+    return sum(ord(c.upper()) - 64 for c in name if c.isalpha())
+
+
+ASCII = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -.,'!?"
+ACCENTED = "áéíóúÁÉÍÓÚñÑüÜçÇàèìòùâêîôûãõ"
+EXAMPLES = ["José", "JOSE", "PEÑA", "Ñandú", "Müller", "Ç", "ß", "Straße", "1ª"]
+
+
+def random_text(rnd, alphabet, n):
+    return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, n)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--loops", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'texto':<12} {'antes (texto)':>14} {'antes (nombre)':>15} {'ahora':>6}")
+    for text in EXAMPLES:
+        try:
+            old_name = legacy_name(text)
+        except TypeError:
+            old_name = "error"
+        print(f"{text:<12} {legacy_gematria(text):>14} {old_name!s:>15} {gematria_value(text):>6}")
+
+    rnd = random.Random(11)
+    names = [random_text(rnd, ASCII[:52] + ACCENTED + " ", 20) for _ in range(args.n)]
+    changed_text = sum(legacy_gematria(s) != gematria_value(s) for s in names)
+    changed_name = sum(legacy_name(s) != gematria_value(s) for s in names)
+    accented = sum(any(c in ACCENTED for c in s) for s in names)
+    print(f"\nnombres con acentos: {accented}/{len(names)}; cambian {changed_text} en gematría de texto, "
+          f"{changed_name} en numerología del nombre")
+
+    cases = [("Messi 10", "ASCII"), ("José Peña Núñez", "Latin-1"), ("Ωmega Straße 中", "fuera de Latin-1")]
+    print(f"\n{'caso':<20} {'antes µs':>9} {'ahora µs':>9}")
+    for text, label in cases:
+        timings = []
+        for fn in (legacy_gematria, gematria_value):
+            fn(text)
+            start = time.perf_counter()
+            for _ in range(args.loops):
+                fn(text)
+            timings.append((time.perf_counter() - start) / args.loops * 1e6)
+        print(f"{label:<20} {timings[0]:>9.3f} {timings[1]:>9.3f}")
+    print(f"\npesos fuera de Latin-1 cacheados: {len(gematria_core._gematria_weights)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Benchmark del motor de interpretación por tablas (interpretation_service)
+frente a las cadenas if/elif originales de build_interpretation y
+predictor.interpret (copiadas abajo como referencia).
+
+Antes de medir comprueba que dan lo mismo para todas las combinaciones de
+núcleos y gematrías de 0 a 5000 (más la frase del ciclo de vida de
+data/cycles.json, que las cadenas no usaban), y que un cambio en el
+archivo de reglas se aplica sin reiniciar (sobre una copia temporal).
+
+    python benchmarks/bench_interpretation.py --n 200000
+"""
+
+import os
+import time
+import json
+import random
+import shutil
+import timeit
+import argparse
+import tempfile
+
+from _bootstrap import setup_paths, ROOT
+
+setup_paths()
+
+# Las reglas se leen de una copia para poder editarlas en la prueba de recarga
+_tmp = tempfile.mkdtemp()
+RULES_FILE = os.path.join(_tmp, "interpretation_rules.json")
+shutil.copy(os.path.join(ROOT, "data", "interpretation_rules.json"), RULES_FILE)
+os.environ["INTERPRETATION_RULES_FILE"] = RULES_FILE
+
+from app.logic import predictor  # noqa: E402
+from app.datamind.services import interpretation_service  # noqa: E402
+from app.datamind.services.records import Interpretation  # noqa: E402
+from app.datamind.services.numerology_service import numerology_from_name, numerology_from_birth  # noqa: E402
+
+CORES = list(interpretation_service.CORES) + [0]
+
+with open(os.path.join(ROOT, "data", "cycles.json"), encoding="utf-8") as _f:
+    CYCLES = json.load(_f)
+
+
+# ---------- implementación original (if/elif) ----------
+def legacy_build_interpretation(name_data, birth_data, gematria_value):
+    details = []
+    name_core = name_data.get("name_core", "-") if name_data else "-"
+    birth_core = birth_data.get("birth_core", "-") if birth_data else "-"
+
+    if name_core and name_core != "-":
+        details.append(f"Vibración del nombre: {name_core}.")
+        if name_core in (1, 8):
+            details.append("Energía de liderazgo y manifestación.")
+        elif name_core in (2, 6):
+            details.append("Energía emocional y de conexión humana.")
+        elif name_core in (3, 9):
+            details.append("Energía creativa y expresiva.")
+        elif name_core == 7:
+            details.append("Energía introspectiva y espiritual.")
+
+    if birth_core and birth_core != "-":
+        details.append(f"Camino de vida: {birth_core}.")
+        if birth_core == 1:
+            details.append("Camino de autodeterminación y liderazgo.")
+        elif birth_core == 5:
+            details.append("Camino de libertad y transformación.")
+        elif birth_core == 7:
+            details.append("Camino de sabiduría y búsqueda interior.")
+        elif birth_core == 9:
+            details.append("Camino de servicio y propósito elevado.")
+
+    if gematria_value:
+        details.append(f"Gematría del texto: {gematria_value}.")
+        if gematria_value % 7 == 0:
+            details.append("Simbolismo de perfección y totalidad (múltiplo de 7).")
+        elif gematria_value % 9 == 0:
+            details.append("Simbolismo de cierre o culminación (múltiplo de 9).")
+        elif gematria_value % 5 == 0:
+            details.append("Simbolismo de cambio y movimiento (múltiplo de 5).")
+
+    if details:
+        summary = f"Interpretación general: nombre {name_core}, camino {birth_core}, gematría {gematria_value}."
+    else:
+        summary = "Sin interpretación disponible."
+    return Interpretation(details=tuple(details), summary=summary)
+
+
+def legacy_interpret(name_info, birth_info, power_info):
+    details = []
+    if name_info.name_core:
+        details.append(f"Vibración base del nombre: {name_info.name_core}.")
+    if birth_info.birth_core:
+        details.append(f"Camino de vida {birth_info.birth_core}.")
+    if power_info and power_info.power_core:
+        details.append(f"Código de poder detectado con vibración {power_info.power_core}.")
+        if power_info.sports_hint:
+            details.append(power_info.sports_hint)
+    summary = details[0] if details else "Sin interpretación."
+    return Interpretation(details=tuple(details), summary=summary)
+
+
+# ---------- salida esperada: la original más el ciclo de vida ----------
+def cycle_line(core) -> tuple:
+    meaning = CYCLES.get(str(core)) if core and core != "-" else None
+    return (f"Ciclo {core}: {meaning}.",) if meaning else ()
+
+
+def _insert_after(result, last, extra):
+    if not extra:
+        return result
+    i = result.details.index(last) + 1
+    return Interpretation(details=result.details[:i] + extra + result.details[i:], summary=result.summary)
+
+
+def expected_build_interpretation(name_data, birth_data, gematria_value):
+    old = legacy_build_interpretation(name_data, birth_data, gematria_value)
+    birth_core = birth_data.get("birth_core") if birth_data else None
+    extra = cycle_line(birth_core)
+    if not extra:
+        return old
+    # Última frase del bloque de nacimiento
+    last = legacy_build_interpretation({}, birth_data, 0).details[-1]
+    return _insert_after(old, last, extra)
+
+
+def expected_interpret(name_info, birth_info, power_info):
+    old = legacy_interpret(name_info, birth_info, power_info)
+    core = birth_info.birth_core
+    return _insert_after(old, f"Camino de vida {core}.", cycle_line(core))
+
+
+# ---------- comprobaciones ----------
+def check() -> None:
+    build = interpretation_service.build_interpretation
+    names = [{}] + [{"name_core": c} for c in CORES]
+    births = [{}] + [{"birth_core": c} for c in CORES]
+    for name_data in names:
+        for birth_data in births:
+            for value in range(0, 5001):
+                new = build(name_data, birth_data, value)
+                assert new == expected_build_interpretation(name_data, birth_data, value), (name_data, birth_data, value)
+
+    powers = [{}] + [predictor.analyze_power_code(code) for code in ("MESSI GOL", "LEO MIAMI", "anota", "zz", "9")]
+    for name in ("", "Lionel Messi", "Ana", "Raúl Jiménez"):
+        for birthdate in ("", "1987-06-24", "2000-01-01"):
+            for power in powers:
+                name_info = predictor.numerology_from_name(name)
+                birth_info = predictor.numerology_from_birthdate(birthdate)
+                assert predictor.interpret(name_info, birth_info, power) == expected_interpret(
+                    name_info, birth_info, power
+                ), (name, birthdate, power)
+    print("Mismas interpretaciones que las cadenas if/elif originales (más el ciclo de vida)")
+
+
+def check_reload() -> None:
+    interpretation_service.RULES_CHECK_SECONDS = 0  # comprobar en cada llamada
+    build = interpretation_service.build_interpretation
+    before = interpretation_service.rules_version()
+    with open(RULES_FILE, encoding="utf-8") as f:
+        rules = json.load(f)
+    rules["datamind"]["birth"]["phrases"]["5"] = "Camino {core}: {cycle}."
+    time.sleep(0.01)  # mtime distinto aun en sistemas de archivos con poca resolución
+    with open(RULES_FILE, "w", encoding="utf-8") as f:
+        json.dump(rules, f, ensure_ascii=False)
+
+    result = build({}, {"birth_core": 5}, 0)
+    assert result.details[1] == "Camino 5: Cambio, movimiento.", result
+    assert interpretation_service.rules_version() != before
+
+    # Un archivo roto no cambia las reglas en uso
+    with open(RULES_FILE, "w", encoding="utf-8") as f:
+        f.write("{")
+    assert build({}, {"birth_core": 5}, 0) == result
+    print(f"Recarga en caliente: OK ({interpretation_service.rules_stats()})\n")
+
+
+# ---------- medidas ----------
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check()
+
+    rnd = random.Random(3)
+    sample_names = ["Lionel Messi", "Kylian Mbappé", "Ana", "Raúl Jiménez", "Erling Haaland", "Shohei Ohtani"]
+    names = [numerology_from_name(n) for n in sample_names] + [{}]
+    births = [numerology_from_birth(d) for d in ("1987-06-24", "2000-01-01", "1990-05-02", "1975-11-29")] + [{}]
+    dm_inputs = [(rnd.choice(names), rnd.choice(births), rnd.randint(0, 400)) for _ in range(args.n)]
+
+    p_names = [predictor.numerology_from_name(n) for n in sample_names + [""]]
+    p_births = [predictor.numerology_from_birthdate(d) for d in ("1987-06-24", "2000-01-01", "")]
+    p_powers = [predictor.analyze_power_code(c) for c in ("", "MESSI GOL", "LEO MIAMI FINAL")]
+    p_inputs = [(rnd.choice(p_names), rnd.choice(p_births), rnd.choice(p_powers)) for _ in range(args.n)]
+
+    def per_call(fn, inputs) -> float:
+        best = min(timeit.repeat(lambda: [fn(*a) for a in inputs], number=1, repeat=args.repeat))
+        return best / len(inputs) * 1e9
+
+    rows = [
+        (
+            "build_interpretation ns",
+            per_call(legacy_build_interpretation, dm_inputs),
+            per_call(interpretation_service.build_interpretation, dm_inputs),
+        ),
+        ("predictor.interpret ns", per_call(legacy_interpret, p_inputs), per_call(predictor.interpret, p_inputs)),
+    ]
+    print(f"{'medida':<28} {'if/elif':>10} {'tablas':>10} {'x':>6}")
+    for label, old, new in rows:
+        print(f"{label:<28} {old:>10.0f} {new:>10.0f} {old / new:>6.2f}")
+    print()
+
+    check_reload()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark de serialización JSON: proveedor por defecto de Flask (stdlib)
+frente a fast_json (orjson).
+
+1. Comprueba que ambos producen los mismos bytes para las respuestas reales,
+   con ensure_ascii (por defecto) y en UTF-8 (JSON_ENSURE_ASCII=0).
+2. Mide jsonify sobre cargas típicas (/analyze, /datamind/analyze, /predict,
+   una página de historial).
+3. Mide la parte de serialización dentro de la petición completa con las
+   etapas de /metrics (cache_lookup / compute / serialize) antes y después.
+
+    python benchmarks/bench_json.py --requests 2000
+"""
+
+import os
+import re
+import timeit
+import argparse
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+# Sin caché de respuestas: cada petición calcula y serializa
+os.environ["RESULT_CACHE_SIZE"] = "0"
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import fast_json  # noqa: E402
+from app.app import create_app  # noqa: E402
+from app.logic.predictor import analyze_full_input  # noqa: E402
+
+NAMES = ["Lionel Andrés Messi", "Kylian Mbappé", "Raúl Jiménez", "Núñez Peña", "LeBron James", "Erling Haaland"]
+
+
+def payloads(app) -> dict:
+    client = app.test_client()
+    datamind = client.post("/datamind/analyze", json={"name": NAMES[0], "birthdate": "1987-06-24"}).get_json()
+    analyze = analyze_full_input(name=NAMES[0], birthdate="1987-06-24", power_code="MESSI GOL")
+    predict = {
+        "ok": True,
+        "sport": "futbol",
+        "match_date": "12/05/2025",
+        "prediction": {"pick": "Local", "confidence": 0.6425, "text": "Ventaja del local por forma reciente"},
+        "visualmind_payload": {"bars": [{"label": f"Señal {i}", "value": i * 0.137} for i in range(20)]},
+    }
+    history = {
+        "items": [
+            {"id": i, "kind": "analyze", "created_at": "2025-05-12T10:00:00", "input": {"name": n}, "output": analyze}
+            for i, n in enumerate(NAMES * 8)
+        ],
+        "next_cursor": 12,
+    }
+    return {"/analyze": analyze, "/datamind/analyze": datamind, "/predict": predict, "/datamind/history": history}
+
+
+def providers(app, ensure_ascii: bool):
+    std, fast = DefaultJSONProvider(app), fast_json.provider_class()(app)
+    std.ensure_ascii = fast.ensure_ascii = ensure_ascii
+    return std, fast
+
+
+def check_identical(app, cases: dict) -> None:
+    with app.app_context():
+        for ensure_ascii in (True, False):
+            std, fast = providers(app, ensure_ascii)
+            for name, obj in cases.items():
+                a, b = std.response(obj).get_data(), fast.response(obj).get_data()
+                assert a == b, f"{name} (ensure_ascii={ensure_ascii}): salida distinta"
+    print(f"Salida idéntica byte a byte en {len(cases)} cargas\n")
+
+
+def bench_serialize(app, cases: dict, number: int) -> None:
+    def timed(provider, obj) -> float:
+        return min(timeit.repeat(lambda: provider.response(obj), number=number, repeat=5)) / number * 1e6
+
+    print(f"{'carga':<22} {'bytes':>7} {'modo':>6} {'stdlib µs':>10} {'orjson µs':>10} {'x':>6}")
+    with app.app_context():
+        for name, obj in cases.items():
+            for ensure_ascii, mode in ((True, "ascii"), (False, "utf-8")):
+                std, fast = providers(app, ensure_ascii)
+                size = len(std.response(obj).get_data())
+                t_std, t_fast = timed(std, obj), timed(fast, obj)
+                print(f"{name:<22} {size:>7} {mode:>6} {t_std:>10.1f} {t_fast:>10.1f} {t_std / t_fast:>6.2f}")
+    print()
+
+
+_SUM = re.compile(r'^numeria_(stage_seconds|http_request_seconds)_sum\{([^}]*)\} (\S+)$', re.M)
+
+
+def stage_sums(client) -> dict:
+    text = client.get("/metrics").get_data(as_text=True)
+    sums = {}
+    for kind, labels, value in _SUM.findall(text):
+        label = re.search(r'(?:stage|endpoint)="([^"]+)"', labels).group(1)
+        sums[label] = sums.get(label, 0.0) + float(value)
+    return sums
+
+
+def bench_requests(n: int) -> None:
+    print(f"{'proveedor':<14} {'endpoint':<20} {'µs/petición':>12} {'serializar µs':>14} {'parte':>7}")
+    for label in ("stdlib", "orjson", "orjson utf-8"):
+        # Sin memoria de patrones: aquí sólo interesa la serialización
+        app = create_app(pattern_memory_db="")
+        if label == "stdlib":
+            app.json = DefaultJSONProvider(app)
+        elif label == "orjson utf-8":
+            fast_json.install(app, ensure_ascii=False)
+        client = app.test_client()
+        for i in range(n):
+            name = f"{NAMES[i % len(NAMES)]} {i}"
+            client.post("/analyze", json={"name": name, "birthdate": "1987-06-24", "power_code": "MESSI GOL"})
+            client.post("/datamind/analyze", json={"name": name, "birthdate": "1987-06-24"})
+        sums = stage_sums(client)
+        for endpoint, stage in (("/analyze", "analyze"), ("/datamind/analyze", "datamind_analyze")):
+            total = sums[endpoint] / n * 1e6
+            serialize = sums[f"{stage}_serialize"] / n * 1e6
+            print(f"{label:<14} {endpoint:<20} {total:>12.1f} {serialize:>14.1f} {serialize / total:>7.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="repeticiones por carga")
+    parser.add_argument("--requests", type=int, default=2000, help="peticiones por endpoint")
+    args = parser.parse_args()
+
+    app = create_app(pattern_memory_db="")
+    cases = payloads(app)
+    check_identical(app, cases)
+    bench_serialize(app, cases, args.number)
+    bench_requests(args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Benchmark de learning_store sobre una DB temporal con N predicciones de
+fútbol (con fixture y equipos) y resultados para una parte de los partidos.
+
+Antes de medir comprueba que los rasgos en memoria (trigger + observe +
+record_outcome) coinciden con:
+- un recorrido completo de la tabla en Python (json.loads + grade_pick),
+  que es lo que costaría aprender sin agregados
+- rebuild() desde cero
+- migrar una DB ya poblada (relleno inicial)
+
+Mide la búsqueda de rasgos por petición, el coste del trigger en cada
+inserción y el de plegar un resultado.
+
+    python benchmarks/bench_learning.py --n 100000 --outcomes 2000
+"""
+
+import os
+import json
+import time
+import random
+import sqlite3
+import tempfile
+import argparse
+from collections import defaultdict
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+import prediction_analytics  # noqa: E402
+import learning_store  # noqa: E402
+from learning_store import LearningStore, grade_pick, describe, COUNTERS  # noqa: E402
+from prediction_log import connect, INSERT_SQL  # noqa: E402
+from bench_analytics import SCHEMA, insert_us, best_ms  # noqa: E402
+
+TEAMS = [(2278 + i, name) for i, name in enumerate([
+    "América", "Chivas", "Tigres", "Monterrey", "Cruz Azul", "Pumas", "Toluca", "León",
+    "Santos", "Pachuca", "Atlas", "Necaxa", "Puebla", "Querétaro", "Mazatlán", "Juárez",
+])]
+PICKS = ["Local", "Empate", "Visitante", "Over 2.5", "Menos de 2.5 goles", "Ambos anotan", "1X", "{home} gana", ""]
+
+
+def make_rows(n: int, fixtures: int, seed: int = 5) -> tuple:
+    rnd = random.Random(seed)
+    matches = {}
+    for fixture_id in range(1, fixtures + 1):
+        (home_id, home), (away_id, away) = rnd.sample(TEAMS, 2)
+        matches[fixture_id] = (home_id, home, away_id, away)
+    rows = []
+    for i in range(n):
+        fixture_id = rnd.randint(1, fixtures)
+        home_id, home, away_id, away = matches[fixture_id]
+        fixture = {"fixture_id": fixture_id, "league_id": 262, "league_name": "Liga MX", "season": 2025,
+                   "home_id": home_id, "home_name": home, "away_id": away_id, "away_name": away}
+        extra = {"fixture": fixture} if rnd.random() < 0.95 else {"notes": "sin partido"}
+        rows.append((
+            f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T12:00:00",
+            "futbol",
+            f"{home} vs {away}",
+            "",
+            rnd.choice(PICKS).format(home=home),
+            json.dumps(extra),
+        ))
+    rows.sort()
+    scores = {fid: (rnd.randint(0, 4), rnd.randint(0, 3)) for fid in matches}
+    return rows, matches, scores
+
+
+def new_db(learning: bool) -> str:
+    path = os.path.join(tempfile.mkdtemp(), "learning.db")
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+    prediction_analytics.migrate(path)
+    if learning:
+        learning_store.migrate(path)
+    return path
+
+
+def legacy_stats(conn, outcomes: dict) -> dict:
+    """Todos los contadores recorriendo la tabla entera."""
+    stats = defaultdict(lambda: [0] * len(COUNTERS))
+    for sport, pick, extra_info in conn.execute("SELECT sport, main_pick, extra_info FROM predictions"):
+        fixture = json.loads(extra_info).get("fixture") or {}
+        keys = [("sport", sport), ("pick", f"{sport}|{pick}")]
+        keys += [("team", str(fixture[k])) for k in ("home_id", "away_id") if k in fixture]
+        score = outcomes.get(fixture.get("fixture_id"))
+        hit = grade_pick(pick, *score[:2], fixture.get("home_name"), fixture.get("away_name")) if score else None
+        for key in keys:
+            stats[key][0] += 1
+            if hit is not None:
+                stats[key][1] += 1
+                stats[key][2] += hit
+    for fixture_id, (hg, ag, home_id, away_id) in outcomes.items():
+        for team, gf, ga in ((home_id, hg, ag), (away_id, ag, hg)):
+            row = stats[("team", str(team))]
+            row[3] += 1
+            row[4] += gf > ga
+            row[5] += gf == ga
+            row[6] += gf < ga
+            row[7] += gf
+            row[8] += gf * gf
+            row[9] += ga
+            row[10] += ga * ga
+    return {k: describe(v) for k, v in stats.items()}
+
+
+def memory_stats(store: LearningStore) -> dict:
+    return {k: describe(v) for k, v in store._stats.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--fixtures", type=int, default=5000)
+    parser.add_argument("--outcomes", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    rows, matches, scores = make_rows(args.n, args.fixtures)
+    insert_plain = insert_us(new_db(False), rows)
+    path = new_db(True)
+    insert_learning = insert_us(path, rows)
+    conn = connect(path)
+    store = LearningStore(path)
+    store.refresh()
+
+    settled = list(matches)[: args.outcomes]
+    start = time.perf_counter()
+    for fixture_id in settled:
+        store.record_outcome(fixture_id, *scores[fixture_id])
+    fold_us = (time.perf_counter() - start) / len(settled) * 1e6
+    repeat = store.record_outcome(settled[0], *scores[settled[0]])
+    assert not repeat["recorded"], "un resultado repetido no debe sumar dos veces"
+
+    outcomes = {fid: (*scores[fid], matches[fid][0], matches[fid][2]) for fid in settled}
+    start = time.perf_counter()
+    expected = legacy_stats(conn, outcomes)
+    legacy_ms = (time.perf_counter() - start) * 1e3
+    assert memory_stats(store) == expected
+    store.rebuild()
+    assert memory_stats(store) == expected
+
+    # Relleno inicial: migrar una DB ya poblada, con los resultados ya guardados
+    late = new_db(False)
+    late_conn = connect(late)
+    with late_conn:
+        late_conn.executemany(INSERT_SQL, rows)
+    learning_store.migrate(late)
+    late_store = LearningStore(late)
+    for fixture_id in settled:
+        late_store.record_outcome(fixture_id, *scores[fixture_id])
+    late_store.rebuild()
+    assert memory_stats(late_store) == expected
+
+    # observe: la memoria sigue a las predicciones de este proceso
+    probe = LearningStore(path)
+    probe.refresh()
+    extra = {"fixture": {"home_id": TEAMS[0][0], "away_id": TEAMS[1][0]}}
+    probe.observe("futbol", "Local", extra)
+    with conn:
+        conn.execute(INSERT_SQL, ("2026-01-01T00:00:00", "futbol", "x", "", "Local", json.dumps(extra)))
+    observed = memory_stats(probe)
+    probe.refresh()
+    assert observed == memory_stats(probe)
+    print(f"{args.n} predicciones, {len(settled)} resultados: memoria = recorrido completo = rebuild() = relleno inicial\n")
+
+    fixture = {"home_id": TEAMS[0][0], "away_id": TEAMS[1][0]}
+    start = time.perf_counter()
+    for _ in range(args.lookups):
+        store.features("futbol", fixture["home_id"], fixture["away_id"], "Local")
+    lookup_us = (time.perf_counter() - start) / args.lookups * 1e6
+
+    table = [
+        ("rasgos por petición (features) µs", lookup_us),
+        ("  recalcular recorriendo la tabla ms", legacy_ms),
+        ("inserción µs/fila sin learning_store", insert_plain),
+        ("inserción µs/fila con trigger de aprendizaje", insert_learning),
+        (f"plegar un resultado µs (~{args.n // args.fixtures} predicciones)", fold_us),
+        (f"refresh() completo ms ({len(store._stats)} claves)", best_ms(store.refresh, 5)),
+    ]
+    print(f"{'medida':<48} {'valor':>12}")
+    for label, value in table:
+        print(f"{label:<48} {value:>12.2f}")
+    print(f"\nejemplo: {json.dumps(store.features('futbol', fixture['home_id'], fixture['away_id'], 'Local'), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
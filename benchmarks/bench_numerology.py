@@ -0,0 +1,93 @@
+"""
+Benchmark del núcleo numerológico (numerology_core) frente a las
+implementaciones originales de reduce_to_core y numerology_from_birth*
+(copiadas abajo como referencia). Comprueba equivalencia antes de medir.
+
+    python benchmarks/bench_numerology.py
+"""
+
+import random
+import timeit
+import argparse
+from datetime import datetime, date, timedelta
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+from app.datamind.services.numerology_core import reduce_to_core  # noqa: E402
+from app.datamind.services.numerology_service import numerology_from_birth  # noqa: E402
+
+
+# ---------- implementación original ----------
+def legacy_reduce_to_core(n: int) -> int:
+    while n > 9 and n not in (11, 22, 33):
+        n = sum(int(d) for d in str(n))
+    return n
+
+
+def legacy_numerology_from_birth(birthdate: str) -> dict:
+    if not birthdate:
+        return {"birthdate": "", "birth_sum": 0, "birth_core": 0}
+
+    try:
+        dt = datetime.strptime(birthdate, "%Y-%m-%d")
+        digits = list(str(dt.year)) + list(str(dt.month)) + list(str(dt.day))
+        total = sum(int(d) for d in digits)
+        return {
+            "birthdate": birthdate,
+            "birth_sum": total,
+            "birth_core": legacy_reduce_to_core(total),
+        }
+    except ValueError:
+        return {"birthdate": birthdate, "birth_sum": 0, "birth_core": 0}
+
+
+def make_dates(n: int, distinct: int, seed: int = 3) -> list:
+    rnd = random.Random(seed)
+    pool = [(date(1950, 1, 1) + timedelta(days=rnd.randint(0, 27000))).isoformat() for _ in range(distinct)]
+    pool += ["1990-02-30", "no es fecha", "2000-1-5"]
+    return [rnd.choice(pool) for _ in range(n)]
+
+
+def check() -> None:
+    for n in list(range(-20, 200000)) + [10 ** k + d for k in range(5, 30) for d in range(-50, 50)]:
+        assert reduce_to_core(n) == legacy_reduce_to_core(n), n
+    for d in make_dates(5000, 5000, seed=9):
+        assert numerology_from_birth(d) == legacy_numerology_from_birth(d), d
+
+
+def bench(label: str, fn, values: list, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: [fn(v) for v in values], number=1, repeat=repeat))
+    per_call = best / len(values) * 1e6
+    print(f"{label:<42} {per_call:8.3f} µs/llamada")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=50000)
+    parser.add_argument("--distinct-dates", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    check()
+    print("Equivalencia OK\n")
+
+    rnd = random.Random(1)
+    values = [rnd.randint(0, 3000) for _ in range(args.n)]
+    big = [rnd.randint(10 ** 4, 10 ** 9) for _ in range(args.n)]
+    dates = make_dates(args.n, args.distinct_dates)
+
+    for label, old, new, data in (
+        ("reduce_to_core 0..3000", legacy_reduce_to_core, reduce_to_core, values),
+        ("reduce_to_core 1e4..1e9", legacy_reduce_to_core, reduce_to_core, big),
+        ("numerology_from_birth", legacy_numerology_from_birth, numerology_from_birth, dates),
+    ):
+        t_old = bench(f"{label} (original)", old, data, args.repeat)
+        t_new = bench(f"{label} (núcleo)", new, data, args.repeat)
+        print(f"{'':<42} x{t_old / t_new:.1f}\n")
+
+
+if __name__ == "__main__":
+    main()
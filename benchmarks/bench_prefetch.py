@@ -0,0 +1,134 @@
+"""
+Precarga de partidos (prefetch.py) contra el stub local de API-FOOTBALL.
+
+1. Sin precarga: get_next_fixture + get_fixture_statistics de cada
+   partido de las ligas del stub con la caché vacía (lo que paga /predict).
+2. Con precarga: una pasada de FixturePrefetcher con DB y caché nuevas y
+   después las mismas consultas, que no deben hacer ninguna petición al stub
+   (también escribiendo los nombres como los escribe un usuario: minúsculas
+   y sin acentos).
+3. Cuota: una pasada con presupuesto de llamadas corto y un cubo de 4
+   fichas por minuto; la precarga se corta sin pasarse y deja fichas de reserva.
+
+    python benchmarks/bench_prefetch.py --latency 0.05
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import unicodedata
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+STUB_PORT = int(os.getenv("STUB_PORT", 18083))
+
+# Antes de importar datamind_server: API-FOOTBALL apunta al stub y la DB es temporal
+os.environ["API_FOOTBALL_KEY"] = "bench"
+os.environ["API_FOOTBALL_BASE_URL"] = f"http://127.0.0.1:{STUB_PORT}"
+os.environ["API_FOOTBALL_RATE_PER_MINUTE"] = "1000000"
+os.environ["DATAMIND_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "prefetch.db")
+os.environ["PREFETCH_LEAGUES"] = "262:2025,39:2025"
+os.environ.pop("RENDER_EXTERNAL_URL", None)
+
+import datamind_server as dm  # noqa: E402
+from upstream_stub import UpstreamStub, league_fixtures, LEAGUE_TEAMS  # noqa: E402
+
+
+def as_typed(name: str) -> str:
+    return unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+
+
+def matches() -> list:
+    out = []
+    for league in LEAGUE_TEAMS:
+        for fx in league_fixtures(league, 2025, dm.PREFETCH_FIXTURES_PER_LEAGUE):
+            out.append((fx["teams"]["home"]["name"], fx["teams"]["away"]["name"]))
+    return out
+
+
+def reset_cache() -> None:
+    """Caché vacía sobre una DB nueva (como un despliegue recién arrancado)."""
+    path = os.path.join(tempfile.mkdtemp(), "prefetch.db")
+    dm.api_cache.__init__(
+        max_entries=dm.API_CACHE_MAX_ENTRIES, max_bytes=dm.API_CACHE_MAX_BYTES, db_path=path
+    )
+    dm.team_index.__init__(path, threshold=dm.TEAM_INDEX_THRESHOLD, lazy=True)
+
+
+def predict_inputs(home: str, away: str) -> None:
+    fixture = dm.get_next_fixture(home, away)
+    assert fixture.get("fixture_id"), (home, away, fixture)
+    home_stats, away_stats = dm.get_fixture_statistics(fixture)
+    assert home_stats and away_stats, (home, away)
+
+
+def timed(stub: UpstreamStub, pairs: list) -> tuple:
+    before = stub.requests
+    latencies = []
+    for home, away in pairs:
+        start = time.perf_counter()
+        predict_inputs(home, away)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return stub.requests - before, latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    stub = UpstreamStub(port=STUB_PORT, latency=args.latency).start_in_thread()
+    pairs = matches()
+
+    reset_cache()
+    cold_calls, cold = timed(stub, pairs)
+
+    reset_cache()
+    before = stub.requests
+    summary = dm.prefetcher.run()
+    prefetch_calls = stub.requests - before
+    warm_calls, warm = timed(stub, pairs)
+    typed_calls, typed = timed(stub, [(as_typed(h), as_typed(a)) for h, a in pairs])
+    again = dm.prefetcher.run()
+
+    print(f"{len(pairs)} partidos, latencia del stub {args.latency * 1e3:.0f} ms")
+    print(f"pasada de precarga: {prefetch_calls} peticiones, {summary['seconds']:.2f} s → {summary}")
+    print(f"segunda pasada (todo vigente): {again['calls']} peticiones, {again['statistics_fresh']} estadísticas vigentes")
+    print(f"\n{'caso':<30} {'peticiones':>10} {'p50 ms':>8} {'max ms':>8}")
+    for label, calls, lat in (
+        ("sin precarga", cold_calls, cold),
+        ("precargado", warm_calls, warm),
+        ("precargado, nombre tecleado", typed_calls, typed),
+    ):
+        print(f"{label:<30} {calls:>10} {lat[len(lat) // 2] * 1e3:>8.2f} {lat[-1] * 1e3:>8.2f}")
+    assert warm_calls == 0 and typed_calls == 0, "los partidos precargados no deben tocar la red"
+    assert again["calls"] == len(dm.prefetcher.targets) and again["statistics"] == 0
+
+    # Cuota: presupuesto de 5 llamadas y un cubo con sólo 4 fichas
+    reset_cache()
+    dm.upstream_scheduler = dm.upstream.UpstreamScheduler(stub.base_url, {}, rate_per_minute=4)
+    budget = dm.FixturePrefetcher(
+        dm.upstream_scheduler,
+        dm.prefetcher.targets,
+        summarize=dm.fixture_summary,
+        team_id=dm.get_team_id,
+        h2h_fixture=dm.get_h2h_fixture,
+        team_statistics=dm.get_team_statistics,
+        max_calls=5,
+        token_reserve=1,
+    )
+    limited = budget.run()
+    tokens = budget.client.bucket.stats()["tokens"]
+    print(f"\ncuota de 4/min, reserva 1: {limited['calls']} llamadas, "
+          f"{limited['statistics_pending']} estadísticas pendientes, {tokens:.1f} fichas libres")
+    assert limited["calls"] <= 3 and tokens >= 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Micro-benchmark de query_parser frente a las funciones originales de
+datamind_server (copiadas abajo tal cual como referencia).
+Antes de medir comprueba que ambas versiones dan el mismo resultado.
+
+    python benchmarks/bench_query_parser.py --n 20000
+"""
+
+import random
+import argparse
+import timeit
+from typing import Tuple
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+import query_parser  # noqa: E402
+
+
+# ---------- implementación original ----------
+def legacy_detect_sport(text: str) -> str:
+    t = text.lower()
+
+    if any(k in t for k in ["nba", "canastas", "rebotes", "triples", "puntos"]):
+        return "basket"
+
+    if any(k in t for k in ["mlb", "home run", "bases llenas", "pitcheo", "innings"]):
+        return "beisbol"
+
+    if any(k in t for k in ["nfl", "touchdown", "yardas", "quarterback"]):
+        return "nfl"
+
+    return "futbol"
+
+
+def legacy_extract_match_date(text: str) -> str:
+    import re
+
+    patterns = [
+        r"(\d{1,2}/\d{1,2}/\d{4})",
+        r"(\d{1,2}-\d{1,2}-\d{4})",
+        r"(\d{1,2}\.\d{1,2}\.\d{4})",
+    ]
+    for p in patterns:
+        m = re.search(p, text)
+        if m:
+            return m.group(1)
+
+    return "Fecha no especificada"
+
+
+def legacy_split_teams(text: str) -> Tuple[str, str]:
+    lowered = text.lower()
+    for sep in [" vs ", " v ", " - ", " contra ", " vs. "]:
+        if sep in lowered:
+            parts = lowered.split(sep)
+            if len(parts) >= 2:
+                return parts[0].strip().title(), parts[1].strip().title()
+    return text.title(), ""
+
+
+# ---------- datos ----------
+TEAMS = ["América", "Chivas", "Real Madrid", "Barcelona", "Lakers", "Celtics", "Yankees", "Dodgers", "Chiefs", "Eagles"]
+EXTRAS = ["", "nba", "puntos", "home run", "innings", "touchdown", "quarterback", "pronóstico", "goles", "touchdownba"]
+SEPS = [" vs ", " v ", " - ", " contra ", " vs. ", " y "]
+DATES = ["", "12/05/2025", "1-2-2026", "03.04.2025", "11-12-2024/5/2024", "hoy"]
+
+
+def make_queries(n: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        parts = [rnd.choice(TEAMS), rnd.choice(SEPS), rnd.choice(TEAMS), " ", rnd.choice(EXTRAS), " ", rnd.choice(DATES)]
+        if rnd.random() < 0.2:
+            parts.insert(3, rnd.choice(SEPS) + rnd.choice(TEAMS))
+        out.append("".join(parts))
+    return out
+
+
+def fuzz(n: int, seed: int = 11) -> list:
+    rnd = random.Random(seed)
+    alphabet = "abnlfmtsv -./0123456789vsnbanfl"
+    return ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 40))) for _ in range(n)]
+
+
+def check(queries: list) -> None:
+    for q in queries:
+        assert query_parser.detect_sport(q) == legacy_detect_sport(q), q
+        assert query_parser.extract_match_date(q) == legacy_extract_match_date(q), q
+        assert query_parser.split_teams(q) == legacy_split_teams(q), q
+
+
+def bench(label: str, fn, queries: list, repeat: int) -> float:
+    best = min(timeit.repeat(lambda: [fn(q) for q in queries], number=1, repeat=repeat))
+    per_call = best / len(queries) * 1e6
+    print(f"{label:<40} {per_call:8.2f} µs/consulta")
+    return per_call
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    queries = make_queries(args.n)
+    check(queries)
+    check(fuzz(args.n))
+    print(f"Equivalencia OK en {2 * args.n} consultas\n")
+
+    def legacy_all(q: str):
+        return legacy_detect_sport(q), legacy_split_teams(q), legacy_extract_match_date(q)
+
+    pairs = [
+        ("detect_sport", legacy_detect_sport, query_parser.detect_sport),
+        ("extract_match_date", legacy_extract_match_date, query_parser.extract_match_date),
+        ("split_teams", legacy_split_teams, query_parser.split_teams),
+        ("las tres / parse_query", legacy_all, query_parser.parse_query),
+    ]
+    for name, old, new in pairs:
+        t_old = bench(f"{name} (original)", old, queries, args.repeat)
+        t_new = bench(f"{name} (query_parser)", new, queries, args.repeat)
+        print(f"{'':<40} x{t_old / t_new:.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark de los registros de resultado (services/records.py) frente a los
+dicts anidados que devolvía el pipeline de análisis (copiados abajo como
+referencia). Comprueba antes de medir que ambos dan el mismo JSON.
+
+Mide, por resultado:
+- construcción de analyze_full_input
+- serialización con fast_json (sort_keys + ensure_ascii, como jsonify)
+- memoria retenida (tracemalloc) de analyze_full_input y de un lote de
+  analyze_batch
+- memoria de la caché de respuestas por resultado: guarda el cuerpo JSON
+  (bytes), así que no cambia con los registros
+
+    python benchmarks/bench_records.py --n 20000
+"""
+
+import os
+import json
+import random
+import timeit
+import argparse
+import tracemalloc
+
+from _bootstrap import setup_paths, ROOT
+
+setup_paths()
+
+import fast_json  # noqa: E402
+from app.logic import predictor  # noqa: E402
+from app.datamind.services.batch_service import analyze_batch  # noqa: E402
+from app.datamind.services.result_cache import ResultCache  # noqa: E402
+from app.datamind.services.numerology_core import reduce_to_core, birth_numbers  # noqa: E402
+
+NAMES = ["Lionel Andrés Messi", "Kylian Mbappé", "Raúl Jiménez", "Núñez Peña", "LeBron James", "Erling Haaland"]
+CODES = ["", "MESSI GOL", "LEO MIAMI FINAL", "anota"]
+
+with open(os.path.join(ROOT, "data", "cycles.json"), encoding="utf-8") as _f:
+    CYCLES = json.load(_f)
+
+
+# ---------- implementación original (dicts) ----------
+def legacy_analyze_full_input(name: str, birthdate: str, power_code: str) -> dict:
+    if name:
+        value = predictor.gematria_value(name)
+        name_info = {"name": name, "name_value": value, "name_core": reduce_to_core(value)}
+    else:
+        name_info = {"name": "", "name_value": 0, "name_core": 0}
+    if birthdate:
+        total, core = birth_numbers(birthdate)
+        birth_info = {"birthdate": birthdate, "birth_sum": total, "birth_core": core}
+    else:
+        birth_info = {"birthdate": "", "birth_sum": 0, "birth_core": 0}
+    power = predictor.analyze_power_code(power_code)
+    power_info = power.to_dict() if power else {}
+
+    details = []
+    if name_info.get("name_core"):
+        details.append(f"Vibración base del nombre: {name_info['name_core']}.")
+    if birth_info.get("birth_core"):
+        details.append(f"Camino de vida {birth_info['birth_core']}.")
+        # Frase del ciclo de vida (data/interpretation_rules.json)
+        if str(birth_info["birth_core"]) in CYCLES:
+            details.append(f"Ciclo {birth_info['birth_core']}: {CYCLES[str(birth_info['birth_core'])]}.")
+    if power_info and power_info.get("power_core"):
+        details.append(f"Código de poder detectado con vibración {power_info['power_core']}.")
+        if power_info.get("sports_hint"):
+            details.append(power_info["sports_hint"])
+    summary = details[0] if details else "Sin interpretación."
+
+    return {
+        "numerology": {"by_name": name_info, "by_birth": birth_info},
+        "gematria": {"text": name, "gematria": name_info.get("name_value", 0)},
+        "power_code_analysis": power_info,
+        "interpretation": {"summary": summary, "details": details},
+    }
+
+
+def legacy_analyze_batch(items: list) -> list:
+    # Mismo contenido que el lote original: dicts y listas sin compartir
+    return [analyze_batch([item])[0].to_dict() for item in items]
+
+
+# ---------- medidas ----------
+def make_inputs(n: int, seed: int = 7) -> list:
+    rnd = random.Random(seed)
+    return [
+        (f"{rnd.choice(NAMES)} {i}", f"19{rnd.randint(50, 99)}-0{rnd.randint(1, 9)}-{rnd.randint(10, 28)}", rnd.choice(CODES))
+        for i in range(n)
+    ]
+
+
+def check(inputs: list) -> None:
+    for args in inputs[:2000]:
+        new, old = predictor.analyze_full_input(*args), legacy_analyze_full_input(*args)
+        assert new == old, args
+        assert fast_json.dumps_bytes(new, ensure_ascii=True, sort_keys=True) == fast_json.dumps_bytes(
+            old, ensure_ascii=True, sort_keys=True
+        ), args
+    print("Mismo resultado y mismo JSON que los dicts originales\n")
+
+
+def retained_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def cached_bytes(objs: list) -> int:
+    """Lo que retiene ResultCache con estos resultados (como /analyze)."""
+
+    def fill() -> ResultCache:
+        cache = ResultCache(max_entries=len(objs) + 1, max_bytes=1 << 40)
+        for i, obj in enumerate(objs):
+            cache.put(("analyze", i), fast_json.dumps_bytes(obj, ensure_ascii=True, sort_keys=True))
+        return cache
+
+    return retained_bytes(fill)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.n)
+    check(inputs)
+    n = len(inputs)
+
+    def per_call(fn) -> float:
+        return min(timeit.repeat(lambda: [fn(*a) for a in inputs], number=1, repeat=args.repeat)) / n * 1e6
+
+    old_objs = [legacy_analyze_full_input(*a) for a in inputs]
+    new_objs = [predictor.analyze_full_input(*a) for a in inputs]
+
+    def serialize(objs) -> float:
+        dumps = fast_json.dumps_bytes
+        best = min(timeit.repeat(
+            lambda: [dumps(o, ensure_ascii=True, sort_keys=True) for o in objs], number=1, repeat=args.repeat
+        ))
+        return best / n * 1e6
+
+    items = [{"name": a[0], "birthdate": a[1]} for a in inputs]
+    rows = [
+        ("analyze_full_input µs", per_call(legacy_analyze_full_input), per_call(predictor.analyze_full_input)),
+        ("serializar µs", serialize(old_objs), serialize(new_objs)),
+        (
+            "memoria analyze B/resultado",
+            retained_bytes(lambda: [legacy_analyze_full_input(*a) for a in inputs]) / n,
+            retained_bytes(lambda: [predictor.analyze_full_input(*a) for a in inputs]) / n,
+        ),
+        (
+            "memoria lote B/item",
+            retained_bytes(lambda: legacy_analyze_batch(items)) / n,
+            retained_bytes(lambda: analyze_batch(items)) / n,
+        ),
+        ("memoria caché B/respuesta", cached_bytes(old_objs) / n, cached_bytes(new_objs) / n),
+    ]
+    print(f"{'medida':<30} {'dicts':>10} {'registros':>10} {'x':>6}")
+    for label, old, new in rows:
+        print(f"{label:<30} {old:>10.2f} {new:>10.2f} {old / new:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark de arranque de datamind_server. Cada medida en un proceso nuevo:
+
+- import:          `import datamind_server`
+- create_app:      import + crear la app Flask
+- first_response:  import + app + GET / por test client
+- server:          desde lanzar `python datamind_server.py` hasta el
+                   primer 200 de GET / por HTTP
+
+Para "en proceso" se mide con perf_counter dentro del hijo; "total" incluye
+arrancar el intérprete. --root mide otro checkout (p. ej. un `git worktree`
+de la versión anterior) para comparar antes/después:
+
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --root /tmp/datamind-anterior
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import http.client
+
+from _bootstrap import ROOT
+
+PROBES = {
+    "import": "import datamind_server as dm",
+    "create_app": "import datamind_server as dm; dm.app",
+    "first_response": (
+        "import datamind_server as dm\n"
+        "assert dm.app.test_client().get('/').status_code == 200"
+    ),
+}
+
+PROBE_TEMPLATE = """
+import time
+_t0 = time.perf_counter()
+{code}
+print((time.perf_counter() - _t0) * 1000)
+"""
+
+
+def probe_env(root: str) -> dict:
+    env = dict(os.environ)
+    env.pop("RENDER_EXTERNAL_URL", None)
+    env.update(
+        PYTHONPATH=root,
+        DATAMIND_DB_PATH=os.path.join(tempfile.mkdtemp(), "startup.db"),
+        API_FOOTBALL_KEY="",
+    )
+    return env
+
+
+def probe(name: str, root: str = ROOT) -> tuple:
+    """(ms en proceso, ms total) de una ejecución de la sonda `name`."""
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE_TEMPLATE.format(code=PROBES[name])],
+        cwd=root,
+        env=probe_env(root),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = (time.perf_counter() - start) * 1000
+    return float(out.stdout.strip().splitlines()[-1]), total
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_first_response(root: str = ROOT, timeout: float = 30.0) -> float:
+    """ms desde lanzar el servidor hasta el primer GET / con 200."""
+    port = _free_port()
+    env = probe_env(root)
+    env["PORT"] = str(port)
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "datamind_server.py"],
+        cwd=root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                conn.request("GET", "/")
+                if conn.getresponse().status == 200:
+                    return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise RuntimeError("El servidor no respondió a tiempo")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def summary(values: list) -> str:
+    return f"{statistics.median(values):>9.1f} {min(values):>9.1f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--root", default=ROOT, help="checkout a medir")
+    args = parser.parse_args()
+
+    print(f"{'sonda':<16} {'proceso ms':>19} {'total ms':>19}")
+    print(f"{'':<16} {'mediana':>9} {'mejor':>9} {'mediana':>9} {'mejor':>9}")
+    for name in PROBES:
+        probe(name, args.root)  # calentamiento (.pyc)
+        runs = [probe(name, args.root) for _ in range(args.runs)]
+        print(f"{name:<16} {summary([r[0] for r in runs])} {summary([r[1] for r in runs])}")
+
+    server = [server_first_response(args.root) for _ in range(args.runs)]
+    print(f"{'server':<16} {'':>19} {summary(server)}")
+
+
+if __name__ == "__main__":
+    main()
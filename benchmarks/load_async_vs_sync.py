@@ -0,0 +1,108 @@
+"""
+Prueba de carga: pipeline de /predict (fútbol) síncrono vs asíncrono
+contra el stub local de API-FOOTBALL.
+
+El modo síncrono reproduce un servidor con N hilos de trabajo (cada
+predicción bloquea un hilo durante todo el viaje a API-FOOTBALL); el
+asíncrono mantiene M predicciones en vuelo en un solo hilo.
+Cada consulta usa equipos distintos para que la caché no oculte la red.
+
+    python benchmarks/load_async_vs_sync.py --requests 400 --latency 0.3 \
+        --sync-workers 8 --async-concurrency 64 256
+"""
+
+import os
+import time
+import json
+import asyncio
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from _bootstrap import setup_paths
+
+setup_paths()
+
+STUB_PORT = int(os.getenv("STUB_PORT", 18080))
+os.environ.setdefault("API_FOOTBALL_KEY", "bench")
+os.environ.setdefault("API_FOOTBALL_BASE_URL", f"http://127.0.0.1:{STUB_PORT}")
+os.environ.setdefault("API_CACHE_PERSIST", "0")
+os.environ.setdefault("DATAMIND_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("HTTP_POOL_MAXSIZE", "512")
+os.environ.setdefault("HTTP_FANOUT_WORKERS", "512")
+os.environ.setdefault("ASYNC_CLIENT_SHARDS", "32")
+
+from upstream_stub import start_process  # noqa: E402
+import datamind_server as dm  # noqa: E402
+import async_server  # noqa: E402
+from http_client import deadline  # noqa: E402
+
+
+def queries(n: int, tag: str) -> list:
+    return [f"Equipo {tag}{i} vs Rival {tag}{i}" for i in range(n)]
+
+
+def sync_one(text: str) -> bool:
+    with deadline(dm.PREDICT_DEADLINE_SECONDS):
+        team1, team2 = dm.split_teams(text)
+        fixture = dm.get_next_fixture(team1, team2)
+        home, away = dm.get_fixture_statistics(fixture)
+    return bool(home and away)
+
+
+def run_sync(texts: list, workers: int) -> dict:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        ok = sum(pool.map(sync_one, texts))
+    elapsed = time.perf_counter() - start
+    return {"mode": "sync", "concurrency": workers, "requests": len(texts), "ok": ok,
+            "seconds": round(elapsed, 3), "rps": round(len(texts) / elapsed, 1)}
+
+
+async def _run_async(texts: list, concurrency: int) -> int:
+    client = async_server.AsyncFootballClient()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(text: str) -> bool:
+        async with sem:
+            await client.prefetch_soccer(text)
+            team1, team2 = dm.split_teams(text)
+            fixture = dm.api_cache.get("next_fixture", async_server.cache_key(team1, team2))
+            return bool(fixture)
+
+    try:
+        return sum(await asyncio.gather(*(one(t) for t in texts)))
+    finally:
+        await client.aclose()
+
+
+def run_async(texts: list, concurrency: int) -> dict:
+    start = time.perf_counter()
+    ok = asyncio.run(_run_async(texts, concurrency))
+    elapsed = time.perf_counter() - start
+    return {"mode": "async", "concurrency": concurrency, "requests": len(texts), "ok": ok,
+            "seconds": round(elapsed, 3), "rps": round(len(texts) / elapsed, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--sync-workers", type=int, nargs="+", default=[8], help="hilos del modo síncrono")
+    parser.add_argument("--async-concurrency", type=int, nargs="+", default=[64, 256], help="predicciones en vuelo del modo asíncrono")
+    parser.add_argument("--latency", type=float, default=0.3, help="latencia simulada del stub (s)")
+    args = parser.parse_args()
+
+    stub = start_process(STUB_PORT, args.latency)
+    try:
+        runs = [("sync", run_sync, c) for c in args.sync_workers]
+        runs += [("async", run_async, c) for c in args.async_concurrency]
+        for mode, runner, c in runs:
+            dm.api_cache.clear()
+            print(json.dumps(runner(queries(args.requests, f"{mode}{c}-"), c)))
+    finally:
+        stub.terminate()
+        dm.prediction_writer.close()
+
+
+if __name__ == "__main__":
+    main()
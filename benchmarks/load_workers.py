@@ -0,0 +1,200 @@
+"""
+Prueba de carga del perfil de producción (gunicorn.conf.py): el mismo
+tráfico contra 1, 2, 4... workers para ver cómo escala el rendimiento con
+los núcleos. API-FOOTBALL es el stub local y la DB es temporal, sembrada
+con predicciones para que /stats/predictions tenga qué agregar.
+
+Cada configuración arranca `gunicorn -c gunicorn.conf.py datamind_server:app`,
+espera al primer 200 y lanza --clients procesos cliente (conexiones
+keep-alive) durante --duration segundos. Los clientes comparten máquina
+con el servidor: con pocos núcleos conviene pocos clientes o lanzarlos
+desde otra máquina (--url).
+
+    python benchmarks/load_workers.py --workers 1 2 4 --threads 4 --clients 8 --duration 10
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import tempfile
+import importlib.util
+import subprocess
+import http.client
+import statistics
+import multiprocessing
+from collections import Counter
+from urllib.parse import urlparse
+
+from _bootstrap import setup_paths, ROOT
+
+setup_paths()
+
+STUB_PORT = int(os.getenv("STUB_PORT", 18082))
+
+# (método, ruta, cuerpo)
+SCENARIO = [
+    ("GET", "/stats/predictions?by=sport,league,month", None),
+    ("GET", "/stats/predictions/recent?sport=futbol&limit=50", None),
+    ("POST", "/predict", {"query": "América vs Chivas 12/05/2025"}),
+    ("POST", "/predict", {"query": "Tigres vs Monterrey"}),
+]
+
+
+def seed_db(path: str, rows: int) -> None:
+    """Tabla de predicciones con `rows` filas (migrada y con agregados)."""
+    env = dict(os.environ, DATAMIND_DB_PATH=path, API_FOOTBALL_KEY="", PYTHONPATH=ROOT)
+    code = (
+        "import datamind_server as dm, bench_analytics as b\n"
+        "from prediction_log import write_rows\n"
+        f"dm.ensure_db(); write_rows(dm.DB_PATH, b.make_rows({rows}))\n"
+    )
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=os.path.dirname(__file__), check=True)
+
+
+def wait_ready(host: str, port: int, timeout: float = 30.0) -> None:
+    give_up = time.time() + timeout
+    while time.time() < give_up:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("gunicorn no respondió a tiempo")
+
+
+def start_gunicorn(port: int, workers: int, threads: int, db_path: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_THREADS=str(threads),
+        DATAMIND_DB_PATH=db_path,
+        API_FOOTBALL_KEY="bench",
+        API_FOOTBALL_BASE_URL=f"http://127.0.0.1:{STUB_PORT}",
+        # Sin cuota: se mide el servidor, no el reparto de fichas
+        API_FOOTBALL_RATE_PER_MINUTE="1000000",
+        PYTHONPATH=ROOT,
+    )
+    env.pop("RENDER_EXTERNAL_URL", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "datamind_server:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def client(url: str, duration: float, seed: int, out: "multiprocessing.Queue") -> None:
+    parsed = urlparse(url)
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+    latencies = []
+    statuses: Counter = Counter()
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        method, path, body = rnd.choice(SCENARIO)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            statuses[resp.status] += 1
+        except (OSError, http.client.HTTPException):
+            statuses["error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    out.put((latencies, dict(statuses)))
+
+
+def run_load(url: str, clients: int, duration: float) -> dict:
+    out: "multiprocessing.Queue" = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=client, args=(url, duration, i, out)) for i in range(clients)]
+    for p in procs:
+        p.start()
+    latencies, statuses = [], Counter()
+    for _ in procs:
+        lat, st = out.get()
+        latencies.extend(lat)
+        statuses.update(st)
+    for p in procs:
+        p.join()
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "requests": n,
+        "rps": round(n / duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1e3, 2) if n else None,
+        "p99_ms": round(latencies[min(n - 1, int(n * 0.99))] * 1e3, 2) if n else None,
+        "status": {str(k): v for k, v in sorted(statuses.items(), key=str)},
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--seed-rows", type=int, default=20000)
+    parser.add_argument("--port", type=int, default=18090)
+    parser.add_argument("--latency", type=float, default=0.05, help="latencia del stub de API-FOOTBALL")
+    parser.add_argument("--url", help="medir un servidor ya arrancado en vez de lanzar gunicorn")
+    args = parser.parse_args()
+
+    if args.url:
+        print(json.dumps(run_load(args.url, args.clients, args.duration), ensure_ascii=False))
+        return 0
+
+    if importlib.util.find_spec("gunicorn") is None:
+        print("gunicorn no está instalado (pip install -r requirements.txt)")
+        return 2
+
+    from upstream_stub import start_process
+
+    print(f"{os.cpu_count()} núcleos; {args.clients} clientes durante {args.duration:.0f}s por configuración")
+    stub = start_process(STUB_PORT, latency=args.latency)
+    results = []
+    try:
+        for workers in args.workers:
+            db_path = os.path.join(tempfile.mkdtemp(), "load.db")
+            seed_db(db_path, args.seed_rows)
+            server = start_gunicorn(args.port, workers, args.threads, db_path)
+            try:
+                wait_ready("127.0.0.1", args.port)
+                result = {"workers": workers, "threads": args.threads,
+                          **run_load(f"http://127.0.0.1:{args.port}", args.clients, args.duration)}
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+            results.append(result)
+            print(json.dumps(result, ensure_ascii=False))
+            # Que el puerto quede libre antes de la siguiente configuración
+            for _ in range(50):
+                try:
+                    socket.create_connection(("127.0.0.1", args.port), timeout=0.1).close()
+                    time.sleep(0.1)
+                except OSError:
+                    break
+    finally:
+        stub.terminate()
+
+    base = results[0]["rps"] if results and results[0]["rps"] else None
+    print(f"\n{'workers':>8} {'req/s':>10} {'x':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        scale = r["rps"] / base if base else 0.0
+        print(f"{r['workers']:>8} {r['rps']:>10.1f} {scale:>6.2f} {r['p50_ms'] or 0:>8.2f} {r['p99_ms'] or 0:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Suite de benchmarks de DataMind.
+
+Micro: gematria_value (servicio y predictor), numerology_from_name,
+reduce_to_core, build_interpretation, detect_sport / split_teams /
+extract_match_date y log_prediction.
+Endpoints: /predict (datamind_server, con API-FOOTBALL sustituido por el
+stub local), /analyze y /datamind/analyze (create_app) vía test client.
+Arranque: import de datamind_server y primera respuesta, cada ejecución en
+un proceso nuevo (detalle en bench_startup.py).
+
+Guarda los resultados en JSON y los compara con una línea base:
+
+    python benchmarks/run.py --save-baseline      # fija la línea base
+    python benchmarks/run.py                      # mide y compara
+    python benchmarks/run.py --only micro --threshold 0.2
+
+Sale con código 1 si algún caso empeora más que el umbral.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+from datetime import datetime
+
+from _bootstrap import setup_paths, ROOT
+
+setup_paths()
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "results")
+STUB_PORT = int(os.getenv("STUB_PORT", 18081))
+
+# Antes de importar datamind_server: API-FOOTBALL apunta al stub y la DB es temporal
+os.environ.setdefault("API_FOOTBALL_KEY", "bench")
+os.environ.setdefault("API_FOOTBALL_BASE_URL", f"http://127.0.0.1:{STUB_PORT}")
+os.environ.setdefault("API_CACHE_PERSIST", "0")
+os.environ.setdefault("DATAMIND_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+NAMES = [
+    "Lionel Andrés Messi", "Cristiano Ronaldo", "Kylian Mbappé", "Erling Haaland",
+    "Guillermo Ochoa", "Hirving Lozano", "Raúl Jiménez", "Santiago Giménez",
+    "Núñez Peña", "LeBron James", "Shohei Ohtani", "Patrick Mahomes",
+]
+QUERIES = [
+    "América vs Chivas 12/05/2025", "Lakers contra Celtics puntos y rebotes",
+    "Yankees - Dodgers home run", "Chiefs vs Eagles touchdown 09-02-2025",
+    "Real Madrid v Barcelona", "Tigres vs Monterrey 3.4.2025",
+]
+
+
+def measure(fn, number: int, repeat: int) -> dict:
+    """Tiempo por operación en µs (mejor y mediana de `repeat` rondas)."""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) / number * 1e6)
+    return {"best_us": round(min(rounds), 3), "median_us": round(statistics.median(rounds), 3), "number": number}
+
+
+def cycle(values):
+    """Devuelve una función que entrega los valores en rueda."""
+    state = {"i": 0}
+    n = len(values)
+
+    def nxt():
+        state["i"] = (state["i"] + 1) % n
+        return values[state["i"]]
+
+    return nxt
+
+
+# ==========================================
+#  MICRO
+# ==========================================
+def micro_cases(scale: float) -> dict:
+    from app.datamind.services import gematria_service, numerology_service, interpretation_service
+    from app.logic import predictor
+    import datamind_server as dm
+
+    n = max(1, int(20000 * scale))
+    name = cycle(NAMES)
+    query = cycle(QUERIES)
+    ints = cycle([random.Random(5).randint(0, 5000) for _ in range(1000)])
+    name_data = numerology_service.numerology_from_name("Lionel Messi")
+    birth_data = numerology_service.numerology_from_birth("1987-06-24")
+
+    return {
+        "gematria_service.gematria_value": (lambda: gematria_service.gematria_value(name()), n),
+        "predictor.gematria_value": (lambda: predictor.gematria_value(name()), n),
+        "numerology_service.numerology_from_name": (lambda: numerology_service.numerology_from_name(name()), n),
+        "reduce_to_core": (lambda: numerology_service.reduce_to_core(ints()), n),
+        "build_interpretation": (
+            lambda: interpretation_service.build_interpretation(name_data, birth_data, 294), n
+        ),
+        "detect_sport": (lambda: dm.detect_sport(query()), n),
+        "split_teams": (lambda: dm.split_teams(query()), n),
+        "extract_match_date": (lambda: dm.extract_match_date(query()), n),
+        "log_prediction": (
+            lambda: dm.log_prediction("futbol", query(), "12/05/2025", "Local", {"bench": True}),
+            max(1, n // 4),
+        ),
+    }
+
+
+# ==========================================
+#  ENDPOINTS
+# ==========================================
+def endpoint_cases(scale: float) -> dict:
+    from app.app import create_app
+    import datamind_server as dm
+
+    n = max(1, int(500 * scale))
+    server = dm.app.test_client()
+    # Memoria de patrones en temporal, no en data/memory.db del repo
+    webapp = create_app(pattern_memory_db=os.path.join(tempfile.mkdtemp(), "memory.db")).test_client()
+    query = cycle(QUERIES)
+    name = cycle(NAMES)
+    counter = {"i": 0}
+
+    def unique_name():
+        counter["i"] += 1
+        return f"{name()} {counter['i']}"
+
+    status = {}
+
+    def call(label, fn):
+        def run():
+            resp = fn()
+            status[label] = resp.status_code
+
+        return run
+
+    cases = {
+        "POST /predict": (call("POST /predict", lambda: server.post("/predict", json={"query": query()})), n),
+        "POST /analyze (repetido)": (
+            call("POST /analyze (repetido)", lambda: webapp.post(
+                "/analyze", json={"name": "Lionel Messi", "birthdate": "1987-06-24", "power_code": "MESSI GOL"})),
+            n,
+        ),
+        "POST /analyze (nuevo)": (
+            call("POST /analyze (nuevo)", lambda: webapp.post(
+                "/analyze", json={"name": unique_name(), "birthdate": "1987-06-24", "power_code": "MESSI GOL"})),
+            n,
+        ),
+        "POST /datamind/analyze (repetido)": (
+            call("POST /datamind/analyze (repetido)", lambda: webapp.post(
+                "/datamind/analyze", json={"name": "Lionel Messi", "birthdate": "1987-06-24"})),
+            n,
+        ),
+        "POST /datamind/analyze (nuevo)": (
+            call("POST /datamind/analyze (nuevo)", lambda: webapp.post(
+                "/datamind/analyze", json={"name": unique_name(), "birthdate": "1987-06-24"})),
+            n,
+        ),
+    }
+    return cases, status
+
+
+# ==========================================
+#  ARRANQUE
+# ==========================================
+def startup_cases(scale: float) -> dict:
+    from bench_startup import probe
+
+    n = max(1, int(3 * scale))
+    return {
+        "arranque: import datamind_server": (lambda: probe("import"), n),
+        "arranque: primera respuesta": (lambda: probe("first_response"), n),
+    }
+
+
+# ==========================================
+#  RESULTADOS / LÍNEA BASE
+# ==========================================
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    print(f"\n{'caso':<44} {'base µs':>10} {'actual µs':>10} {'cambio':>8}")
+    for name, res in current["cases"].items():
+        base = base_cases.get(name)
+        if not base:
+            print(f"{name:<44} {'-':>10} {res['best_us']:>10.2f} {'nuevo':>8}")
+            continue
+        change = res["best_us"] / base["best_us"] - 1 if base["best_us"] else 0.0
+        mark = "  <-- REGRESIÓN" if change > threshold else ""
+        print(f"{name:<44} {base['best_us']:>10.2f} {res['best_us']:>10.2f} {change:>+7.1%}{mark}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", choices=["micro", "endpoints", "startup"], help="ejecutar sólo un grupo")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplica el número de iteraciones")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="guardar el resultado como línea base")
+    parser.add_argument("--threshold", type=float, default=0.15, help="empeoramiento tolerado (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    from upstream_stub import start_process
+
+    stub = start_process(STUB_PORT, latency=0.0)
+    cases = {}
+    status = {}
+    try:
+        if args.only in (None, "micro"):
+            cases.update(micro_cases(args.scale))
+        if args.only in (None, "endpoints"):
+            endpoint, status = endpoint_cases(args.scale)
+            cases.update(endpoint)
+        if args.only in (None, "startup"):
+            cases.update(startup_cases(args.scale))
+
+        results = {}
+        for name, (fn, number) in cases.items():
+            fn()  # calentamiento
+            results[name] = measure(fn, number, args.repeat)
+            if name in status:
+                results[name]["status"] = status[name]
+            print(f"{name:<44} {results[name]['best_us']:>10.2f} µs/op")
+    finally:
+        stub.terminate()
+
+    import datamind_server as dm
+    dm.prediction_writer.close()
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": _git_commit(),
+        "cases": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nLínea base guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nSin línea base en {args.baseline}; usa --save-baseline para crearla")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regresión(es) por encima del {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def _git_commit() -> str:
+    try:
+        import subprocess
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return ""
+
+
+if __name__ == "__main__":
+    sys.exit(main())
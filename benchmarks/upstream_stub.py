@@ -0,0 +1,196 @@
+"""
+Sustituto local de API-FOOTBALL para benchmarks y pruebas de carga.
+Responde /teams, /fixtures (h2h o próximos partidos de una liga) y
+/teams/statistics con datos fijos y una latencia simulada, sin red externa. Con --quota imita la cuota por minuto
+del proveedor (cabeceras X-RateLimit-* y 429 al agotarla).
+
+    python benchmarks/upstream_stub.py --port 18080 --latency 0.1 --quota 30
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import threading
+import subprocess
+import zlib
+from urllib.parse import urlparse, parse_qs
+
+# Equipos de las ligas del stub (el ID es el mismo que da /teams?search=)
+LEAGUE_TEAMS = {
+    262: ["América", "Chivas", "Tigres", "Monterrey", "Cruz Azul", "Pumas", "Toluca", "León"],
+    39: ["Arsenal", "Chelsea", "Liverpool", "Manchester City", "Tottenham", "Newcastle"],
+}
+
+
+def team_id_for(name: str) -> int:
+    return zlib.crc32(name.lower().encode("utf-8")) % 100000 + 1
+
+
+def league_fixtures(league: int, season: int, count: int) -> list:
+    """Jornadas de todos contra todos, un día por partido."""
+    teams = LEAGUE_TEAMS.get(league, [])
+    pairs = [(h, a) for i, h in enumerate(teams) for a in teams[i + 1:]]
+    out = []
+    for n, (home, away) in enumerate(pairs[:count]):
+        out.append({
+            "fixture": {"id": league * 10000 + n, "date": f"2026-02-{n % 28 + 1:02d}T20:00:00-06:00", "venue": {"name": f"Estadio {home}"}},
+            "league": {"id": league, "name": f"Liga {league}", "season": season},
+            "teams": {
+                "home": {"id": team_id_for(home), "name": home},
+                "away": {"id": team_id_for(away), "name": away},
+            },
+        })
+    return out
+
+
+class UpstreamStub:
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 18080, latency: float = 0.05, quota: int = 0
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.quota = quota
+        self.requests = 0
+        self._window = 0
+        self._window_count = 0
+        self._loop = None
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def payload(self, path: str, query: dict) -> dict:
+        if path == "/teams":
+            name = (query.get("search") or [""])[0]
+            team_id = team_id_for(name)
+            return {"response": [{"team": {"id": team_id, "name": name}}]}
+        if path == "/fixtures" and "league" in query:
+            league = int(query["league"][0])
+            season = int((query.get("season") or ["2025"])[0])
+            return {"response": league_fixtures(league, season, int((query.get("next") or ["10"])[0]))}
+        if path == "/fixtures":
+            home, _, away = (query.get("h2h") or ["1-2"])[0].partition("-")
+            return {
+                "response": [
+                    {
+                        "fixture": {"id": int(home) * 100000 + int(away or 0), "date": "2026-01-01T20:00:00-06:00", "venue": {"name": "Estadio Local"}},
+                        "league": {"id": 262, "name": "Liga MX", "season": 2025},
+                        "teams": {
+                            "home": {"id": int(home), "name": f"Team {home}"},
+                            "away": {"id": int(away or 0), "name": f"Team {away}"},
+                        },
+                    }
+                ]
+            }
+        if path == "/teams/statistics":
+            team = (query.get("team") or ["0"])[0]
+            return {
+                "response": {
+                    "team": {"id": int(team)},
+                    "form": "WWDLW",
+                    "goals": {"for": {"total": {"total": 30}}, "against": {"total": {"total": 18}}},
+                }
+            }
+        return {"response": []}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                _, target, _ = line.decode("latin-1").split(" ", 2)
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self.requests += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                url = urlparse(target)
+                status, extra = "200 OK", ""
+                if self.quota:
+                    window = int(time.time() // 60)
+                    if window != self._window:
+                        self._window, self._window_count = window, 0
+                    self._window_count += 1
+                    left = max(0, self.quota - self._window_count)
+                    extra = f"X-RateLimit-Limit: {self.quota}\r\nX-RateLimit-Remaining: {left}\r\n"
+                    if self._window_count > self.quota:
+                        status = "429 Too Many Requests"
+                        extra += f"Retry-After: {60 - int(time.time()) % 60}\r\n"
+                if status.startswith("200"):
+                    body = json.dumps(self.payload(url.path, parse_qs(url.query))).encode("utf-8")
+                else:
+                    body = b'{"message": "Too many requests"}'
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n{extra}".encode("latin-1")
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=2048)
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "UpstreamStub":
+        """Arranca el stub en un hilo con su propio bucle asyncio."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+            async def main() -> None:
+                self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=2048)
+                ready.set()
+                async with self._server:
+                    await self._server.serve_forever()
+
+            try:
+                self._loop.run_until_complete(main())
+            except asyncio.CancelledError:
+                pass
+
+        threading.Thread(target=run, name="upstream-stub", daemon=True).start()
+        ready.wait(5)
+        return self
+
+
+def start_process(port: int = 18080, latency: float = 0.05, quota: int = 0) -> subprocess.Popen:
+    """
+    Arranca el stub en otro proceso (para no competir por el GIL con el
+    cliente medido) y espera a que acepte conexiones.
+    """
+    proc = subprocess.Popen([
+        sys.executable, os.path.abspath(__file__), "--port", str(port), "--latency", str(latency),
+        "--quota", str(quota),
+    ])
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.terminate()
+    raise RuntimeError("El stub de API-FOOTBALL no arrancó")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--quota", type=int, default=0, help="peticiones por minuto (0 = sin límite)")
+    args = parser.parse_args()
+    asyncio.run(UpstreamStub(args.host, args.port, args.latency, args.quota).serve())
@@ -7,7 +7,9 @@ DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
 MEMORY_FILE = DATA_DIR / "memory_log.json"
+MEMORY_DB = DATA_DIR / "memory.db"
 CYCLES_FILE = DATA_DIR / "cycles.json"
+INTERPRETATION_RULES_FILE = DATA_DIR / "interpretation_rules.json"
 
 APP_NAME = "PredictMind"
 DEBUG = True
@@ -1,24 +1,32 @@
 import os
-import json
 import sqlite3
 import logging
+import threading
 from datetime import datetime
 from typing import Tuple, Dict, Any, Optional
 
-import requests
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-
-# --- KeepAlive imports ---
-import threading
-import time
+import query_parser
+import fast_json
+from prediction_log import get_writer
+import prediction_analytics
+import learning_store
+from api_cache import TTLCache, cached
+from http_client import get_session, deadline, run_parallel
+from metrics import StageMetrics
+from team_index import TeamIndex
+from scheduler import Scheduler, ProcessLock
+from prefetch import FixturePrefetcher, parse_targets
+import upstream
+from upstream import UpstreamUnavailable
+
+# Importar este módulo no abre la DB, no lanza hilos ni carga Flask/requests:
+# la app se crea con create_app() (o al pedir `datamind_server.app`), las
+# tablas en el primer uso y las tareas de fondo desde los hooks de
+# arranque (start_background_services / start_worker_services / gunicorn.conf.py).
 
 # ==========================================
 #  CONFIGURACIÓN BÁSICA
 # ==========================================
-app = Flask(__name__)
-CORS(app)
-
 PORT = int(os.environ.get("PORT", 10000))
 
 # API-FOOTBALL (stats reales para fútbol)
@@ -32,15 +40,54 @@ TIMEZONE = os.getenv("TIMEZONE", "America/Mexico_City")
 
 DB_PATH = os.getenv("DATAMIND_DB_PATH", "datamind_memory.db")
 
+# Caché de API-FOOTBALL (TTL en segundos por endpoint)
+API_CACHE_TTL_TEAMS = int(os.getenv("API_CACHE_TTL_TEAMS", 30 * 24 * 3600))
+API_CACHE_TTL_FIXTURES = int(os.getenv("API_CACHE_TTL_FIXTURES", 3600))
+API_CACHE_TTL_STATS = int(os.getenv("API_CACHE_TTL_STATS", 12 * 3600))
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", 5000))
+API_CACHE_MAX_BYTES = int(os.getenv("API_CACHE_MAX_BYTES", 16 * 1024 * 1024))
+API_CACHE_PERSIST = os.getenv("API_CACHE_PERSIST", "1") == "1"
+
+# Índice local de equipos: similitud mínima (0-1) para aceptar un nombre aproximado
+TEAM_INDEX_THRESHOLD = float(os.getenv("TEAM_INDEX_THRESHOLD", 0.6))
+
+# Plazo total (segundos) para las llamadas externas de una predicción
+PREDICT_DEADLINE_SECONDS = float(os.getenv("PREDICT_DEADLINE_SECONDS", 20))
+
 # URL pública del servicio para KeepAlive
 RENDER_EXTERNAL_URL = os.getenv("RENDER_EXTERNAL_URL", "").rstrip("/")
 
+# Tareas de fondo (segundos entre ejecuciones; llevan ±10% de jitter)
+KEEPALIVE_INTERVAL_SECONDS = float(os.getenv("KEEPALIVE_INTERVAL_SECONDS", 40))
+API_CACHE_PURGE_SECONDS = float(os.getenv("API_CACHE_PURGE_SECONDS", 3600))
+TEAM_INDEX_RELOAD_SECONDS = float(os.getenv("TEAM_INDEX_RELOAD_SECONDS", 60))
+BACKGROUND_CLAIM_SECONDS = float(os.getenv("BACKGROUND_CLAIM_SECONDS", 30))
+LEARNING_REFRESH_SECONDS = float(os.getenv("LEARNING_REFRESH_SECONDS", 60))
+
+# Precarga de próximos partidos: "liga:temporada,..." (vacío = desactivada)
+PREFETCH_LEAGUES = os.getenv("PREFETCH_LEAGUES", "")
+PREFETCH_INTERVAL_SECONDS = float(os.getenv("PREFETCH_INTERVAL_SECONDS", 1800))
+PREFETCH_FIXTURES_PER_LEAGUE = int(os.getenv("PREFETCH_FIXTURES_PER_LEAGUE", 20))
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", 2))
+PREFETCH_MAX_CALLS = int(os.getenv("PREFETCH_MAX_CALLS", 40))
+PREFETCH_TOKEN_RESERVE = float(os.getenv("PREFETCH_TOKEN_RESERVE", 2))
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - DataMind - %(levelname)s - %(message)s",
 )
 log = logging.getLogger("DataMind")
 
+# Latencias por etapa de /predict y de las llamadas a API-FOOTBALL (/metrics)
+stage_metrics = StageMetrics("datamind")
+
+# Planificador de tareas de fondo: arranca desde los hooks de ciclo de vida
+background = Scheduler("datamind-background")
+stage_metrics.gauges("background", "Tareas de fondo", background.gauges)
+
+# Con gunicorn, las tareas de todo el despliegue corren en el worker que tiene este candado
+background_lock = ProcessLock(f"{DB_PATH}.background.lock")
+
 
 # ==========================================
 #  DB: MEMORIA PARA APRENDER DESPUÉS
@@ -63,6 +110,24 @@ def init_db() -> None:
     )
     conn.commit()
     conn.close()
+    # Índices, columnas promovidas de extra_info y agregados incrementales
+    prediction_analytics.migrate(DB_PATH)
+    learning_store.migrate(DB_PATH)
+
+
+_db_ready = False
+_db_lock = threading.Lock()
+
+
+def ensure_db() -> None:
+    """init_db() una vez por proceso, la primera vez que hace falta."""
+    global _db_ready
+    if _db_ready:
+        return
+    with _db_lock:
+        if not _db_ready:
+            init_db()
+            _db_ready = True
 
 
 def log_prediction(
@@ -71,173 +136,251 @@ def log_prediction(
     match_date: str,
     main_pick: str,
     extra_info: Dict[str, Any],
+    block: bool = True,
 ) -> None:
+    """Encola la predicción; el hilo escritor la inserta por lotes."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO predictions (created_at, sport, raw_query, match_date, main_pick, extra_info)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        ensure_db()
+        queued = prediction_writer.submit(
             (
                 datetime.utcnow().isoformat(),
                 sport,
                 query,
                 match_date,
                 main_pick,
-                json.dumps(extra_info, ensure_ascii=False),
+                fast_json.dumps(extra_info),
             ),
+            block=block,
         )
-        conn.commit()
-        conn.close()
+        # Con la cola llena la fila se descarta: tampoco cuenta para el aprendizaje
+        if queued:
+            learning.observe(sport, main_pick, extra_info)
     except Exception as e:
         log.error(f"Error guardando predicción en DB: {e}")
 
 
-init_db()
-
-
-# ==========================================
-#  UTILIDADES GENERALES
-# ==========================================
-def detect_sport(text: str) -> str:
-    t = text.lower()
-
-    if any(k in t for k in ["nba", "canastas", "rebotes", "triples", "puntos"]):
-        return "basket"
-
-    if any(k in t for k in ["mlb", "home run", "bases llenas", "pitcheo", "innings"]):
-        return "beisbol"
-
-    if any(k in t for k in ["nfl", "touchdown", "yardas", "quarterback"]):
-        return "nfl"
-
-    return "futbol"
+# El hilo escritor arranca con la primera predicción, no al importar
+prediction_writer = get_writer(DB_PATH)
+background.on_shutdown(prediction_writer.close)
+stage_metrics.gauges("prediction_log", "Escritor de predicciones", prediction_writer.stats)
 
+# Resúmenes por deporte/liga/mes leídos de los agregados (prediction_analytics)
+analytics = prediction_analytics.PredictionAnalytics(DB_PATH)
 
-def extract_match_date(text: str) -> str:
-    import re
+# Histórico por deporte, pick y equipo en memoria (learning_store)
+learning = learning_store.LearningStore(DB_PATH)
+stage_metrics.gauges("learning", "Agregados de aprendizaje", learning.stats)
 
-    patterns = [
-        r"(\d{1,2}/\d{1,2}/\d{4})",
-        r"(\d{1,2}-\d{1,2}-\d{4})",
-        r"(\d{1,2}\.\d{1,2}\.\d{4})",
-    ]
-    for p in patterns:
-        m = re.search(p, text)
-        if m:
-            return m.group(1)
 
-    return "Fecha no especificada"
+def historical_features(
+    sport: str, fixture: Optional[Dict[str, Any]] = None, pick: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Rasgos históricos para los build_*_analysis: aciertos por deporte y
+    pick, forma y goles por equipo. Búsquedas en memoria, sin tocar la DB.
+    """
+    ensure_db()
+    fixture = fixture or {}
+    return learning.features(sport, fixture.get("home_id"), fixture.get("away_id"), pick)
 
 
-def split_teams(text: str) -> Tuple[str, str]:
-    lowered = text.lower()
-    for sep in [" vs ", " v ", " - ", " contra ", " vs. "]:
-        if sep in lowered:
-            parts = lowered.split(sep)
-            if len(parts) >= 2:
-                return parts[0].strip().title(), parts[1].strip().title()
-    return text.title(), ""
+# ==========================================
+#  UTILIDADES GENERALES
+# ==========================================
+# detect_sport, extract_match_date y split_teams viven en query_parser:
+# una sola pasada por el texto con expresiones precompiladas.
+detect_sport = query_parser.detect_sport
+extract_match_date = query_parser.extract_match_date
+split_teams = query_parser.split_teams
+parse_query = query_parser.parse_query
 
 
 # ==========================================
 #  API-FOOTBALL HELPERS
 # ==========================================
+# Los IDs de equipo casi nunca cambian y las estadísticas, como mucho a diario:
+# se cachean para no gastar la cuota de API-FOOTBALL en cada /predict.
+api_cache = TTLCache(
+    max_entries=API_CACHE_MAX_ENTRIES,
+    max_bytes=API_CACHE_MAX_BYTES,
+    db_path=DB_PATH if API_CACHE_PERSIST else None,
+)
+stage_metrics.gauges("api_cache", "Caché de API-FOOTBALL", api_cache.stats)
+
+# Nombres y alias conocidos → ID; /teams?search= sólo para lo que no esté aquí
+team_index = TeamIndex(DB_PATH, threshold=TEAM_INDEX_THRESHOLD, lazy=True)
+stage_metrics.gauges("team_index", "Índice local de equipos", team_index.stats)
+
+
 def api_football_headers() -> Dict[str, str]:
     return {
         "x-apisports-key": API_FOOTBALL_KEY,
     }
 
 
+# Cuota por minuto, single-flight y circuit breaker para API-FOOTBALL.
+# Si no hay cupo, los helpers sirven el último dato conocido de la caché.
+upstream_scheduler = upstream.from_env(API_FOOTBALL_BASE, api_football_headers())
+stage_metrics.gauges("upstream", "Planificador de API-FOOTBALL", upstream_scheduler.stats)
+
+
+@cached(api_cache, "team_id", API_CACHE_TTL_TEAMS, stale_on=(UpstreamUnavailable,))
 def get_team_id(team_name: str) -> Optional[int]:
-    if not API_FOOTBALL_KEY or not team_name:
+    if not team_name:
+        return None
+
+    with stage_metrics.stage("team_index"):
+        team_id = team_index.resolve(team_name)
+        # Alias que otro worker acaba de añadir (p. ej. la precarga) antes de ir a la red
+        if not team_id and team_index.refresh():
+            team_id = team_index.resolve(team_name)
+    if team_id:
+        return team_id
+
+    if not API_FOOTBALL_KEY:
         return None
 
     try:
-        r = requests.get(
-            f"{API_FOOTBALL_BASE}/teams",
-            params={"search": team_name},
-            headers=api_football_headers(),
-            timeout=10,
-        )
-        data = r.json()
+        with stage_metrics.stage("api_teams"):
+            data = upstream_scheduler.get_json("/teams", {"search": team_name}, timeout=10)
         res = data.get("response") or []
         if not res:
             return None
-        return res[0]["team"]["id"]
+        team = res[0]["team"]
+        team_index.add(team_name, team["id"], canonical=team.get("name"))
+        return team["id"]
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         log.error(f"Error buscando ID de equipo '{team_name}': {e}")
         return None
 
 
-def get_next_fixture(team1_name: str, team2_name: str) -> Dict[str, Any]:
-    if not API_FOOTBALL_KEY:
-        return {}
+def fixture_summary(fx: Dict[str, Any]) -> Dict[str, Any]:
+    """Lo que se guarda de un fixture de API-FOOTBALL."""
+    fixture_info = fx["fixture"]
+    league_info = fx["league"]
 
-    try:
-        id1 = get_team_id(team1_name)
-        id2 = get_team_id(team2_name)
-        if not id1 or not id2:
-            return {}
+    return {
+        "fixture_id": fixture_info.get("id"),
+        "datetime": fixture_info.get("date"),
+        "venue": (fixture_info.get("venue") or {}).get("name"),
+        "league_id": league_info.get("id"),
+        "league_name": league_info.get("name"),
+        "season": league_info.get("season"),
+        "home_id": fx["teams"]["home"].get("id"),
+        "home_name": fx["teams"]["home"]["name"],
+        "away_id": fx["teams"]["away"].get("id"),
+        "away_name": fx["teams"]["away"]["name"],
+    }
 
-        r = requests.get(
-            f"{API_FOOTBALL_BASE}/fixtures",
-            params={
-                "h2h": f"{id1}-{id2}",
-                "next": 1,
-                "timezone": TIMEZONE,
-            },
-            headers=api_football_headers(),
-            timeout=15,
-        )
-        data = r.json()
+
+@cached(api_cache, "h2h_fixture", API_CACHE_TTL_FIXTURES, stale_on=(UpstreamUnavailable,))
+def get_h2h_fixture(id_a: int, id_b: int) -> Dict[str, Any]:
+    """Próximo partido entre dos equipos (IDs en orden ascendente: la clave no depende del orden)."""
+    try:
+        with stage_metrics.stage("api_fixtures"):
+            data = upstream_scheduler.get_json(
+                "/fixtures",
+                {
+                    "h2h": f"{id_a}-{id_b}",
+                    "next": 1,
+                    "timezone": TIMEZONE,
+                },
+                timeout=15,
+            )
         fixtures = data.get("response") or []
         if not fixtures:
             return {}
+        return fixture_summary(fixtures[0])
 
-        fx = fixtures[0]
-        fixture_info = fx["fixture"]
-        league_info = fx["league"]
-
-        return {
-            "fixture_id": fixture_info.get("id"),
-            "datetime": fixture_info.get("date"),
-            "venue": (fixture_info.get("venue") or {}).get("name"),
-            "league_id": league_info.get("id"),
-            "league_name": league_info.get("name"),
-            "season": league_info.get("season"),
-            "home_name": fx["teams"]["home"]["name"],
-            "away_name": fx["teams"]["away"]["name"],
-        }
-
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         log.error(f"Error obteniendo fixture head-to-head: {e}")
         return {}
 
 
+@cached(api_cache, "next_fixture", API_CACHE_TTL_FIXTURES, stale_on=(UpstreamUnavailable,))
+def get_next_fixture(team1_name: str, team2_name: str) -> Dict[str, Any]:
+    if not API_FOOTBALL_KEY:
+        return {}
+
+    # Sin proveedor no es "equipo no encontrado": sube para servir lo último conocido o 503
+    id1, id2 = run_parallel(
+        [
+            lambda: get_team_id(team1_name),
+            lambda: get_team_id(team2_name),
+        ],
+        reraise=(UpstreamUnavailable,),
+    )
+    if not id1 or not id2:
+        return {}
+    return get_h2h_fixture(min(id1, id2), max(id1, id2))
+
+
+@cached(api_cache, "team_statistics", API_CACHE_TTL_STATS, stale_on=(UpstreamUnavailable,))
 def get_team_statistics(team_id: int, league_id: int, season: int) -> Dict[str, Any]:
     if not API_FOOTBALL_KEY:
         return {}
 
     try:
-        r = requests.get(
-            f"{API_FOOTBALL_BASE}/teams/statistics",
-            params={
-                "team": team_id,
-                "league": league_id,
-                "season": season,
-            },
-            headers=api_football_headers(),
-            timeout=15,
-        )
-        return r.json().get("response") or {}
+        with stage_metrics.stage("api_team_statistics"):
+            data = upstream_scheduler.get_json(
+                "/teams/statistics",
+                {
+                    "team": team_id,
+                    "league": league_id,
+                    "season": season,
+                },
+                timeout=15,
+            )
+        return data.get("response") or {}
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         log.error(f"Error obteniendo estadísticas de equipo: {e}")
         return {}
 
 
+def get_fixture_statistics(fixture: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Estadísticas de local y visitante de un fixture, pedidas a la vez."""
+    if not fixture or not fixture.get("home_id") or not fixture.get("away_id"):
+        return {}, {}
+
+    league_id = fixture.get("league_id")
+    season = fixture.get("season")
+    home, away = run_parallel(
+        [
+            lambda: get_team_statistics(fixture["home_id"], league_id, season),
+            lambda: get_team_statistics(fixture["away_id"], league_id, season),
+        ],
+        default={},
+        reraise=(UpstreamUnavailable,),
+    )
+    return home, away
+
+
+# Próximos partidos de las ligas configuradas → caché (tarea de fondo)
+prefetcher = FixturePrefetcher(
+    upstream_scheduler,
+    parse_targets(PREFETCH_LEAGUES),
+    summarize=fixture_summary,
+    team_id=get_team_id,
+    h2h_fixture=get_h2h_fixture,
+    team_statistics=get_team_statistics,
+    team_index=team_index,
+    fixtures_per_league=PREFETCH_FIXTURES_PER_LEAGUE,
+    concurrency=PREFETCH_CONCURRENCY,
+    max_calls=PREFETCH_MAX_CALLS,
+    token_reserve=PREFETCH_TOKEN_RESERVE,
+    # Lo que caduque antes de la pasada siguiente se renueva en esta
+    refresh_within=PREFETCH_INTERVAL_SECONDS * 1.5,
+    timezone=TIMEZONE,
+)
+stage_metrics.gauges("prefetch", "Precarga de partidos", prefetcher.stats)
+
+
 # ==========================================
 #  NARRATIVAS POR DEPORTE (FÚTBOL, NBA, MLB, NFL)
 # ==========================================
@@ -250,89 +393,285 @@ def get_team_statistics(team_id: int, league_id: int, season: int) -> Dict[str,
 
 
 # ==========================================
-#  ENDPOINTS FLASK
+#  PREDICCIÓN
 # ==========================================
-@app.route("/", methods=["GET"])
-def home():
-    return jsonify({"status": "DataMind activo", "message": "OK"}), 200
+def build_analysis(sport: str, user_text: str) -> Dict[str, Any]:
+    if sport == "futbol":
+        return build_soccer_analysis(user_text)
+    elif sport == "basket":
+        return build_basket_analysis(user_text)
+    elif sport == "beisbol":
+        return build_baseball_analysis(user_text)
+    elif sport == "nfl":
+        return build_nfl_analysis(user_text)
+    return build_soccer_analysis(user_text)
+
+
+def prediction_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "ok": True,
+        "sport": result["sport"],
+        "match_date": result.get("match_date"),
+        "prediction": result.get("prediction"),
+        "visualmind_payload": result.get("visualmind_payload"),
+    }
 
 
-@app.route("/predict", methods=["POST"])
-def predict():
-    try:
-        data = request.get_json(silent=True) or {}
-        user_text = data.get("query") or data.get("text")
+# ==========================================
+#  APP FLASK
+# ==========================================
+def create_app():
+    """Crea la app Flask con sus endpoints; Flask y CORS se importan aquí."""
+    from flask import Flask, request, jsonify
+    from flask_cors import CORS
+
+    app = Flask(__name__)
+    CORS(app)
+    # Respuestas JSON con orjson (mismos bytes que jsonify con la stdlib)
+    fast_json.install(app)
+    stage_metrics.install(app)
+
+    @app.route("/", methods=["GET"])
+    def home():
+        return jsonify({"status": "DataMind activo", "message": "OK"}), 200
+
+    @app.route("/predict", methods=["POST"])
+    def predict():
+        try:
+            data = request.get_json(silent=True) or {}
+            user_text = data.get("query") or data.get("text")
+
+            if not user_text:
+                return jsonify(
+                    {
+                        "ok": False,
+                        "error": "Falta el campo 'query' o 'text' en el cuerpo JSON",
+                    }
+                ), 400
+
+            with stage_metrics.stage("detect_sport"):
+                sport = detect_sport(user_text)
+
+            with stage_metrics.sport(sport):
+                # Un solo plazo para todas las llamadas externas de esta predicción
+                with stage_metrics.stage("analysis"), deadline(PREDICT_DEADLINE_SECONDS):
+                    result = build_analysis(sport, user_text)
+
+                with stage_metrics.stage("log_prediction"):
+                    log_prediction(
+                        sport=result["sport"],
+                        query=user_text,
+                        match_date=result.get("match_date", ""),
+                        main_pick=result.get("main_pick", ""),
+                        extra_info=result.get("extra_info", {}),
+                    )
+
+                with stage_metrics.stage("serialize"):
+                    response = jsonify(prediction_response(result))
+
+            return response, 200
+
+        except UpstreamUnavailable as e:
+            # Proveedor saturado y sin datos anteriores que servir
+            log.warning(f"API-FOOTBALL no disponible en /predict: {e}")
+            resp = jsonify({"ok": False, "error": str(e)})
+            resp.headers["Retry-After"] = str(max(1, int(e.retry_after)))
+            return resp, 503
 
-        if not user_text:
-            return jsonify(
-                {
-                    "ok": False,
-                    "error": "Falta el campo 'query' o 'text' en el cuerpo JSON",
-                }
-            ), 400
-
-        sport = detect_sport(user_text)
-
-        if sport == "futbol":
-            result = build_soccer_analysis(user_text)
-        elif sport == "basket":
-            result = build_basket_analysis(user_text)
-        elif sport == "beisbol":
-            result = build_baseball_analysis(user_text)
-        elif sport == "nfl":
-            result = build_nfl_analysis(user_text)
-        else:
-            result = build_soccer_analysis(user_text)
-
-        log_prediction(
-            sport=result["sport"],
-            query=user_text,
-            match_date=result.get("match_date", ""),
-            main_pick=result.get("main_pick", ""),
-            extra_info=result.get("extra_info", {}),
+        except Exception as e:
+            log.error(f"Error general en /predict: {e}")
+            return jsonify({"ok": False, "error": str(e)}), 500
+
+    @app.route("/stats/prediction-log", methods=["GET"])
+    def prediction_log_stats():
+        return jsonify(prediction_writer.stats()), 200
+
+    @app.route("/stats/predictions", methods=["GET"])
+    def prediction_stats():
+        """
+        Predicciones agregadas: ?by=sport,league,month,pick&sport=&league_id=&since=AAAA-MM&until=AAAA-MM
+        """
+        args = request.args
+        try:
+            ensure_db()
+            result = analytics.summary(
+                by=[d.strip() for d in args.get("by", "sport").split(",") if d.strip()],
+                sport=args.get("sport") or None,
+                league_id=args.get("league_id", type=int),
+                since=args.get("since") or None,
+                until=args.get("until") or None,
+            )
+        except ValueError as e:
+            return jsonify({"ok": False, "error": str(e)}), 400
+        return jsonify(result), 200
+
+    @app.route("/stats/predictions/recent", methods=["GET"])
+    def recent_predictions():
+        """Últimas predicciones: ?sport=&match_date=&limit="""
+        ensure_db()
+        limit = max(1, min(request.args.get("limit", 50, type=int), 500))
+        items = analytics.recent(
+            sport=request.args.get("sport") or None,
+            match_date=request.args.get("match_date") or None,
+            limit=limit,
         )
+        return jsonify({"items": items}), 200
+
+    @app.route("/stats/learning", methods=["GET"])
+    def learning_stats():
+        """Rasgos históricos: ?sport=&pick=&home_id=&away_id="""
+        args = request.args
+        features = historical_features(
+            args.get("sport") or "futbol",
+            {"home_id": args.get("home_id", type=int), "away_id": args.get("away_id", type=int)},
+            args.get("pick"),
+        )
+        return jsonify({**features, "store": learning.stats()}), 200
 
-        response = {
-            "ok": True,
-            "sport": result["sport"],
-            "match_date": result.get("match_date"),
-            "prediction": result.get("prediction"),
-            "visualmind_payload": result.get("visualmind_payload"),
-        }
+    @app.route("/outcomes", methods=["POST"])
+    def record_outcome():
+        """Marcador final de un partido: {"fixture_id", "home_goals", "away_goals"}."""
+        data = request.get_json(silent=True) or {}
+        try:
+            ensure_db()
+            result = learning.record_outcome(
+                int(data["fixture_id"]),
+                int(data["home_goals"]),
+                int(data["away_goals"]),
+                home_id=int(data["home_id"]) if data.get("home_id") else None,
+                away_id=int(data["away_id"]) if data.get("away_id") else None,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({"ok": False, "error": f"Resultado no válido: {e}"}), 400
+        return jsonify({"ok": True, **result}), 200
 
-        return jsonify(response), 200
+    @app.route("/stats/background", methods=["GET"])
+    def background_stats():
+        return jsonify(background.stats()), 200
+
+    @app.route("/stats/prefetch", methods=["GET"])
+    def prefetch_stats():
+        return jsonify({**prefetcher.stats(), "last_run": prefetcher.last_run}), 200
+
+    @app.route("/stats/api-cache", methods=["GET"])
+    def api_cache_stats():
+        return jsonify(api_cache.stats()), 200
+
+    return app
+
+
+_app = None
+_app_lock = threading.Lock()
 
-    except Exception as e:
-        log.error(f"Error general en /predict: {e}")
-        return jsonify({"ok": False, "error": str(e)}), 500
+
+def get_app():
+    """App del proceso, creada la primera vez que se pide."""
+    global _app
+    if _app is None:
+        with _app_lock:
+            if _app is None:
+                _app = create_app()
+    return _app
+
+
+def __getattr__(name: str) -> Any:
+    # `gunicorn datamind_server:app` y dm.app siguen funcionando
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ==========================================
-#  🔥 KEEPALIVE (NUEVO)
+#  TAREAS DE FONDO
 # ==========================================
-def keep_alive_loop():
+# Un solo hilo planificador por proceso para todas las tareas periódicas
+def keep_alive_ping() -> None:
     """Evita que Render apague DataMind."""
-    if not RENDER_EXTERNAL_URL:
-        log.warning("⚠️ RENDER_EXTERNAL_URL no está definida. KeepAlive desactivado.")
-        return
+    ping_url = f"{RENDER_EXTERNAL_URL}/"
+    resp = get_session().get(ping_url, timeout=10)
+    log.info(f"🔄 KeepAlive DataMind → {ping_url} (status={resp.status_code})")
 
-    while True:
-        try:
-            ping_url = f"{RENDER_EXTERNAL_URL}/"
-            resp = requests.get(ping_url, timeout=10)
-            log.info(f"🔄 KeepAlive DataMind → {ping_url} (status={resp.status_code})")
-        except Exception as e:
-            log.warning(f"⚠️ Error en KeepAlive: {e}")
-        time.sleep(40)  # mantiene el contenedor despierto
+
+def purge_api_cache() -> None:
+    removed = api_cache.purge_expired()
+    if removed:
+        log.info(f"Caché de API-FOOTBALL: {removed} entradas caducadas eliminadas")
 
 
-# Lanzamos el hilo KeepAlive en cuanto arranca el módulo
-threading.Thread(target=keep_alive_loop, daemon=True).start()
+# ==========================================
+#  CICLO DE VIDA
+# ==========================================
+def init_services() -> None:
+    """
+    Deja lista la DB y carga el índice de equipos. Opcional: sin llamarla
+    se hace en el primer uso; los hooks la usan para que no lo pague la
+    primera petición.
+    """
+    ensure_db()
+    team_index.ensure_loaded()
+
+
+def _add_deployment_jobs() -> None:
+    if RENDER_EXTERNAL_URL:
+        background.add("keep_alive", keep_alive_ping, KEEPALIVE_INTERVAL_SECONDS, first_run=0)
+    else:
+        log.warning("⚠️ RENDER_EXTERNAL_URL no está definida. KeepAlive desactivado.")
+    if API_CACHE_PERSIST:
+        background.add("api_cache_purge", purge_api_cache, API_CACHE_PURGE_SECONDS)
+    if API_FOOTBALL_KEY and prefetcher.targets:
+        background.add("fixture_prefetch", prefetcher.run, PREFETCH_INTERVAL_SECONDS, first_run=5)
+
+
+def claim_background_services() -> None:
+    """
+    Tarea de cada worker: el primero que toma background_lock se queda con
+    las tareas del despliegue. Si ese worker termina (max_requests, caída),
+    el sistema suelta el candado y otro lo toma en la siguiente ronda.
+    """
+    if not background_lock.try_acquire():
+        return
+    log.info(f"Worker {os.getpid()} ejecuta las tareas de fondo del despliegue")
+    background.remove("background_claim")
+    _add_deployment_jobs()
+
+
+def start_background_services() -> None:
+    """
+    Tareas de fondo de todo el despliegue (KeepAlive, purga de la caché
+    persistente, precarga de partidos) en un servidor de un solo proceso
+    (python datamind_server.py, async_server). Con gunicorn no se llama en
+    el master, que no debe tener hilos con locks tomados al hacer fork: las
+    ejecuta un solo worker (claim_background_services) y los demás leen lo
+    precargado de la caché persistente.
+    """
+    _add_deployment_jobs()
+    background.start()
+
+
+def start_worker_services() -> None:
+    """
+    Tareas de cada worker de gunicorn (post_fork): recargar el índice de
+    equipos (sólo si cambió) y los agregados de aprendizaje para ver lo que
+    han escrito los demás workers, y optar a las tareas del despliegue.
+    """
+    if TEAM_INDEX_RELOAD_SECONDS > 0:
+        background.add("team_index_reload", team_index.refresh, TEAM_INDEX_RELOAD_SECONDS)
+    if LEARNING_REFRESH_SECONDS > 0:
+        background.add("learning_refresh", learning.refresh, LEARNING_REFRESH_SECONDS)
+    background.add("background_claim", claim_background_services, BACKGROUND_CLAIM_SECONDS, first_run=0)
+    background.start()
+
+
+def stop_background_services() -> None:
+    """Para el planificador y vacía las predicciones pendientes (hooks de apagado)."""
+    background.stop()
 
 
 # ==========================================
 #  MAIN
 # ==========================================
 if __name__ == "__main__":
+    init_services()
+    start_background_services()
     log.info(f"🚀 DataMind ejecutándose en puerto {PORT}")
-    app.run(host="0.0.0.0", port=PORT)
+    get_app().run(host="0.0.0.0", port=PORT)
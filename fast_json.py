@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import math
+import dataclasses
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - sin orjson se usa la stdlib
+    orjson = None
+
+# ==========================================
+#  SERIALIZACIÓN JSON RÁPIDA (ORJSON / STDLIB)
+# ==========================================
+# Con ensure_ascii la stdlib escapa todo lo que no está entre ' ' y '~'.
+# orjson ya escapa los caracteres de control; falta DEL y lo no-ASCII, que
+# se resuelve con el codec "backslashreplace" (\xe9, \u20ac, \U0001f600) y
+# reescribiendo sus escapes al formato JSON.
+_ASTRAL = re.compile(rb"\\U([0-9a-f]{8})")
+
+# Floats que orjson escribe distinto que repr(): exponentes (1e16 frente a
+# 1e+16, 1e-7 frente a 1e-07) y decimales largos (0.00001 frente a 1e-05).
+# orjson los escribe siempre con "e" seguida de dígito o "-", o como
+# "0.0000..."; un falso positivo dentro de un string sólo cuesta pasar por
+# la stdlib. Dos búsquedas literales: un patrón más preciso (dígito antes de
+# la "e") recorre el cuerpo entero y cuesta más que la propia serialización.
+_EXPONENT = re.compile(rb"e[\d-]")
+
+# Respuestas HTTP: \uXXXX como Flask (1) o UTF-8 tal cual (0, más rápido)
+ENSURE_ASCII = os.getenv("JSON_ENSURE_ASCII", "1") != "0"
+
+
+def _floats_differ(data: bytes) -> bool:
+    return b"0.0000" in data or _EXPONENT.search(data) is not None
+
+
+def _surrogates(match: "re.Match[bytes]") -> bytes:
+    n = int(match.group(1), 16) - 0x10000
+    return b"\\u%04x\\u%04x" % (0xD800 | (n >> 10), 0xDC00 | (n & 0x3FF))
+
+
+def _ascii(data: bytes) -> Optional[bytes]:
+    """
+    Salida de orjson escapada como ensure_ascii=True. None si el texto
+    contiene barras invertidas propias: ahí "\\x" sería ambiguo.
+    """
+    if b"\\\\" in data:
+        return None
+    text = data.decode("utf-8").encode("ascii", "backslashreplace").replace(b"\\x", b"\\u00")
+    if b"\\U" in text:
+        text = _ASTRAL.sub(_surrogates, text)
+    return text.replace(b"\x7f", b"\\u007f")
+
+
+def _options(sort_keys: bool, indent: bool) -> int:
+    # Las dataclasses (registros de resultado) van por la vía nativa de orjson,
+    # sin copiarlas a dicts. Sus campos salen en orden de declaración: con
+    # sort_keys sólo coinciden con la stdlib si están en orden alfabético.
+    opts = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if sort_keys:
+        opts |= orjson.OPT_SORT_KEYS
+    if indent:
+        opts |= orjson.OPT_INDENT_2
+    return opts
+
+
+def _dataclass_default(obj: Any) -> Any:
+    # Lo mismo que hace el proveedor de Flask con las dataclasses
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    # Copia con NaN/Infinity cambiados por None (lo que escribe orjson)
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _finite(dataclasses.asdict(obj))
+    return obj
+
+
+def _stdlib(obj: Any, default: Optional[Callable], ensure_ascii: bool, sort_keys: bool, indent: bool) -> str:
+    options = dict(
+        default=default or _dataclass_default,
+        ensure_ascii=ensure_ascii,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    )
+    try:
+        return json.dumps(obj, allow_nan=False, **options)
+    except ValueError as e:
+        if "Out of range float" not in str(e):
+            raise
+        return json.dumps(_finite(obj), **options)
+
+
+def dumps_bytes(
+    obj: Any,
+    default: Optional[Callable] = None,
+    ensure_ascii: bool = False,
+    sort_keys: bool = False,
+    indent: bool = False,
+) -> bytes:
+    """
+    JSON en UTF-8: los mismos bytes que json.dumps con esas opciones y
+    separators=(",", ":") (o indent=2), que es lo que escribe jsonify. No
+    son los de json.dumps por defecto, que separa con ", " y ": ".
+    NaN e Infinity salen siempre como null (la stdlib escribe NaN, que no
+    es JSON válido).
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, default=default, option=_options(sort_keys, indent))
+        except (TypeError, orjson.JSONEncodeError):
+            # Enteros de más de 64 bits, claves no ordenables...: que decida la stdlib
+            pass
+        else:
+            if not _floats_differ(data):
+                if not ensure_ascii or (data.isascii() and b"\x7f" not in data):
+                    return data
+                escaped = _ascii(data)
+                if escaped is not None:
+                    return escaped
+    return _stdlib(obj, default, ensure_ascii, sort_keys, indent).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    default: Optional[Callable] = None,
+    ensure_ascii: bool = False,
+    sort_keys: bool = False,
+    indent: bool = False,
+) -> str:
+    """Como dumps_bytes, en str."""
+    if orjson is not None:
+        return dumps_bytes(obj, default, ensure_ascii, sort_keys, indent).decode("utf-8")
+    return _stdlib(obj, default, ensure_ascii, sort_keys, indent)
+
+
+def loads(data: Any) -> Any:
+    """Acepta str, bytes o memoryview."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+# ==========================================
+#  PROVEEDOR JSON PARA FLASK
+# ==========================================
+_provider_class: Optional[type] = None
+
+
+def provider_class() -> type:
+    """
+    FastJSONProvider: proveedor de Flask sobre orjson. Respeta ensure_ascii,
+    sort_keys y compact igual que el proveedor por defecto, así que las
+    respuestas son idénticas byte a byte; lo que orjson no cubre (cls,
+    separadores propios, otros indent...) pasa a la stdlib.
+
+    Se define en la primera llamada: importar fast_json (batch, servidor
+    asyncio) no carga Flask.
+    """
+    global _provider_class
+    if _provider_class is not None:
+        return _provider_class
+
+    from flask.json.provider import DefaultJSONProvider
+
+    class FastJSONProvider(DefaultJSONProvider):
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            indent = kwargs.pop("indent", None)
+            separators = kwargs.pop("separators", None)
+            default = kwargs.pop("default", self.default)
+            ensure_ascii = kwargs.pop("ensure_ascii", self.ensure_ascii)
+            sort_keys = kwargs.pop("sort_keys", self.sort_keys)
+
+            compact = indent is None and separators == (",", ":")
+            pretty = indent == 2 and separators in (None, (",", ": "))
+            if orjson is None or kwargs or not (compact or pretty):
+                kwargs.update(default=default, ensure_ascii=ensure_ascii, sort_keys=sort_keys)
+                if indent is not None:
+                    kwargs["indent"] = indent
+                if separators is not None:
+                    kwargs["separators"] = separators
+                return json.dumps(obj, **kwargs)
+            return dumps(obj, default, ensure_ascii, sort_keys, pretty)
+
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            if kwargs:
+                return json.loads(s, **kwargs)
+            return loads(s)
+
+        def response(self, *args: Any, **kwargs: Any) -> Any:
+            obj = self._prepare_response_obj(args, kwargs)
+            pretty = (self.compact is None and self._app.debug) or self.compact is False
+            body = dumps_bytes(obj, self.default, self.ensure_ascii, self.sort_keys, pretty)
+            return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    _provider_class = FastJSONProvider
+    return _provider_class
+
+
+def install(app: Any, ensure_ascii: Optional[bool] = None) -> None:
+    """
+    Usa FastJSONProvider en `app` (jsonify, request.get_json, app.json).
+
+    ensure_ascii (por defecto JSON_ENSURE_ASCII) decide si las respuestas
+    escapan lo no-ASCII como \\uXXXX. Por defecto sí, igual que Flask: los
+    clientes que comparan cuerpos byte a byte siguen viendo lo mismo. Con 0
+    se envía UTF-8 tal cual, que es el camino rápido de orjson.
+    """
+    if ensure_ascii is None:
+        ensure_ascii = ENSURE_ASCII
+    app.json_provider_class = provider_class()
+    app.json = app.json_provider_class(app)
+    app.json.ensure_ascii = ensure_ascii
@@ -0,0 +1,73 @@
+"""
+Configuración de gunicorn para datamind_server (perfil de producción):
+
+    gunicorn -c gunicorn.conf.py datamind_server:app
+
+Workers preforkeados (WEB_CONCURRENCY, por defecto uno por núcleo) con
+GUNICORN_THREADS hilos cada uno (worker gthread). Las llamadas a
+API-FOOTBALL bloquean un hilo mientras esperan, así que los hilos cubren
+la espera de red y los procesos reparten la CPU entre núcleos.
+
+Con preload_app el master importa el módulo y crea la app una sola vez y
+los workers la heredan por fork. Nada abre la DB ni lanza hilos al importar
+y el master no lanza ninguno: sigue haciendo fork al reciclar workers, y un
+lock tomado por un hilo suyo quedaría tomado para siempre en el hijo. Lo
+que queda por proceso (conexiones SQLite, sesión HTTP, hilo escritor de
+predicciones) se recrea solo al detectar un pid distinto. Las tareas de
+todo el despliegue (KeepAlive, purga, precarga) las ejecuta un solo
+worker, el que tiene el candado de archivo DATAMIND_DB_PATH.background.lock;
+si se recicla, lo toma otro.
+
+Estado compartido entre workers (todo en DATAMIND_DB_PATH, SQLite en WAL):
+- caché de API-FOOTBALL (IDs de equipo, fixtures, estadísticas): cada
+  worker tiene su LRU en memoria y, al fallar, lee la tabla api_cache que
+  rellenan los demás (API_CACHE_PERSIST, activo por defecto)
+- índice de equipos, log de predicciones y sus agregados
+La cuota por minuto de API-FOOTBALL es de la cuenta: se reparte entre los
+workers (DATAMIND_WORKERS) para no multiplicarla por su número.
+"""
+
+import os
+import multiprocessing
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# Por encima de PREDICT_DEADLINE_SECONDS: el plazo de la predicción salta antes
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 20))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Reciclar workers de vez en cuando acota la memoria de las cachés en proceso
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 5000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 500))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+
+# Antes de que se importe la app (también con preload): los workers heredan el entorno
+os.environ["DATAMIND_WORKERS"] = str(workers)
+
+
+def post_fork(server, worker):
+    # Worker: tablas e índice de equipos antes de aceptar la primera petición,
+    # sus propias tareas de fondo y, si toma el candado, las del despliegue
+    import datamind_server
+
+    datamind_server.init_services()
+    datamind_server.start_worker_services()
+
+
+def worker_exit(server, worker):
+    # Parar las tareas de fondo y vaciar las predicciones encoladas
+    import datamind_server
+
+    datamind_server.stop_background_services()
+
+
+def on_exit(server):
+    import datamind_server
+
+    datamind_server.stop_background_services()
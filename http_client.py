@@ -0,0 +1,153 @@
+import os
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+log = logging.getLogger("DataMind")
+
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 4))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 32))
+HTTP_FANOUT_WORKERS = int(os.getenv("HTTP_FANOUT_WORKERS", 16))
+
+
+# ==========================================
+#  SESIÓN HTTP COMPARTIDA (POOL DE CONEXIONES)
+# ==========================================
+_session: Optional["requests.Session"] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """
+    Sesión requests del proceso con keep-alive: reutiliza TCP+TLS entre
+    llamadas. Se recrea tras un fork para no compartir sockets con el padre.
+    requests se importa aquí, en la primera llamada, y no al arrancar.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                pool_block=False,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+# ==========================================
+#  DEADLINE POR PREDICCIÓN
+# ==========================================
+class DeadlineExceeded(Exception):
+    pass
+
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "datamind_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Fija un plazo total para todas las llamadas HTTP dentro del bloque."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Segundos que quedan del plazo actual (None si no hay plazo)."""
+    end = _deadline.get()
+    if end is None:
+        return None
+    return end - time.monotonic()
+
+
+def request_timeout(default: float) -> float:
+    """Timeout de una llamada: el menor entre `default` y lo que queda del plazo."""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Plazo de la predicción agotado")
+    return min(default, left)
+
+
+# ==========================================
+#  FAN-OUT CONCURRENTE
+# ==========================================
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _session_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(
+                    max_workers=HTTP_FANOUT_WORKERS, thread_name_prefix="datamind-http"
+                )
+                _executor_pid = pid
+    return _executor
+
+
+def run_parallel(
+    calls: Sequence[Callable[[], Any]], default: Any = None, reraise: Tuple[type, ...] = ()
+) -> List[Any]:
+    """
+    Ejecuta llamadas independientes a la vez respetando el plazo actual.
+    Las que fallan o no terminan a tiempo devuelven `default`, salvo las
+    excepciones de `reraise` (p. ej. UpstreamUnavailable, para que la caché
+    sirva el último dato o /predict responda 503): se relanza la primera.
+    """
+    if len(calls) == 1:
+        try:
+            return [calls[0]()]
+        except reraise:
+            raise
+        except Exception as e:
+            log.error(f"Error en llamada HTTP: {e}")
+            return [default]
+
+    executor = _get_executor()
+    # Cada hilo hereda el plazo del contexto de la petición
+    futures = [executor.submit(contextvars.copy_context().run, fn) for fn in calls]
+    left = remaining()
+    done, _ = wait(futures, timeout=None if left is None else max(0.0, left))
+
+    results = []
+    for fut in futures:
+        if fut not in done:
+            log.warning("Llamada HTTP fuera de plazo; se devuelve valor por defecto")
+            results.append(default)
+            continue
+        try:
+            results.append(fut.result())
+        except reraise:
+            raise
+        except Exception as e:
+            log.error(f"Error en llamada HTTP: {e}")
+            results.append(default)
+    return results
@@ -0,0 +1,535 @@
+"""
+Memoria de aprendizaje: agregados incrementales sobre las predicciones,
+para que el histórico se lea sin volver a recorrer la tabla.
+
+- `learning_stats` guarda contadores por ámbito: deporte ('sport'),
+  deporte|pick ('pick') y equipo ('team', por ID de API-FOOTBALL).
+  Un trigger AFTER INSERT en `predictions` suma cada predicción al llegar,
+  la inserte quien la inserte (escritor, servidor asyncio, batch_predict).
+- Los resultados llegan después (record_outcome): se guardan en
+  `match_outcomes` y se pliegan en los mismos contadores leyendo sólo las
+  predicciones de ese partido (índice por fixture_id). Cada resultado
+  suma aciertos/fallos a su deporte, pick y equipos, y al equipo un
+  partido más con goles a favor y en contra (suma y suma de cuadrados:
+  media y desviación sin guardar la serie).
+- LearningStore tiene los agregados en memoria: features() son búsquedas
+  en un dict, O(1) por petición. Las predicciones de este proceso se suman
+  al vuelo (observe); lo que escriben otros procesos llega con refresh()
+  (tarea de fondo).
+
+    python learning_store.py features --sport futbol --team 2278
+    python learning_store.py outcome --fixture 123 --home-goals 2 --away-goals 1
+    python learning_store.py rebuild
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+import unicodedata
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from prediction_log import connect
+
+log = logging.getLogger("DataMind")
+
+LEARNING_TRIGGER = "predictions_learning_v1"
+
+# Contadores de cada fila de learning_stats, en este orden en memoria
+COUNTERS = (
+    "predictions", "settled", "hits",
+    "matches", "wins", "draws", "losses",
+    "goals_for", "goals_for_sq", "goals_against", "goals_against_sq",
+)
+
+STATS_TABLE_SQL = f"""
+    CREATE TABLE IF NOT EXISTS learning_stats (
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        {", ".join(f"{c} {'REAL' if c.startswith('goals') else 'INTEGER'} NOT NULL DEFAULT 0" for c in COUNTERS)},
+        PRIMARY KEY (scope, key)
+    ) WITHOUT ROWID
+"""
+
+OUTCOMES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS match_outcomes (
+        fixture_id INTEGER PRIMARY KEY,
+        home_id INTEGER,
+        away_id INTEGER,
+        home_goals INTEGER NOT NULL,
+        away_goals INTEGER NOT NULL,
+        recorded_at TEXT NOT NULL,
+        predictions INTEGER NOT NULL,
+        graded INTEGER NOT NULL,
+        hits INTEGER NOT NULL
+    )
+"""
+
+# Claves de una predicción; home_id/away_id son columnas generadas
+# (prediction_analytics.PROMOTED_FIELDS)
+_KEYS_SQL = """
+    SELECT 'sport', coalesce({p}sport, '')
+    UNION ALL SELECT 'pick', coalesce({p}sport, '') || '|' || coalesce({p}main_pick, '')
+    UNION ALL SELECT 'team', CAST({p}home_id AS TEXT) WHERE {p}home_id IS NOT NULL
+    UNION ALL SELECT 'team', CAST({p}away_id AS TEXT) WHERE {p}away_id IS NOT NULL
+"""
+
+LEARNING_TRIGGER_SQL = f"""
+    CREATE TRIGGER IF NOT EXISTS {LEARNING_TRIGGER} AFTER INSERT ON predictions
+    BEGIN
+        INSERT INTO learning_stats (scope, key, predictions)
+        SELECT *, 1 FROM ({_KEYS_SQL.format(p="NEW.")}) WHERE true
+        ON CONFLICT (scope, key) DO UPDATE SET predictions = predictions + 1;
+    END
+"""
+
+LEARNING_REBUILD_SQL = """
+    INSERT INTO learning_stats (scope, key, predictions)
+    SELECT 'sport', coalesce(sport, ''), count(*) FROM predictions GROUP BY 2
+    UNION ALL
+    SELECT 'pick', coalesce(sport, '') || '|' || coalesce(main_pick, ''), count(*) FROM predictions GROUP BY 2
+    UNION ALL
+    SELECT 'team', CAST(team_id AS TEXT), count(*) FROM (
+        SELECT home_id AS team_id FROM predictions WHERE home_id IS NOT NULL
+        UNION ALL
+        SELECT away_id FROM predictions WHERE away_id IS NOT NULL
+    ) GROUP BY 2
+"""
+
+
+# ==========================================
+#  ESQUEMA
+# ==========================================
+def migrate(db_path: str) -> None:
+    """
+    Tablas, índice por partido y trigger (después de prediction_analytics.migrate,
+    que crea las columnas generadas). La primera vez cuenta las predicciones
+    que ya hubiera.
+    """
+    conn = connect(db_path)
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(STATS_TABLE_SQL)
+            conn.execute(OUTCOMES_TABLE_SQL)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_fixture ON predictions (fixture_id)")
+            has_trigger = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (LEARNING_TRIGGER,)
+            ).fetchone()
+            if not has_trigger:
+                _rebuild(conn)
+                conn.execute(LEARNING_TRIGGER_SQL)
+                log.info("Agregados de aprendizaje creados a partir de la tabla existente")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+def _rebuild(conn: sqlite3.Connection) -> None:
+    """Contadores desde cero: predicciones y resultados ya registrados."""
+    conn.execute("DELETE FROM learning_stats")
+    conn.execute(LEARNING_REBUILD_SQL)
+    outcomes = conn.execute(
+        "SELECT fixture_id, home_id, away_id, home_goals, away_goals FROM match_outcomes"
+    ).fetchall()
+    for fixture_id, home_id, away_id, home_goals, away_goals in outcomes:
+        _fold(conn, fixture_id, home_id, away_id, home_goals, away_goals)
+
+
+# ==========================================
+#  CALIFICAR PICKS
+# ==========================================
+_LINE = r"(\d+(?:[.,]\d+)?)"
+_OVER = re.compile(rf"\b(?:over|mas de)\s*{_LINE}")
+_UNDER = re.compile(rf"\b(?:under|menos de)\s*{_LINE}")
+_BTTS = re.compile(r"\b(?:ambos (?:equipos )?(?:anotan|marcan)|btts)\b")
+_DRAW = re.compile(r"\b(?:empate|draw|x)\b")
+_HOME = re.compile(r"\b(?:local|home|1)\b")
+_AWAY = re.compile(r"\b(?:visitante|visita|away|2)\b")
+
+
+def _norm(text: Optional[str]) -> str:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return " ".join(text.lower().split())
+
+
+def grade_pick(
+    pick: Optional[str],
+    home_goals: int,
+    away_goals: int,
+    home_name: Optional[str] = None,
+    away_name: Optional[str] = None,
+) -> Optional[bool]:
+    """
+    ¿Acertó el pick con este marcador? None si no se sabe calificar.
+    Entiende más/menos de N goles (over/under), ambos anotan, y ganador o
+    doble oportunidad por 1/X/2, local/empate/visitante o nombre de equipo.
+    """
+    text = _norm(pick)
+    if not text:
+        return None
+    total = home_goals + away_goals
+
+    m = _OVER.search(text)
+    if m:
+        return total > float(m.group(1).replace(",", "."))
+    m = _UNDER.search(text)
+    if m:
+        return total < float(m.group(1).replace(",", "."))
+    if _BTTS.search(text):
+        both = home_goals > 0 and away_goals > 0
+        return not both if re.search(r"\bno\b", text) else both
+
+    # Ganador / doble oportunidad: "1", "x2", "local o empate", "Tigres gana"
+    compact = text.replace(" ", "")
+    accepted = set()
+    if compact in ("1x", "x2", "12"):
+        accepted.update(compact)
+    if _DRAW.search(text):
+        accepted.add("x")
+    if _HOME.search(text) or (home_name and _norm(home_name) in text):
+        accepted.add("1")
+    if _AWAY.search(text) or (away_name and _norm(away_name) in text):
+        accepted.add("2")
+    if not accepted or len(accepted) == 3:
+        return None
+    result = "1" if home_goals > away_goals else "2" if away_goals > home_goals else "x"
+    return result in accepted
+
+
+# ==========================================
+#  PLEGADO DE RESULTADOS
+# ==========================================
+def _bump_sql(columns: Iterable[str]) -> str:
+    columns = list(columns)
+    return (
+        f"INSERT INTO learning_stats (scope, key, {', '.join(columns)}) "
+        f"VALUES (?, ?, {', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT (scope, key) DO UPDATE SET "
+        + ", ".join(f"{c} = {c} + excluded.{c}" for c in columns)
+    )
+
+
+_GRADE_SQL = _bump_sql(("settled", "hits"))
+_MATCH_SQL = _bump_sql(COUNTERS[3:])
+
+
+def _team_row(goals_for: int, goals_against: int) -> Tuple[int, ...]:
+    return (
+        1,
+        int(goals_for > goals_against),
+        int(goals_for == goals_against),
+        int(goals_for < goals_against),
+        goals_for, goals_for * goals_for,
+        goals_against, goals_against * goals_against,
+    )
+
+
+def _fold(
+    conn: sqlite3.Connection,
+    fixture_id: int,
+    home_id: Optional[int],
+    away_id: Optional[int],
+    home_goals: int,
+    away_goals: int,
+) -> Tuple[int, int, int, List[Tuple[str, str]]]:
+    """
+    Suma un resultado a los contadores: (predicciones, calificadas,
+    aciertos, claves tocadas). Sólo lee las predicciones del partido.
+    """
+    rows = conn.execute(
+        "SELECT sport, main_pick, home_id, away_id, extra_info FROM predictions WHERE fixture_id = ?",
+        (fixture_id,),
+    ).fetchall()
+
+    grades: Dict[Tuple[str, str], List[int]] = {}
+    graded = hits = 0
+    names: Tuple[Optional[str], Optional[str]] = (None, None)
+    for sport, pick, p_home, p_away, extra_info in rows:
+        home_id = home_id or p_home
+        away_id = away_id or p_away
+        if names == (None, None):
+            try:
+                fixture = json.loads(extra_info or "{}")
+                fixture = fixture.get("fixture") or fixture
+                names = (fixture.get("home_name"), fixture.get("away_name"))
+            except (ValueError, AttributeError):
+                pass
+        hit = grade_pick(pick, home_goals, away_goals, *names)
+        if hit is None:
+            continue
+        graded += 1
+        hits += hit
+        keys = [("sport", sport or ""), ("pick", f"{sport or ''}|{pick or ''}")]
+        keys += [("team", str(t)) for t in (p_home, p_away) if t is not None]
+        for key in keys:
+            counts = grades.setdefault(key, [0, 0])
+            counts[0] += 1
+            counts[1] += hit
+
+    conn.executemany(_GRADE_SQL, [(*key, s, h) for key, (s, h) in grades.items()])
+    teams = []
+    if home_id is not None:
+        teams.append((("team", str(home_id)), _team_row(home_goals, away_goals)))
+    if away_id is not None:
+        teams.append((("team", str(away_id)), _team_row(away_goals, home_goals)))
+    conn.executemany(_MATCH_SQL, [(*key, *row) for key, row in teams])
+    touched = list(grades) + [key for key, _ in teams]
+    return len(rows), graded, hits, touched
+
+
+# ==========================================
+#  MEMORIA Y CONSULTAS
+# ==========================================
+def _rate(part: float, whole: float) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+
+def _mean_std(total: float, total_sq: float, n: float) -> Tuple[Optional[float], Optional[float]]:
+    if not n:
+        return None, None
+    mean = total / n
+    return round(mean, 4), round(math.sqrt(max(0.0, total_sq / n - mean * mean)), 4)
+
+
+def describe(row: Optional[List[float]]) -> Dict[str, Any]:
+    """Contadores → rasgos (tasas, medias, desviaciones)."""
+    if row is None:
+        row = [0] * len(COUNTERS)
+    predictions, settled, hits, matches, wins, draws, losses, gf, gf_sq, ga, ga_sq = row
+    out: Dict[str, Any] = {
+        "predictions": int(predictions),
+        "settled": int(settled),
+        "hits": int(hits),
+        "hit_rate": _rate(hits, settled),
+    }
+    if matches:
+        out["matches"] = int(matches)
+        out["win_rate"] = _rate(wins, matches)
+        out["draw_rate"] = _rate(draws, matches)
+        out["loss_rate"] = _rate(losses, matches)
+        out["goals_for_avg"], out["goals_for_std"] = _mean_std(gf, gf_sq, matches)
+        out["goals_against_avg"], out["goals_against_std"] = _mean_std(ga, ga_sq, matches)
+    return out
+
+
+class LearningStore:
+    """Agregados de aprendizaje en memoria sobre learning_stats; una conexión por proceso."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], List[float]] = {}
+        # describe() de cada clave, hasta que cambien sus contadores
+        self._described: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._loaded = False
+
+        self.refreshes = 0
+        self.refresh_seconds_last = 0.0
+        self.observed = 0
+        self.outcomes = 0
+
+    def _db(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            self._conn = connect(self.db_path)
+            self._conn_pid = pid
+        return self._conn
+
+    # ---------- carga ----------
+    def refresh(self) -> int:
+        """Relee todos los contadores (lo que han sumado otros procesos)."""
+        start = time.perf_counter()
+        with self._lock:
+            rows = self._db().execute(f"SELECT scope, key, {', '.join(COUNTERS)} FROM learning_stats").fetchall()
+            self._stats = {(r[0], r[1]): list(r[2:]) for r in rows}
+            self._described = {}
+            self._loaded = True
+        self.refreshes += 1
+        self.refresh_seconds_last = time.perf_counter() - start
+        return len(rows)
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.refresh()
+
+    def _reload_keys(self, keys: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            conn = self._db()
+            for scope, key in set(keys):
+                row = conn.execute(
+                    f"SELECT {', '.join(COUNTERS)} FROM learning_stats WHERE scope = ? AND key = ?", (scope, key)
+                ).fetchone()
+                if row is not None:
+                    self._stats[(scope, key)] = list(row)
+                    self._described.pop((scope, key), None)
+
+    # ---------- escritura ----------
+    def observe(self, sport: str, main_pick: str, extra_info: Dict[str, Any]) -> None:
+        """
+        Suma en memoria una predicción de este proceso (en la DB la suma el
+        trigger al insertarla; el siguiente refresh() deja la copia oficial).
+        """
+        if not self._loaded:
+            return
+        extra_info = extra_info or {}
+        fixture = extra_info.get("fixture") if isinstance(extra_info.get("fixture"), dict) else extra_info
+        keys = [("sport", sport or ""), ("pick", f"{sport or ''}|{main_pick or ''}")]
+        keys += [("team", str(t)) for t in (fixture.get("home_id"), fixture.get("away_id")) if t is not None]
+        with self._lock:
+            for key in keys:
+                row = self._stats.get(key)
+                if row is None:
+                    row = self._stats[key] = [0] * len(COUNTERS)
+                row[0] += 1
+                self._described.pop(key, None)
+        self.observed += 1
+
+    def record_outcome(
+        self,
+        fixture_id: int,
+        home_goals: int,
+        away_goals: int,
+        home_id: Optional[int] = None,
+        away_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Registra el marcador final de un partido y lo pliega en los
+        contadores. Cada partido cuenta una sola vez: repetirlo no suma.
+        """
+        if home_goals < 0 or away_goals < 0:
+            raise ValueError("Los goles no pueden ser negativos")
+        with self._lock:
+            conn = self._db()
+            conn.isolation_level = None
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    existing = conn.execute(
+                        "SELECT predictions, graded, hits FROM match_outcomes WHERE fixture_id = ?", (fixture_id,)
+                    ).fetchone()
+                    if existing is not None:
+                        conn.execute("ROLLBACK")
+                        predictions, graded, hits = existing
+                        return {"fixture_id": fixture_id, "recorded": False, "predictions": predictions,
+                                "graded": graded, "hits": hits}
+                    predictions, graded, hits, touched = _fold(
+                        conn, fixture_id, home_id, away_id, home_goals, away_goals
+                    )
+                    conn.execute(
+                        "INSERT INTO match_outcomes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (fixture_id, home_id, away_id, home_goals, away_goals,
+                         datetime.utcnow().isoformat(), predictions, graded, hits),
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.isolation_level = ""
+        self.outcomes += 1
+        if self._loaded:
+            self._reload_keys(touched)
+        return {"fixture_id": fixture_id, "recorded": True, "predictions": predictions,
+                "graded": graded, "hits": hits}
+
+    def rebuild(self) -> int:
+        """Recalcula los contadores desde predicciones y resultados (reparación)."""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                _rebuild(conn)
+        return self.refresh()
+
+    # ---------- lectura (O(1)) ----------
+    def _describe(self, key: Tuple[str, str]) -> Dict[str, Any]:
+        out = self._described.get(key)
+        if out is None:
+            out = self._described[key] = describe(self._stats.get(key))
+        return dict(out)
+
+    def get(self, scope: str, key: Any) -> Dict[str, Any]:
+        self.ensure_loaded()
+        return self._describe((scope, str(key)))
+
+    def features(
+        self,
+        sport: Optional[str] = None,
+        home_id: Optional[int] = None,
+        away_id: Optional[int] = None,
+        pick: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Rasgos históricos para un análisis: unas pocas búsquedas en memoria."""
+        self.ensure_loaded()
+        out: Dict[str, Any] = {}
+        if sport is not None:
+            out["sport"] = self._describe(("sport", sport))
+            if pick is not None:
+                out["pick"] = self._describe(("pick", f"{sport}|{pick}"))
+        if home_id is not None:
+            out["home"] = self._describe(("team", str(home_id)))
+        if away_id is not None:
+            out["away"] = self._describe(("team", str(away_id)))
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._stats),
+            "refreshes": self.refreshes,
+            "refresh_seconds_last": round(self.refresh_seconds_last, 6),
+            "observed": self.observed,
+            "outcomes": self.outcomes,
+        }
+
+
+# ==========================================
+#  CLI
+# ==========================================
+def main(argv: Optional[List[str]] = None) -> int:
+    import prediction_analytics
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.getenv("DATAMIND_DB_PATH", "datamind_memory.db"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_features = sub.add_parser("features", help="rasgos históricos")
+    p_features.add_argument("--sport")
+    p_features.add_argument("--pick")
+    p_features.add_argument("--team", type=int, nargs="*", default=[])
+    p_outcome = sub.add_parser("outcome", help="registrar el resultado de un partido")
+    p_outcome.add_argument("--fixture", type=int, required=True)
+    p_outcome.add_argument("--home-goals", type=int, required=True)
+    p_outcome.add_argument("--away-goals", type=int, required=True)
+    sub.add_parser("rebuild", help="recalcular los contadores desde cero")
+    args = parser.parse_args(argv)
+
+    prediction_analytics.migrate(args.db)
+    migrate(args.db)
+    store = LearningStore(args.db)
+    if args.command == "rebuild":
+        print(f"{store.rebuild()} claves")
+        return 0
+    if args.command == "outcome":
+        result = store.record_outcome(args.fixture, args.home_goals, args.away_goals)
+    else:
+        result = store.features(sport=args.sport, pick=args.pick)
+        for team_id in args.team:
+            result[f"team_{team_id}"] = store.get("team", team_id)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,92 @@
-from flask import Flask, request, jsonify, render_template
+import os
+import sqlite3
+from datetime import datetime
+
+from flask import Flask, Response, request, jsonify, render_template
+from metrics import StageMetrics
+import fast_json
+import config
 from app.logic.predictor import analyze_full_input
+from app.logic.pattern_memory import open_memory
 
 # DataMind services
 from app.datamind.services.gematria_service import gematria_value as dm_gematria_value
+from app.datamind.services.gematria_core import GEMATRIA_VERSION
 from app.datamind.services.numerology_service import numerology_from_name as dm_num_from_name, numerology_from_birth as dm_num_from_birth
-from app.datamind.services.interpretation_service import build_interpretation as dm_build_interpretation
+from app.datamind.services.interpretation_service import (
+    build_interpretation as dm_build_interpretation,
+    rules_version,
+    rules_stats,
+)
+from app.datamind.services.batch_service import analyze_batch as dm_analyze_batch
+from app.datamind.services.result_cache import ResultCache, make_key
+from app.datamind.services.records import DataMindAnalysis, Numerology
+
+# Máximo de elementos aceptados por /datamind/analyze/batch
+MAX_BATCH_ITEMS = 10000
+
+# Tamaño máximo de página de /datamind/history
+MAX_HISTORY_PAGE = 500
+
 
-def create_app():
+def _history_args(args, allowed):
+    fields = [f.strip() for f in args.get("fields", "").split(",") if f.strip()]
+    return {
+        "kind": args.get("kind") or None,
+        "since": args.get("since") or None,
+        "until": args.get("until") or None,
+        "fields": tuple(f for f in fields if f in allowed) or allowed,
+    }
+
+def create_app(pattern_memory_db: str = None):
+    """
+    `pattern_memory_db`: SQLite de la memoria de patrones; por defecto
+    PATTERN_MEMORY_DB o config.MEMORY_DB, y "" la desactiva.
+    """
     app = Flask(__name__, template_folder="templates", static_folder="static")
+    fast_json.install(app)
+
+    # Historial de análisis (SQLAlchemy); opcional: SQLAlchemy sólo se
+    # importa si DATAMIND_HISTORY_DB_URL está definido
+    history = None
+    history_db_url = os.getenv("DATAMIND_HISTORY_DB_URL")
+    if history_db_url:
+        from app.datamind.services import storage_service as history
+        history.init_db(history_db_url)
+
+    # Caché de respuestas: LRU por proceso + tabla SQLite opcional compartida
+    result_cache = ResultCache(
+        max_entries=int(os.getenv("RESULT_CACHE_SIZE", 10000)),
+        db_path=os.getenv("RESULT_CACHE_DB") or None,
+    )
+
+    # Memoria de patrones (SQLite sólo-anexar): guarda cada análisis nuevo de
+    # /analyze e importa data/memory_log.json la primera vez
+    if pattern_memory_db is None:
+        pattern_memory_db = os.getenv("PATTERN_MEMORY_DB", str(config.MEMORY_DB))
+    pattern_memory = open_memory(pattern_memory_db, legacy_json=str(config.MEMORY_FILE)) if pattern_memory_db else None
+
+    # Latencias por endpoint y etapa, expuestas en /metrics
+    stage_metrics = StageMetrics("numeria")
+    stage_metrics.install(app)
+    stage_metrics.gauges("result_cache", "Caché de respuestas", result_cache.stats)
+
+    # Reglas de interpretación: se cargan ya (un archivo inválido falla al
+    # arrancar) y después se recargan solas al cambiar en disco
+    rules_version()
+    stage_metrics.gauges("interpretation_rules", "Recargas de reglas de interpretación", rules_stats)
+
+    def cached_json(key, compute, stage):
+        """Devuelve el JSON cacheado o lo calcula, serializa y guarda."""
+        with stage_metrics.stage(f"{stage}_cache_lookup"):
+            body = result_cache.get(key)
+        if body is None:
+            with stage_metrics.stage(f"{stage}_compute"):
+                result = compute()
+            with stage_metrics.stage(f"{stage}_serialize"):
+                body = jsonify(result).get_data()
+            result_cache.put(key, body)
+        return app.response_class(body, mimetype=app.json.mimetype)
 
     @app.route("/", methods=["GET"])
     def home():
@@ -22,8 +101,34 @@ def create_app():
         birthdate = data.get("birthdate", "").strip()
         power_code = data.get("power_code", "").strip()
 
-        result = analyze_full_input(name=name, birthdate=birthdate, power_code=power_code)
-        return jsonify(result)
+        def compute():
+            result = analyze_full_input(name=name, birthdate=birthdate, power_code=power_code)
+            if pattern_memory is not None:
+                try:
+                    pattern_memory.append({**result.to_dict(), "timestamp": datetime.utcnow().isoformat()})
+                except sqlite3.Error as e:
+                    app.logger.warning(f"No se pudo guardar el patrón: {e}")
+            return result
+
+        return cached_json(
+            make_key("analyze", rules_version(), GEMATRIA_VERSION, name, birthdate, power_code),
+            compute,
+            "analyze"
+        )
+
+    @app.route("/patterns", methods=["GET"])
+    def patterns():
+        """Análisis guardados, más recientes primero: ?name=&core=&keyword=&limit="""
+        if pattern_memory is None:
+            return jsonify({"error": "Memoria de patrones desactivada"}), 404
+        limit = max(1, min(request.args.get("limit", 50, type=int), MAX_HISTORY_PAGE))
+        items = pattern_memory.find(
+            name=request.args.get("name") or None,
+            core=request.args.get("core", type=int),
+            keyword=request.args.get("keyword") or None,
+            limit=limit,
+        )
+        return jsonify({"items": items})
 
     # --- DataMind endpoints (IA modular interna) ---
 
@@ -42,28 +147,84 @@ def create_app():
         birthdate = data.get("birthdate", "").strip()
         text = data.get("text", "").strip() or name
 
-        gem_val = dm_gematria_value(text) if text else 0
-        num_name = dm_num_from_name(name) if name else {}
-        num_birth = dm_num_from_birth(birthdate) if birthdate else {}
+        def compute():
+            gem_val = dm_gematria_value(text) if text else 0
+            num_name = dm_num_from_name(name) if name else {}
+            num_birth = dm_num_from_birth(birthdate) if birthdate else {}
 
-        interpretation = dm_build_interpretation(
-            name_data=num_name,
-            birth_data=num_birth,
-            gematria_value=gem_val
-        )
+            interpretation = dm_build_interpretation(
+                name_data=num_name,
+                birth_data=num_birth,
+                gematria_value=gem_val
+            )
 
-        return jsonify({
-            "datamind": {
-                "name": name,
-                "birthdate": birthdate,
-                "text": text,
-                "gematria": gem_val,
-                "numerology": {
-                    "by_name": num_name,
-                    "by_birth": num_birth,
-                },
-                "interpretation": interpretation
+            return {
+                "datamind": DataMindAnalysis(
+                    birthdate=birthdate,
+                    gematria=gem_val,
+                    interpretation=interpretation,
+                    name=name,
+                    numerology=Numerology(by_birth=num_birth, by_name=num_name),
+                    text=text,
+                )
             }
+
+        return cached_json(make_key("datamind/analyze", rules_version(), GEMATRIA_VERSION, name, birthdate, text), compute, "datamind_analyze")
+
+    @app.route("/datamind/cache/stats", methods=["GET"])
+    def datamind_cache_stats():
+        return jsonify(result_cache.stats())
+
+    @app.route("/datamind/rules", methods=["GET"])
+    def datamind_rules():
+        """Versión de las reglas de interpretación en uso y recargas."""
+        return jsonify(rules_stats())
+
+    @app.route("/datamind/history", methods=["GET"])
+    def datamind_history():
+        """
+        Historial paginado por clave: ?limit=&cursor=&kind=&since=&until=&fields=
+        `cursor` es el next_cursor de la página anterior.
+        """
+        if history is None:
+            return jsonify({"items": [], "next_cursor": None})
+        opts = _history_args(request.args, history.HISTORY_FIELDS)
+        limit = max(1, min(request.args.get("limit", 50, type=int), MAX_HISTORY_PAGE))
+        page = history.get_history_page(limit=limit, cursor=request.args.get("cursor", type=int), **opts)
+        return jsonify({
+            "items": [r.to_dict(opts["fields"]) for r in page["items"]],
+            "next_cursor": page["next_cursor"],
+        })
+
+    @app.route("/datamind/history/export", methods=["GET"])
+    def datamind_history_export():
+        """Exportación NDJSON en streaming: ?kind=&since=&until=&fields="""
+        if history is None:
+            return Response("", mimetype="application/x-ndjson")
+        opts = _history_args(request.args, history.HISTORY_FIELDS)
+        return Response(history.export_history_ndjson(**opts), mimetype="application/x-ndjson")
+
+    @app.route("/datamind/analyze/batch", methods=["POST"])
+    def datamind_analyze_batch():
+        """
+        Versión por lotes de /datamind/analyze para nóminas y listas de partidos.
+        Recibe {"items": [{"name", "birthdate", "text"}, ...]}; un item no
+        válido devuelve {"error": ...} en su posición y no invalida el lote.
+        """
+        data = request.get_json(silent=True) or {}
+        items = data.get("items")
+
+        if not isinstance(items, list):
+            return jsonify({"error": "Se espera 'items' como lista de objetos"}), 400
+        if len(items) > MAX_BATCH_ITEMS:
+            return jsonify({"error": f"Máximo {MAX_BATCH_ITEMS} elementos por lote"}), 400
+
+        with stage_metrics.stage("batch_compute"):
+            results = dm_analyze_batch(items)
+        return jsonify({
+            "count": len(items),
+            "errors": sum(isinstance(r, dict) and "error" in r for r in results),
+            "datamind": results
         })
 
     return app
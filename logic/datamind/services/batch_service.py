@@ -0,0 +1,86 @@
+# app/datamind/services/batch_service.py
+
+"""
+Motor por lotes de NumerIA_DataMind.
+Calcula gematría y numerología de miles de textos en una sola llamada
+usando las tablas por código de carácter de gematria_core (bytes.translate
++ sum), sin bucles por carácter en Python. Los resultados coinciden
+exactamente con las funciones escalares de gematria_service,
+numerology_service y logic/predictor.
+"""
+
+from .gematria_core import gematria_values
+from .numerology_service import reduce_to_core, numerology_from_birth
+from .interpretation_service import build_interpretation
+from .records import NameNumerology, Numerology, DataMindAnalysis
+
+BATCH_FIELDS = ("name", "birthdate", "text")
+
+
+def item_error(item):
+    """Motivo por el que un item del lote no es válido, o None."""
+    if not isinstance(item, dict):
+        return "Se espera un objeto"
+    for field in BATCH_FIELDS:
+        value = item.get(field)
+        if value is not None and not isinstance(value, str):
+            return f"Campo '{field}' debe ser texto"
+    return None
+
+
+def analyze_batch(items) -> list:
+    """
+    Versión por lotes de /datamind/analyze.
+    Cada item es un dict con name, birthdate y text; devuelve por item
+    el mismo bloque "datamind" que el endpoint individual (DataMindAnalysis),
+    o {"error": ...} en la posición de un item no válido sin afectar al resto.
+    """
+    errors = [item_error(item) for item in items]
+    valid = [item for item, error in zip(items, errors) if error is None]
+
+    names = [(item.get("name") or "").strip() for item in valid]
+    birthdates = [(item.get("birthdate") or "").strip() for item in valid]
+    texts = [(item.get("text") or "").strip() or name for item, name in zip(valid, names)]
+
+    gem_values = gematria_values(texts)
+    # El valor del nombre es su gematría (numerology_from_name)
+    name_vals = gematria_values(names)
+
+    # Las mismas fechas y totales se repiten mucho dentro de un lote; los
+    # registros se comparten entre items (son de sólo lectura)
+    cores = {}
+    births = {}
+
+    results = []
+    for name, birthdate, text, gem_val, name_val in zip(names, birthdates, texts, gem_values, name_vals):
+        num_name = {}
+        if name:
+            if name_val not in cores:
+                cores[name_val] = reduce_to_core(name_val)
+            num_name = NameNumerology(name=name, name_core=cores[name_val], name_value=name_val)
+
+        num_birth = {}
+        if birthdate:
+            num_birth = births.get(birthdate)
+            if num_birth is None:
+                num_birth = births[birthdate] = numerology_from_birth(birthdate)
+
+        interpretation = build_interpretation(
+            name_data=num_name,
+            birth_data=num_birth,
+            gematria_value=gem_val
+        )
+
+        results.append(DataMindAnalysis(
+            birthdate=birthdate,
+            gematria=gem_val,
+            interpretation=interpretation,
+            name=name,
+            numerology=Numerology(by_birth=num_birth, by_name=num_name),
+            text=text,
+        ))
+
+    if len(valid) == len(items):
+        return results
+    computed = iter(results)
+    return [next(computed) if error is None else {"error": error} for error in errors]
@@ -0,0 +1,109 @@
+# app/datamind/services/gematria_core.py
+
+"""
+Gematría compartida por /analyze (logic/predictor), /datamind/analyze
+(gematria_service, numerology_service) y el motor por lotes: una sola
+implementación del valor de un texto y de un nombre.
+
+Reglas (A=1 ... Z=26):
+- Mayúsculas y minúsculas valen lo mismo.
+- Una letra con tilde, diéresis u otro diacrítico vale su letra base:
+  Á = A = 1, É = E = 5, Ü = U = 21, Ç = C = 3.
+- Ñ vale como N (14).
+- Las letras que se descomponen en varias latinas suman cada una
+  (la ligadura 'ﬁ' vale F + I).
+- Sólo cuentan letras con mayúscula y minúscula (categorías Lu, Ll, Lt):
+  los indicadores ordinales 'ª' y 'º' ("1ª", "2º") y las letras
+  modificadoras ('ᵃ') valen 0 aunque se descompongan en a/o.
+- Los dígitos ASCII 0-9 suman su valor (letters_value no los cuenta).
+- Todo lo demás vale 0: espacios, signos, ß, letras no latinas, emojis.
+
+Respecto a las versiones anteriores cambian los valores con acentos: la
+gematría de /analyze y /datamind/analyze daba 0 a Á, É, Ñ..., y la
+numerología del nombre usaba ord(c) - 64 (Á = 129, Ñ = 145).
+
+Ruta rápida: un texto que cabe en Latin-1 (casi todos) se resuelve con
+bytes.translate sobre una tabla de 256 pesos y sum(), sin bucle por
+carácter en Python. El resto suma pesos por carácter cacheados.
+"""
+
+import unicodedata
+
+# Cambia si cambian las reglas: forma parte de las claves de la caché de respuestas
+GEMATRIA_VERSION = 3
+
+
+_CASED = frozenset(("Lu", "Ll", "Lt"))
+
+
+def _letter_weight(ch: str) -> int:
+    if unicodedata.category(ch) not in _CASED:
+        return 0
+    total = 0
+    for base in unicodedata.normalize("NFKD", ch):
+        if "A" <= base <= "Z":
+            total += ord(base) - 64
+        elif "a" <= base <= "z":
+            total += ord(base) - 96
+    return total
+
+
+def char_weight(ch: str, digits: bool = True) -> int:
+    """Valor de un carácter según las reglas de arriba."""
+    if "0" <= ch <= "9":
+        return ord(ch) - 48 if digits else 0
+    return _letter_weight(ch)
+
+
+# Latin-1 → peso (ninguno pasa de 26, caben en bytes)
+GEMATRIA_TABLE = bytes(char_weight(chr(i)) for i in range(256))
+LETTERS_TABLE = bytes(char_weight(chr(i), digits=False) for i in range(256))
+
+# Pesos de caracteres fuera de Latin-1, según se van viendo
+_gematria_weights = {}
+_letters_weights = {}
+
+
+def _slow_sum(text: str, weights: dict, digits: bool) -> int:
+    total = 0
+    for ch in text:
+        w = weights.get(ch)
+        if w is None:
+            w = weights[ch] = char_weight(ch, digits)
+        total += w
+    return total
+
+
+def gematria_value(text: str) -> int:
+    """Valor gemátrico de un texto (letras y dígitos)."""
+    if not text:
+        return 0
+    try:
+        return sum(text.encode("latin-1").translate(GEMATRIA_TABLE))
+    except UnicodeEncodeError:
+        return _slow_sum(text, _gematria_weights, True)
+
+
+def letters_value(text: str) -> int:
+    """Como gematria_value, pero sólo cuentan las letras."""
+    if not text:
+        return 0
+    try:
+        return sum(text.encode("latin-1").translate(LETTERS_TABLE))
+    except UnicodeEncodeError:
+        return _slow_sum(text, _letters_weights, False)
+
+
+def gematria_values(texts) -> list:
+    """gematria_value de cada texto (motor por lotes)."""
+    table = GEMATRIA_TABLE
+    out = []
+    for text in texts:
+        if not text:
+            out.append(0)
+            continue
+        try:
+            out.append(sum(text.encode("latin-1").translate(table)))
+        except UnicodeEncodeError:
+            out.append(_slow_sum(text, _gematria_weights, True))
+    return out
@@ -4,63 +4,254 @@
 Módulo de interpretación simbólica para NumerIA_DataMind.
 Combina información numerológica, gemátrica y contextual
 para generar una interpretación simbólica básica.
+
+Las frases salen de tablas y no de cadenas if/elif:
+- data/interpretation_rules.json: plantillas por núcleo del nombre, núcleo
+  de nacimiento y código de poder, y reglas de módulo para la gematría.
+- data/cycles.json: significado de cada número, disponible en las
+  plantillas como {cycle}; la plantilla "cycle" de una sección añade una
+  frase con él a los números que tienen significado.
+
+Al cargar las reglas se precalculan los fragmentos de cada combinación
+(núcleo del nombre, núcleo de nacimiento) y la clase de módulo de cada
+resto de la gematría, así que interpretar son unas pocas consultas a tabla.
+Si alguno de los dos archivos cambia se recargan en la siguiente llamada,
+sin reiniciar (se comprueba como mucho cada INTERPRETATION_RULES_CHECK_SECONDS).
+Un archivo inválido no tira el servicio: se sigue con las reglas anteriores.
 """
 
+import os
+import json
+import math
+import time
+import hashlib
+import threading
+
+from .records import Interpretation
+
+# Núcleos que puede dar reduce_to_core, más los valores de "sin dato"
+CORES = (1, 2, 3, 4, 5, 6, 7, 8, 9, 11, 22, 33)
+NO_CORE = (0, "-")
+
+# Tamaño máximo de la tabla de restos de gematría (mcm de los divisores)
+MAX_MODULO_TABLE = 100000
+
+# Hueco para valores que sólo se conocen en cada llamada (la gematría)
+_SLOT = "\0"
+
+RULES_CHECK_SECONDS = float(os.getenv("INTERPRETATION_RULES_CHECK_SECONDS", 2))
+
+
+def rules_paths():
+    """(archivo de reglas, archivo de ciclos); se pueden cambiar por entorno."""
+    import config
+
+    return (
+        os.getenv("INTERPRETATION_RULES_FILE") or str(config.INTERPRETATION_RULES_FILE),
+        os.getenv("INTERPRETATION_CYCLES_FILE") or str(config.CYCLES_FILE),
+    )
+
+
+def _stamp(paths):
+    stamp = []
+    for path in paths:
+        st = os.stat(path)
+        stamp.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+class InterpretationEngine:
+    """Tablas precalculadas a partir de un juego de reglas y ciclos."""
+
+    def __init__(self, rules, cycles, version="", stamp=None):
+        self.version = version
+        self.stamp = stamp
+        self.cycles = {str(k): str(v) for k, v in cycles.items()}
+
+        dm = rules["datamind"]
+        self._dm_name = dm["name"]
+        self._dm_birth = dm["birth"]
+        self._dm_summary = dm["summary"]
+        self._dm_empty = dm["empty"]
+        self._gem_header_parts = dm["gematria"]["header"].format(value=_SLOT).split(_SLOT)
+        self._gem_rules = tuple((int(d), str(p)) for d, p in dm["gematria"].get("modulo", ()))
+        if any(d <= 0 for d, _ in self._gem_rules):
+            raise ValueError("los divisores de gematría deben ser positivos")
+
+        pred = rules["predictor"]
+        self._pred_name = pred["name"]
+        self._pred_birth = pred["birth"]
+        self._pred_power = pred["power"]
+        self._pred_empty = pred["empty"]
+
+        # Clase de módulo por resto: la primera regla cuyo divisor divide al valor
+        self._gem_modulo = math.lcm(*(d for d, _ in self._gem_rules)) if self._gem_rules else 1
+        if self._gem_modulo <= MAX_MODULO_TABLE:
+            self._gem_table = tuple(self._gem_suffix(r) for r in range(self._gem_modulo))
+        else:
+            self._gem_table = None
+
+        domain = CORES + NO_CORE
+        self._dm_pairs = {(n, b): self._dm_pair(n, b) for n in domain for b in domain}
+        # /analyze nunca pasa "-": sus núcleos ausentes son 0
+        names, births, powers = (
+            {c: self._fragments(section, c) for c in CORES + (0,)}
+            for section in (self._pred_name, self._pred_birth, self._pred_power)
+        )
+        self._pred_triples = {
+            (n, b, p): names[n] + births[b] + powers[p] for n in names for b in births for p in powers
+        }
+
+    # ---------- precálculo ----------
+    def _fragments(self, section, core):
+        if not core or core == "-":
+            return ()
+        fields = {"core": core, "cycle": self.cycles.get(str(core), "")}
+        out = [section["header"].format(**fields)]
+        phrase = section.get("phrases", {}).get(str(core))
+        if phrase:
+            out.append(phrase.format(**fields))
+        # Significado del ciclo (data/cycles.json), si el número lo tiene
+        cycle = section.get("cycle")
+        if cycle and fields["cycle"]:
+            out.append(cycle.format(**fields))
+        return tuple(out)
+
+    def _dm_pair(self, name_core, birth_core):
+        details = self._fragments(self._dm_name, name_core) + self._fragments(self._dm_birth, birth_core)
+        # La gematría se inserta en cada llamada (no está acotada)
+        summary = self._dm_summary.format(name_core=name_core, birth_core=birth_core, gematria=_SLOT)
+        return details, summary.split(_SLOT)
+
+    def _pred_triple(self, name_core, birth_core, power_core):
+        return (
+            self._fragments(self._pred_name, name_core)
+            + self._fragments(self._pred_birth, birth_core)
+            + self._fragments(self._pred_power, power_core)
+        )
+
+    def _gem_suffix(self, value):
+        for divisor, phrase in self._gem_rules:
+            if value % divisor == 0:
+                return (phrase,)
+        return ()
+
+    # ---------- interpretación ----------
+    def datamind(self, name_core, birth_core, gematria_value):
+        """Detalles y resumen de /datamind/analyze."""
+        entry = self._dm_pairs.get((name_core, birth_core))
+        if entry is None:
+            entry = self._dm_pair(name_core, birth_core)
+        details, summary = entry
+        value = str(gematria_value)
+
+        if gematria_value:
+            table = self._gem_table
+            suffix = table[gematria_value % self._gem_modulo] if table else self._gem_suffix(gematria_value)
+            details = (*details, value.join(self._gem_header_parts), *suffix)
+        elif not details:
+            return Interpretation(details=(), summary=self._dm_empty)
+
+        return Interpretation(details=details, summary=value.join(summary))
+
+    def predictor(self, name_core, birth_core, power_core=0, sports_hint=None):
+        """Detalles de /analyze; el resumen es el primer detalle."""
+        details = self._pred_triples.get((name_core, birth_core, power_core))
+        if details is None:
+            details = self._pred_triple(name_core, birth_core, power_core)
+        if power_core and sports_hint:
+            details = (*details, sports_hint)
+        return Interpretation(details=details, summary=details[0] if details else self._pred_empty)
+
+
+# ==========================================
+#  CARGA Y RECARGA
+# ==========================================
+_engine = None
+_engine_lock = threading.Lock()
+_checked_at = 0.0
+_stats = {"loaded_at": 0.0, "reloads": 0, "errors": 0}
+
+
+def load_engine(paths=None):
+    """Lee las reglas y los ciclos y precalcula las tablas."""
+    paths = paths or rules_paths()
+    stamp = _stamp(paths)
+    raw = []
+    for path in paths:
+        with open(path, "rb") as f:
+            raw.append(f.read())
+    try:
+        rules, cycles = (json.loads(data) for data in raw)
+        version = hashlib.sha1(b"\0".join(raw)).hexdigest()[:12]
+        return InterpretationEngine(rules, cycles, version=version, stamp=stamp)
+    except (KeyError, TypeError, ValueError, AttributeError, IndexError) as exc:
+        raise ValueError(f"Reglas de interpretación inválidas ({paths[0]}): {exc!r}") from exc
+
+
+def get_engine():
+    """Motor actual; lo recarga si las reglas han cambiado en disco."""
+    global _checked_at
+    engine = _engine
+    if engine is not None and time.monotonic() - _checked_at < RULES_CHECK_SECONDS:
+        return engine
+
+    with _engine_lock:
+        now = time.monotonic()
+        if _engine is not None and now - _checked_at < RULES_CHECK_SECONDS:
+            return _engine
+        _checked_at = now
+        if _engine is None:
+            _set_engine(load_engine())
+            return _engine
+        try:
+            paths = rules_paths()
+            if _stamp(paths) != _engine.stamp:
+                _set_engine(load_engine(paths))
+                _stats["reloads"] += 1
+        except (OSError, ValueError):
+            # Se sigue con las reglas anteriores; se reintenta en la próxima comprobación
+            _stats["errors"] += 1
+        return _engine
+
+
+def reload_rules():
+    """Fuerza la recarga (p. ej. tras editar las reglas) y devuelve la versión."""
+    global _checked_at
+    with _engine_lock:
+        _set_engine(load_engine())
+        _stats["reloads"] += 1
+        _checked_at = time.monotonic()
+    return _engine.version
+
+
+def _set_engine(engine):
+    global _engine
+    _engine = engine
+    _stats["loaded_at"] = time.time()
+
+
+def rules_version():
+    """Huella de las reglas en uso (para claves de caché)."""
+    return get_engine().version
+
+
+def rules_stats():
+    return {"version": get_engine().version, **_stats}
+
+
+# ==========================================
+#  API
+# ==========================================
 def build_interpretation(name_data, birth_data, gematria_value):
     """
     Genera una interpretación simbólica con base en:
     - Numerología del nombre
     - Fecha de nacimiento
     - Valor gemátrico
+    Acepta registros de numerology_service o dicts con las mismas claves
+    ({} si no hay dato).
     """
-    details = []
-
-    # --- Análisis del nombre ---
-    if name_data and name_data.get("name_core"):
-        details.append(f"Vibración del nombre: {name_data['name_core']}.")
-        if name_data["name_core"] in (1, 8):
-            details.append("Energía de liderazgo y manifestación.")
-        elif name_data["name_core"] in (2, 6):
-            details.append("Energía emocional y de conexión humana.")
-        elif name_data["name_core"] in (3, 9):
-            details.append("Energía creativa y expresiva.")
-        elif name_data["name_core"] == 7:
-            details.append("Energía introspectiva y espiritual.")
-
-    # --- Análisis del nacimiento ---
-    if birth_data and birth_data.get("birth_core"):
-        details.append(f"Camino de vida: {birth_data['birth_core']}.")
-        if birth_data["birth_core"] == 1:
-            details.append("Camino de autodeterminación y liderazgo.")
-        elif birth_data["birth_core"] == 5:
-            details.append("Camino de libertad y transformación.")
-        elif birth_data["birth_core"] == 7:
-            details.append("Camino de sabiduría y búsqueda interior.")
-        elif birth_data["birth_core"] == 9:
-            details.append("Camino de servicio y propósito elevado.")
-
-    # --- Análisis gemátrico ---
-    if gematria_value:
-        details.append(f"Gematría del texto: {gematria_value}.")
-        if gematria_value % 7 == 0:
-            details.append("Simbolismo de perfección y totalidad (múltiplo de 7).")
-        elif gematria_value % 9 == 0:
-            details.append("Simbolismo de cierre o culminación (múltiplo de 9).")
-        elif gematria_value % 5 == 0:
-            details.append("Simbolismo de cambio y movimiento (múltiplo de 5).")
-
-    # --- Resumen final ---
-    if details:
-        summary = (
-            f"Interpretación general: "
-            f"nombre {name_data.get('name_core', '-')}, "
-            f"camino {birth_data.get('birth_core', '-')}, "
-            f"gematría {gematria_value}."
-        )
-    else:
-        summary = "Sin interpretación disponible."
-
-    return {
-        "summary": summary,
-        "details": details
-    }
+    name_core = name_data.get("name_core", "-") if name_data else "-"
+    birth_core = birth_data.get("birth_core", "-") if birth_data else "-"
+    return get_engine().datamind(name_core, birth_core, gematria_value)
@@ -0,0 +1,68 @@
+# app/datamind/services/numerology_core.py
+
+"""
+Núcleo numerológico compartido por /analyze (logic/predictor) y
+/datamind/analyze (numerology_service).
+Reducciones y sumas de dígitos precalculadas para los rangos habituales
+y fechas de nacimiento cacheadas, porque se repiten constantemente.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+MASTER_NUMBERS = (11, 22, 33)
+
+# Cubre nombres, fechas y gematrías de textos normales
+TABLE_SIZE = 10000
+
+# Restos módulo 9 de 11, 22 y 33. La suma de dígitos conserva n % 9, así que
+# si n no cae en uno de estos restos nunca pasará por un número maestro.
+_MASTER_RESIDUES = frozenset(m % 9 for m in MASTER_NUMBERS)
+
+
+def _reduce_slow(n: int) -> int:
+    while n > 9 and n not in MASTER_NUMBERS:
+        n = sum(int(d) for d in str(n))
+    return n
+
+
+DIGIT_SUM = tuple(sum(int(d) for d in str(i)) for i in range(TABLE_SIZE))
+CORE = tuple(_reduce_slow(i) for i in range(TABLE_SIZE))
+
+
+def digit_sum(n: int) -> int:
+    """Suma de los dígitos de un entero no negativo."""
+    if n < TABLE_SIZE:
+        return DIGIT_SUM[n]
+    total = 0
+    while n:
+        n, rest = divmod(n, TABLE_SIZE)
+        total += DIGIT_SUM[rest]
+    return total
+
+
+def reduce_to_core(n: int) -> int:
+    """Reduce un número a su esencia (1–9, 11, 22, 33)."""
+    if 0 <= n < TABLE_SIZE:
+        return CORE[n]
+    if n <= 9:
+        return n
+    residue = n % 9
+    if residue not in _MASTER_RESIDUES:
+        # Raíz digital directa: no hay número maestro en el camino
+        return residue or 9
+    return reduce_to_core(digit_sum(n))
+
+
+@lru_cache(maxsize=4096)
+def birth_numbers(birthdate: str) -> tuple:
+    """
+    (birth_sum, birth_core) de una fecha AAAA-MM-DD.
+    Devuelve (0, 0) si la fecha no es válida.
+    """
+    try:
+        dt = datetime.strptime(birthdate, "%Y-%m-%d")
+    except ValueError:
+        return 0, 0
+    total = DIGIT_SUM[dt.year] + DIGIT_SUM[dt.month] + DIGIT_SUM[dt.day]
+    return total, CORE[total]
@@ -0,0 +1,121 @@
+# app/datamind/services/records.py
+
+"""
+Registros de resultado del análisis: numerología, gematría, código de poder
+e interpretación. Son dataclasses con __slots__ (sin __dict__ por instancia)
+que orjson serializa directamente, sin copiarlos antes a dicts.
+
+Los campos se declaran en orden alfabético: orjson escribe los campos en el
+orden de declaración y así la salida es la misma que la de jsonify con
+sort_keys. Se comportan como un Mapping de sólo lectura (r["name_core"],
+r.get(...), dict(r), r == {...}) para el código que los trataba como dicts.
+Se comparten entre resultados (cachés de lote), así que no se modifican.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+class Record(Mapping):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        return default
+
+    def __iter__(self):
+        return iter(self.__dataclass_fields__)
+
+    def __len__(self):
+        return len(self.__dataclass_fields__)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self.to_dict() == _plain(dict(other))
+
+    __hash__ = None
+
+    def to_dict(self):
+        """Copia en dicts y listas (para guardar o comparar)."""
+        return {k: _plain(getattr(self, k)) for k in self.__dataclass_fields__}
+
+
+# eq=False: la igualdad (también contra dicts) la da Record
+_record = dataclass(slots=True, eq=False)
+
+
+@_record
+class NameNumerology(Record):
+    name: str
+    name_core: int
+    name_value: int
+
+
+@_record
+class BirthNumerology(Record):
+    birth_core: int
+    birth_sum: int
+    birthdate: str
+
+
+@_record
+class PowerCodeAnalysis(Record):
+    gematria: int
+    input: str
+    power_core: int
+    sports_hint: object  # str o None
+
+
+@_record
+class Interpretation(Record):
+    details: tuple
+    summary: str
+
+
+@_record
+class Numerology(Record):
+    by_birth: object  # BirthNumerology o {}
+    by_name: object  # NameNumerology o {}
+
+
+@_record
+class TextGematria(Record):
+    gematria: int
+    text: str
+
+
+@_record
+class FullAnalysis(Record):
+    """Salida de /analyze (logic/predictor.analyze_full_input)."""
+    gematria: TextGematria
+    interpretation: Interpretation
+    numerology: Numerology
+    power_code_analysis: object  # PowerCodeAnalysis o {}
+
+
+@_record
+class DataMindAnalysis(Record):
+    """Bloque "datamind" de /datamind/analyze y de cada item del lote."""
+    birthdate: str
+    gematria: int
+    interpretation: Interpretation
+    name: str
+    numerology: Numerology
+    text: str
@@ -0,0 +1,150 @@
+# app/datamind/services/result_cache.py
+
+"""
+Caché de respuestas para /analyze y /datamind/analyze.
+Las salidas son funciones puras de la entrada normalizada, así que se
+guarda directamente el cuerpo JSON ya serializado (bytes): un acierto
+no vuelve a calcular ni a pasar por jsonify.
+Nivel 1: LRU acotado en memoria del proceso.
+Nivel 2 (opcional): tabla SQLite compartida por todos los workers.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def make_key(endpoint: str, *fields) -> str:
+    """Clave estable para un endpoint y sus campos ya normalizados."""
+    raw = json.dumps([endpoint, *fields], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=10000, max_bytes=32 * 1024 * 1024, db_path=None, max_shared_rows=200000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.max_shared_rows = max_shared_rows
+
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._conn = None
+        self._conn_pid = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- nivel compartido ----------
+    def _db(self):
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    key TEXT PRIMARY KEY,
+                    body BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_created ON result_cache (created_at)")
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = pid
+        return self._conn
+
+    def _get_shared(self, key):
+        if not self.db_path:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db().execute("SELECT body FROM result_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return bytes(row[0]) if row else None
+
+    def _put_shared(self, key, body):
+        if not self.db_path:
+            return
+        try:
+            with self._db_lock:
+                conn = self._db()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO result_cache (key, body, created_at) VALUES (?, ?, ?)",
+                        (key, body, time.time())
+                    )
+                    self._writes += 1
+                    # Poda ocasional de las filas más antiguas
+                    if self._writes % 1000 == 0:
+                        conn.execute(
+                            "DELETE FROM result_cache WHERE key IN ("
+                            " SELECT key FROM result_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                            (self.max_shared_rows,)
+                        )
+        except sqlite3.Error:
+            pass
+
+    # ---------- nivel en memoria ----------
+    def _put_local(self, key, body):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = body
+            self._bytes += len(body)
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    # ---------- API pública ----------
+    def get(self, key):
+        """Cuerpo JSON cacheado (bytes) o None."""
+        with self._lock:
+            body = self._data.get(key)
+            if body is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return body
+
+        body = self._get_shared(key)
+        if body is not None:
+            self.shared_hits += 1
+            self._put_local(key, body)
+            return body
+
+        self.misses += 1
+        return None
+
+    def put(self, key, body):
+        self._put_local(key, body)
+        self._put_shared(key, body)
+
+    def stats(self):
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "shared": bool(self.db_path),
+        }
@@ -1,8 +1,8 @@
-import json
-import os
 from datetime import datetime
 from sqlalchemy import create_engine, text
 
+import fast_json
+
 _engine = None
 
 def init_db(db_url: str):
@@ -20,6 +20,12 @@ def init_db(db_url: str):
             created_at TEXT
         )
         """))
+        # Paginación en O(página): por id con filtro de tipo y por
+        # (created_at, id) en rangos de fecha, con o sin tipo
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_analyses_kind_id ON analyses (kind, id)"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_analyses_created_at"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_analyses_created_id ON analyses (created_at, id)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_analyses_kind_created_id ON analyses (kind, created_at, id)"))
 
 
 def save_analysis(kind: str, input_data: dict, output_data: dict):
@@ -30,29 +36,146 @@ def save_analysis(kind: str, input_data: dict, output_data: dict):
             text("INSERT INTO analyses (kind, input_json, output_json, created_at) VALUES (:k, :i, :o, :c)"),
             {
                 "k": kind,
-                "i": json.dumps(input_data, ensure_ascii=False),
-                "o": json.dumps(output_data, ensure_ascii=False),
+                "i": fast_json.dumps(input_data),
+                "o": fast_json.dumps(output_data),
                 "c": datetime.utcnow().isoformat()
             }
         )
 
 
-def get_history(limit: int = 50):
+HISTORY_FIELDS = ("id", "kind", "input", "output", "created_at")
+_MISSING = object()
+
+
+class HistoryRecord:
+    """
+    Fila de `analyses` con decodificación perezosa: input/output sólo se
+    parsean (una vez) cuando se piden.
+    """
+
+    __slots__ = ("id", "kind", "created_at", "input_json", "output_json", "_input", "_output")
+
+    def __init__(self, id, kind, created_at, input_json=None, output_json=None):
+        self.id = id
+        self.kind = kind
+        self.created_at = created_at
+        self.input_json = input_json
+        self.output_json = output_json
+        self._input = _MISSING
+        self._output = _MISSING
+
+    @property
+    def input(self):
+        if self._input is _MISSING:
+            self._input = fast_json.loads(self.input_json) if self.input_json is not None else None
+        return self._input
+
+    @property
+    def output(self):
+        if self._output is _MISSING:
+            self._output = fast_json.loads(self.output_json) if self.output_json is not None else None
+        return self._output
+
+    def to_dict(self, fields=HISTORY_FIELDS):
+        return {f: getattr(self, f) for f in fields}
+
+    def to_ndjson(self, fields=HISTORY_FIELDS):
+        """Línea NDJSON reutilizando el JSON guardado tal cual (sin decodificar)."""
+        parts = []
+        for f in fields:
+            if f == "input":
+                raw = self.input_json if self.input_json is not None else "null"
+            elif f == "output":
+                raw = self.output_json if self.output_json is not None else "null"
+            else:
+                raw = fast_json.dumps(getattr(self, f))
+            parts.append(f'"{f}": {raw}')
+        return "{" + ", ".join(parts) + "}\n"
+
+
+def _normalize_fields(fields):
+    if not fields:
+        return HISTORY_FIELDS
+    fields = tuple(f for f in fields if f in HISTORY_FIELDS)
+    return fields or HISTORY_FIELDS
+
+
+def _query_history(conn, fields, limit, cursor=None, ascending=False, kind=None, since=None, until=None):
+    # Sólo se leen los blobs que se van a usar
+    columns = ["id", "kind", "created_at"]
+    columns.append("input_json" if "input" in fields else "NULL AS input_json")
+    columns.append("output_json" if "output" in fields else "NULL AS output_json")
+
+    # Con rango de fechas se recorre (created_at, id) para que las filas
+    # fuera del rango no se lean; el cursor sigue siendo un id y su
+    # created_at se busca por clave primaria
+    key = "(created_at, id)" if since or until else "id"
+    cursor_key = "((SELECT created_at FROM analyses WHERE id = :cursor), :cursor)" if since or until else ":cursor"
+
+    clauses, params = [], {"lim": limit}
+    if cursor is not None:
+        clauses.append(f"{key} {'>' if ascending else '<'} {cursor_key}")
+        params["cursor"] = cursor
+    if kind:
+        clauses.append("kind = :kind")
+        params["kind"] = kind
+    if since:
+        clauses.append("created_at >= :since")
+        params["since"] = since
+    if until:
+        clauses.append("created_at < :until")
+        params["until"] = until
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    order = "ASC" if ascending else "DESC"
+    order_by = f"created_at {order}, id {order}" if since or until else f"id {order}"
+    rows = conn.execute(
+        text(f"SELECT {', '.join(columns)} FROM analyses {where} ORDER BY {order_by} LIMIT :lim"),
+        params
+    ).fetchall()
+    return [HistoryRecord(r.id, r.kind, r.created_at, r.input_json, r.output_json) for r in rows]
+
+
+def get_history_page(limit: int = 50, cursor: int = None, kind: str = None,
+                     since: str = None, until: str = None, fields=None):
+    """
+    Página del historial, más recientes primero.
+    `cursor` es el id del último elemento de la página anterior
+    (paginación por clave: coste O(tamaño de página) aunque la tabla crezca).
+    `since`/`until` son fechas ISO (created_at); `until` es exclusivo. Con
+    rango de fechas el orden es por (created_at, id).
+    """
+    fields = _normalize_fields(fields)
     if _engine is None:
-        return []
-    with _engine.begin() as conn:
-        rows = conn.execute(
-            text("SELECT id, kind, input_json, output_json, created_at FROM analyses ORDER BY id DESC LIMIT :lim"),
-            {"lim": limit}
-        ).fetchall()
-
-    out = []
-    for r in rows:
-        out.append({
-            "id": r.id,
-            "kind": r.kind,
-            "input": json.loads(r.input_json),
-            "output": json.loads(r.output_json),
-            "created_at": r.created_at
-        })
-    return out
+        return {"items": [], "next_cursor": None}
+    with _engine.connect() as conn:
+        records = _query_history(conn, fields, limit, cursor=cursor, kind=kind, since=since, until=until)
+    return {
+        "items": records,
+        "next_cursor": records[-1].id if len(records) == limit else None,
+    }
+
+
+def export_history_ndjson(kind: str = None, since: str = None, until: str = None,
+                          fields=None, batch_size: int = 1000):
+    """
+    Exporta un rango grande como NDJSON en streaming (orden ascendente).
+    Lee por lotes con la misma clave que el historial y copia los blobs JSON sin decodificarlos.
+    """
+    fields = _normalize_fields(fields)
+    if _engine is None:
+        return
+    last_id = None
+    while True:
+        with _engine.connect() as conn:
+            records = _query_history(conn, fields, batch_size, cursor=last_id, ascending=True,
+                                     kind=kind, since=since, until=until)
+        if not records:
+            return
+        yield "".join(r.to_ndjson(fields) for r in records)
+        last_id = records[-1].id
+
+
+def get_history(limit: int = 50):
+    page = get_history_page(limit=limit)
+    return [r.to_dict() for r in page["items"]]
@@ -1,15 +1,200 @@
-import json
 import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import fast_json
+
+_INSERT_SQL = "INSERT INTO pattern_memory (name, core, keyword, created_at, record) VALUES (?, ?, ?, ?, ?)"
+
 
 def load_memory(path: str) -> list:
+    """Lee el formato antiguo (lista JSON completa). Sólo para migrar."""
     if not os.path.exists(path):
         return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return fast_json.loads(f.read())
     except Exception:
         return []
 
 def save_memory(path: str, data: list):
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(fast_json.dumps(data, indent=True))
+
+
+def _index_fields(record: dict) -> tuple:
+    """
+    Extrae (nombre, núcleo, palabra clave) de un registro.
+    Acepta el formato plano (name/core/keyword) y la salida de
+    analyze_full_input (numerology.by_name / power_code_analysis).
+    """
+    by_name = (record.get("numerology") or {}).get("by_name") or {}
+    name = record.get("name") or by_name.get("name") or ""
+    core = record.get("core")
+    if core is None:
+        core = record.get("name_core", by_name.get("name_core"))
+    keyword = record.get("keyword") or (record.get("power_code_analysis") or {}).get("input") or ""
+    return (
+        name.strip().lower() or None,
+        core if isinstance(core, int) else None,
+        keyword.strip().lower() or None,
+    )
+
+
+class PatternMemory:
+    """
+    Memoria de patrones sólo-anexar sobre SQLite.
+    Anexar es O(1), la lectura es en streaming y hay índices por
+    nombre, núcleo y palabra clave. La conexión es por proceso y se abre
+    en el primer uso, así que se puede crear antes de un fork.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def _db(self) -> sqlite3.Connection:
+        """Conexión de este proceso (se abre en el primer uso y tras un fork). Con el lock tomado."""
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pattern_memory (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        name TEXT,
+                        core INTEGER,
+                        keyword TEXT,
+                        created_at TEXT,
+                        record TEXT NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_pattern_memory_name ON pattern_memory (name)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_pattern_memory_core ON pattern_memory (core)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_pattern_memory_keyword ON pattern_memory (keyword)")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pattern_memory_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                """)
+            self._conn = conn
+            self._conn_pid = pid
+        return self._conn
+
+    def _row(self, record: dict) -> tuple:
+        name, core, keyword = _index_fields(record)
+        created_at = record.get("timestamp") or datetime.utcnow().isoformat()
+        return (name, core, keyword, created_at, fast_json.dumps(record))
+
+    def append(self, record: dict) -> int:
+        """Anexa un registro y devuelve su id."""
+        row = self._row(record)
+        with self._lock:
+            conn = self._db()
+            with conn:
+                return conn.execute(_INSERT_SQL, row).lastrowid
+
+    def extend(self, records) -> int:
+        """Anexa muchos registros en una sola transacción."""
+        rows = [self._row(r) for r in records]
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.executemany(_INSERT_SQL, rows)
+        return len(rows)
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def iter_records(self, batch_size: int = 500):
+        """Recorre toda la memoria en orden de llegada sin cargarla entera."""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._db().execute(
+                    "SELECT id, record FROM pattern_memory WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, record in rows:
+                yield fast_json.loads(record)
+            last_id = rows[-1][0]
+
+    def find(self, name: str = None, core: int = None, keyword: str = None, limit: int = 100) -> list:
+        """Búsqueda por índice; los filtros se combinan con AND. Más recientes primero."""
+        clauses, params = [], []
+        if name:
+            clauses.append("name = ?")
+            params.append(name.strip().lower())
+        if core is not None:
+            clauses.append("core = ?")
+            params.append(core)
+        if keyword:
+            clauses.append("keyword = ?")
+            params.append(keyword.strip().lower())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT record FROM pattern_memory {where} ORDER BY id DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [fast_json.loads(r[0]) for r in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM pattern_memory").fetchone()[0]
+
+    def migrate_json(self, json_path: str) -> int:
+        """
+        Importa una sola vez el memory_log.json antiguo.
+        El archivo no se toca; la migración queda registrada en la tabla meta.
+        """
+        marker = f"migrated:{os.path.abspath(json_path)}"
+        with self._lock:
+            if self._db().execute("SELECT 1 FROM pattern_memory_meta WHERE key = ?", (marker,)).fetchone():
+                return 0
+        records = [r for r in load_memory(json_path) if isinstance(r, dict)]
+        rows = [self._row(r) for r in records]
+        with self._lock:
+            conn = self._db()
+            # La marca y los registros van en la misma transacción: si otro
+            # proceso ya migró, la marca existe y no se inserta nada.
+            with conn:
+                claimed = conn.execute(
+                    "INSERT OR IGNORE INTO pattern_memory_meta (key, value) VALUES (?, ?)",
+                    (marker, datetime.utcnow().isoformat())
+                ).rowcount
+                if not claimed:
+                    return 0
+                conn.executemany(_INSERT_SQL, rows)
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def open_memory(db_path: str, legacy_json: str = None) -> PatternMemory:
+    """Abre la memoria y, si se indica, migra el JSON antiguo la primera vez."""
+    memory = PatternMemory(db_path)
+    if legacy_json:
+        memory.migrate_json(legacy_json)
+    return memory
+
+
+if __name__ == "__main__":
+    import config
+
+    mem = PatternMemory(str(config.MEMORY_DB))
+    imported = mem.migrate_json(str(config.MEMORY_FILE))
+    print(f"Migrados {imported} registros; total en memoria: {mem.count()}")
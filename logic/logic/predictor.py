@@ -1,73 +1,30 @@
 # app/logic/predictor.py
-from datetime import datetime
-import re
-
-# Pequeño mapa de valores para gematría simple
-LETTER_MAP = {chr(i + 65): i + 1 for i in range(26)}  # A=1 ... Z=26
-
-def clean_text(text: str) -> str:
-    return re.sub(r"[^A-Za-z0-9ÁÉÍÓÚáéíóúÑñ ]", "", text).strip()
-
-def gematria_value(text: str) -> int:
-    text = clean_text(text).upper()
-    total = 0
-    for ch in text:
-        if ch.isalpha():
-            total += LETTER_MAP.get(ch, 0)
-        elif ch.isdigit():
-            total += int(ch)
-    return total
-
-def reduce_to_core(n: int) -> int:
-    while n > 9 and n not in (11, 22, 33):
-        n = sum(int(d) for d in str(n))
-    return n
-
-def numerology_from_name(name: str) -> dict:
-    if not name:
-        return {"name": "", "name_value": 0, "name_core": 0}
-    value = gematria_value(name)
-    return {
-        "name": name,
-        "name_value": value,
-        "name_core": reduce_to_core(value),
-    }
-
-def numerology_from_birthdate(birthdate: str) -> dict:
-    if not birthdate:
-        return {"birthdate": "", "birth_sum": 0, "birth_core": 0}
-    try:
-        dt = datetime.strptime(birthdate, "%Y-%m-%d")
-        digits = list(str(dt.year)) + list(str(dt.month)) + list(str(dt.day))
-        total = sum(int(d) for d in digits)
-        return {
-            "birthdate": birthdate,
-            "birth_sum": total,
-            "birth_core": reduce_to_core(total),
-        }
-    except ValueError:
-        return {"birthdate": birthdate, "birth_sum": 0, "birth_core": 0}
-
-def interpret(name_info: dict, birth_info: dict, power_info: dict) -> dict:
-    details = []
-    # base
-    if name_info.get("name_core"):
-        details.append(f"Vibración base del nombre: {name_info['name_core']}.")
-    if birth_info.get("birth_core"):
-        details.append(f"Camino de vida {birth_info['birth_core']}.")
-    # power code
-    if power_info and power_info.get("power_core"):
-        details.append(f"Código de poder detectado con vibración {power_info['power_core']}.")
-        if power_info.get("sports_hint"):
-            details.append(power_info["sports_hint"])
-
-    summary = details[0] if details else "Sin interpretación."
-    return {
-        "summary": summary,
-        "details": details,
-    }
-
-def analyze_power_code(power_code: str) -> dict:
+from ..datamind.services.numerology_core import reduce_to_core
+from ..datamind.services.gematria_core import gematria_value
+from ..datamind.services.numerology_service import numerology_from_name, numerology_from_birth
+from ..datamind.services.interpretation_service import get_engine
+from ..datamind.services.records import (
+    NameNumerology,
+    BirthNumerology,
+    PowerCodeAnalysis,
+    Interpretation,
+    Numerology,
+    TextGematria,
+    FullAnalysis,
+)
+
+# Una sola gematría y numerología para /analyze y /datamind/analyze
+numerology_from_birthdate = numerology_from_birth
+
+
+def interpret(name_info: NameNumerology, birth_info: BirthNumerology, power_info) -> Interpretation:
+    # frases en data/interpretation_rules.json (sección "predictor")
+    engine = get_engine()
+    if power_info:  # {} si no hay código de poder
+        return engine.predictor(name_info.name_core, birth_info.birth_core, power_info.power_core, power_info.sports_hint)
+    return engine.predictor(name_info.name_core, birth_info.birth_core)
+
+def analyze_power_code(power_code: str):
     """
     Aquí es donde conectamos con lo que quieres:
     - detectar palabras como LEO, MESSI, MIAMI, FINAL, GOAL, etc.
@@ -95,29 +52,18 @@ def analyze_power_code(power_code: str) -> dict:
     if any(word in text_up for word in ["GOL", "GOAL", "ANOTA"]):
         sports_hint = (sports_hint or "") + " Tendencia a momento de definición (anotar)."
 
-    return {
-        "input": power_code,
-        "gematria": val,
-        "power_core": core,
-        "sports_hint": sports_hint,
-    }
+    return PowerCodeAnalysis(gematria=val, input=power_code, power_core=core, sports_hint=sports_hint)
 
-def analyze_full_input(name: str, birthdate: str, power_code: str):
+def analyze_full_input(name: str, birthdate: str, power_code: str) -> FullAnalysis:
     name_info = numerology_from_name(name)
     birth_info = numerology_from_birthdate(birthdate)
     power_info = analyze_power_code(power_code)
 
     interpretation = interpret(name_info, birth_info, power_info)
 
-    return {
-        "numerology": {
-            "by_name": name_info,
-            "by_birth": birth_info,
-        },
-        "gematria": {
-            "text": name,
-            "gematria": name_info.get("name_value", 0),
-        },
-        "power_code_analysis": power_info,
-        "interpretation": interpretation,
-    }
+    return FullAnalysis(
+        gematria=TextGematria(gematria=name_info.name_value, text=name),
+        interpretation=interpretation,
+        numerology=Numerology(by_birth=birth_info, by_name=name_info),
+        power_code_analysis=power_info,
+    )
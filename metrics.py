@@ -0,0 +1,285 @@
+import time
+import threading
+import contextvars
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Segundos; cubre desde lecturas de caché hasta llamadas externas lentas
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+Labels = Tuple[str, ...]
+
+_sport: contextvars.ContextVar[str] = contextvars.ContextVar("datamind_metrics_sport", default="none")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ==========================================
+#  MÉTRICAS BÁSICAS (FORMATO PROMETHEUS)
+# ==========================================
+class _Series:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """
+    Histograma con etiquetas. Cada observación cuesta un bisect y tres
+    sumas bajo un lock; los acumulados se calculan sólo al exportar.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: Dict[Labels, _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = _Series(len(self.bounds) + 1)
+            series.buckets[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def snapshot(self) -> Dict[Labels, Dict[str, Any]]:
+        with self._lock:
+            return {
+                labels: {"count": s.count, "sum": s.sum, "buckets": list(s.buckets)}
+                for labels, s in self._series.items()
+            }
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, snap in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), snap["buckets"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(snap['sum'])}")
+            lines.append(f"{self.name}_count{label_str} {snap['count']}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.snapshot().items())
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class GaugeCallback:
+    """Gauges leídos al exportar desde un dict de estadísticas (p. ej. stats())."""
+
+    kind = "gauge"
+
+    def __init__(self, prefix: str, documentation: str, fn: Callable[[], Dict[str, Any]]) -> None:
+        self.name = prefix
+        self.documentation = documentation
+        self.fn = fn
+
+    def render_block(self) -> List[str]:
+        try:
+            values = self.fn()
+        except Exception:
+            return []
+        lines = []
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{self.name}_{key}"
+            lines.append(f"# HELP {name} {self.documentation} ({key})")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_value(value)}")
+        return lines
+
+    def reset(self) -> None:
+        pass
+
+
+# ==========================================
+#  TIEMPOS POR ETAPA
+# ==========================================
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "StageMetrics", stage: str) -> None:
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self) -> "_StageTimer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        labels = (self.stage, _sport.get())
+        self.metrics.stage_seconds.observe(labels, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.stage_errors.inc(labels)
+        return False
+
+
+class StageMetrics:
+    """
+    Latencias y errores por etapa y deporte, más latencia HTTP por endpoint.
+    El deporte se toma del contexto (ver `sport`), así que las etapas que
+    corren dentro de run_parallel heredan la etiqueta de la petición.
+    Las métricas son por proceso: con varios workers, cada uno expone las suyas.
+    """
+
+    def __init__(self, namespace: str = "datamind", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.namespace = namespace
+        self.stage_seconds = Histogram(
+            f"{namespace}_stage_seconds", "Duración de cada etapa", ("stage", "sport"), buckets
+        )
+        self.stage_errors = Counter(
+            f"{namespace}_stage_errors_total", "Excepciones por etapa", ("stage", "sport")
+        )
+        self.request_seconds = Histogram(
+            f"{namespace}_http_request_seconds",
+            "Duración de las peticiones HTTP",
+            ("endpoint", "method", "status"),
+            buckets,
+        )
+        self._collectors: List[Any] = [self.stage_seconds, self.stage_errors, self.request_seconds]
+
+    # ---------- registro ----------
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager que mide una etapa; una excepción cuenta como error."""
+        return _StageTimer(self, name)
+
+    def instrument(self, name: str) -> Callable:
+        """Decorador equivalente a envolver la función en `stage(name)`."""
+
+        def decorator(fn: Callable) -> Callable:
+            @wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with _StageTimer(self, name):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def error(self, name: str) -> None:
+        """Cuenta un error de una etapa que no llega a lanzar excepción."""
+        self.stage_errors.inc((name, _sport.get()))
+
+    @contextmanager
+    def sport(self, sport: Optional[str]) -> Iterator[None]:
+        """Etiqueta de deporte para todas las etapas dentro del bloque."""
+        token = _sport.set(sport or "none")
+        try:
+            yield
+        finally:
+            _sport.reset(token)
+
+    def gauges(self, prefix: str, documentation: str, fn: Callable[[], Dict[str, Any]]) -> None:
+        """Exporta los valores numéricos de `fn()` como gauges `<namespace>_<prefix>_<clave>`."""
+        self._collectors.append(GaugeCallback(f"{self.namespace}_{prefix}", documentation, fn))
+
+    # ---------- exportación ----------
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._collectors:
+            if isinstance(metric, GaugeCallback):
+                lines.extend(metric.render_block())
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        for metric in self._collectors:
+            metric.reset()
+
+    # ---------- Flask ----------
+    def install(self, app: Any, path: str = "/metrics") -> None:
+        """
+        Mide cada petición de `app` y registra `path` con la exportación.
+        Para respuestas en streaming se mide hasta que empieza el envío.
+        """
+        from flask import g, request
+
+        @app.before_request
+        def _metrics_start() -> None:
+            g._metrics_start = time.perf_counter()
+
+        @app.after_request
+        def _metrics_observe(response: Any) -> Any:
+            start = g.pop("_metrics_start", None)
+            if start is not None:
+                rule = request.url_rule.rule if request.url_rule is not None else "unmatched"
+                self.request_seconds.observe(
+                    (rule, request.method, str(response.status_code)), time.perf_counter() - start
+                )
+            return response
+
+        def metrics_endpoint() -> Any:
+            return app.response_class(self.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+        app.add_url_rule(path, "metrics", metrics_endpoint, methods=["GET"])
@@ -0,0 +1,334 @@
+"""
+Analítica sobre la tabla `predictions` sin escanearla ni parsear JSON.
+
+- Índices en (sport, created_at) y (match_date) para las consultas de
+  predicciones recientes por deporte o por fecha de partido.
+- Los campos de `extra_info` que se consultan (liga, temporada, partido,
+  equipos) se promueven a columnas generadas VIRTUAL de SQLite: no cambian
+  el INSERT, cubren también las filas antiguas y se pueden indexar.
+- `prediction_rollup` guarda los agregados por (mes, deporte, liga, pick).
+  Un trigger AFTER INSERT los actualiza con cada fila que llega (venga del
+  escritor de predicciones, del servidor asyncio o de batch_predict), así
+  que los resúmenes leen unas pocas filas agregadas y nunca recalculan
+  desde cero. rebuild() los reconstruye si hiciera falta.
+
+    python prediction_analytics.py summary --by sport,league,month
+    python prediction_analytics.py rebuild
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from prediction_log import connect
+
+log = logging.getLogger("DataMind")
+
+# Columna generada -> (tipo, rutas JSON en extra_info, la primera que exista)
+PROMOTED_FIELDS = {
+    "league_id": ("INTEGER", ("$.league_id", "$.fixture.league_id")),
+    "league_name": ("TEXT", ("$.league_name", "$.fixture.league_name")),
+    "season": ("INTEGER", ("$.season", "$.fixture.season")),
+    # Partido y equipos: los usa learning_store (agregados por equipo y resultados)
+    "fixture_id": ("INTEGER", ("$.fixture_id", "$.fixture.fixture_id")),
+    "home_id": ("INTEGER", ("$.home_id", "$.fixture.home_id")),
+    "away_id": ("INTEGER", ("$.away_id", "$.fixture.away_id")),
+}
+
+# Dimensiones de summary(): nombre público -> columna del rollup
+DIMENSIONS = {
+    "sport": "sport",
+    "league": "league_id",
+    "month": "month",
+    "pick": "main_pick",
+}
+
+_MONTH = re.compile(r"^\d{4}-\d{2}")
+
+ROLLUP_TRIGGER = "predictions_rollup_v1"
+
+ROLLUP_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS prediction_rollup (
+        month TEXT NOT NULL,
+        sport TEXT NOT NULL,
+        league_id INTEGER NOT NULL,
+        main_pick TEXT NOT NULL,
+        league_name TEXT NOT NULL,
+        predictions INTEGER NOT NULL,
+        with_match_date INTEGER NOT NULL,
+        first_at TEXT NOT NULL,
+        last_at TEXT NOT NULL,
+        PRIMARY KEY (month, sport, league_id, main_pick)
+    ) WITHOUT ROWID
+"""
+
+# Las claves nunca son NULL: en una clave primaria dos NULL no chocan y el
+# UPSERT del trigger crearía una fila nueva por cada inserción
+ROLLUP_TRIGGER_SQL = f"""
+    CREATE TRIGGER IF NOT EXISTS {ROLLUP_TRIGGER} AFTER INSERT ON predictions
+    BEGIN
+        INSERT INTO prediction_rollup (
+            month, sport, league_id, main_pick, league_name,
+            predictions, with_match_date, first_at, last_at
+        )
+        VALUES (
+            coalesce(substr(NEW.created_at, 1, 7), ''),
+            coalesce(NEW.sport, ''),
+            coalesce(NEW.league_id, 0),
+            coalesce(NEW.main_pick, ''),
+            coalesce(NEW.league_name, ''),
+            1,
+            coalesce(NEW.match_date, '') != '',
+            coalesce(NEW.created_at, ''),
+            coalesce(NEW.created_at, '')
+        )
+        ON CONFLICT (month, sport, league_id, main_pick) DO UPDATE SET
+            league_name = max(league_name, excluded.league_name),
+            predictions = predictions + 1,
+            with_match_date = with_match_date + excluded.with_match_date,
+            first_at = min(first_at, excluded.first_at),
+            last_at = max(last_at, excluded.last_at);
+    END
+"""
+
+ROLLUP_REBUILD_SQL = """
+    INSERT INTO prediction_rollup (
+        month, sport, league_id, main_pick, league_name,
+        predictions, with_match_date, first_at, last_at
+    )
+    SELECT
+        coalesce(substr(created_at, 1, 7), ''),
+        coalesce(sport, ''),
+        coalesce(league_id, 0),
+        coalesce(main_pick, ''),
+        max(coalesce(league_name, '')),
+        count(*),
+        sum(coalesce(match_date, '') != ''),
+        min(coalesce(created_at, '')),
+        max(coalesce(created_at, ''))
+    FROM predictions
+    GROUP BY 1, 2, 3, 4
+"""
+
+RECENT_COLUMNS = (
+    "id", "created_at", "sport", "raw_query", "match_date", "main_pick",
+    "league_id", "league_name", "season",
+)
+
+
+def _generated_sql(column: str) -> str:
+    kind, paths = PROMOTED_FIELDS[column]
+    extracts = ", ".join(f"json_extract(extra_info, '{path}')" for path in paths)
+    # instr: sin la clave en el texto ni se parsea el JSON (SQLite < 3.45 no
+    # cachea el parseo y el trigger lee varias columnas por fila).
+    # json_valid: un extra_info que no sea JSON da NULL en vez de romper la lectura
+    keys = " OR ".join(sorted({f"instr(extra_info, '\"{p.rsplit('.', 1)[-1]}\"')" for p in paths}))
+    return (
+        f"ALTER TABLE predictions ADD COLUMN {column} {kind} GENERATED ALWAYS AS "
+        f"(CASE WHEN ({keys}) AND json_valid(extra_info) THEN coalesce({extracts}) END) VIRTUAL"
+    )
+
+
+# ==========================================
+#  ESQUEMA
+# ==========================================
+def migrate(db_path: str) -> None:
+    """
+    Índices, columnas generadas, tabla de agregados y trigger. Idempotente
+    y segura entre workers (transacción IMMEDIATE). La primera vez rellena
+    los agregados con las filas que ya hubiera.
+    """
+    conn = connect(db_path)
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(predictions)")}
+            if not columns:
+                raise ValueError(f"{db_path} no tiene tabla predictions (se crea con datamind_server.init_db)")
+            for column in PROMOTED_FIELDS:
+                if column not in columns:
+                    conn.execute(_generated_sql(column))
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_predictions_sport_created ON predictions (sport, created_at)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_match_date ON predictions (match_date)")
+            conn.execute(ROLLUP_TABLE_SQL)
+
+            has_trigger = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (ROLLUP_TRIGGER,)
+            ).fetchone()
+            if not has_trigger:
+                conn.execute("DELETE FROM prediction_rollup")
+                conn.execute(ROLLUP_REBUILD_SQL)
+                conn.execute(ROLLUP_TRIGGER_SQL)
+                log.info("Agregados de predicciones creados a partir de la tabla existente")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+def _month(value: Optional[str], name: str) -> Optional[str]:
+    if not value:
+        return None
+    if not _MONTH.match(value):
+        raise ValueError(f"'{name}' debe ser AAAA-MM o AAAA-MM-DD")
+    return value[:7]
+
+
+# ==========================================
+#  CONSULTAS
+# ==========================================
+class PredictionAnalytics:
+    """Consultas sobre los agregados y los índices; una conexión por proceso."""
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            self._conn = connect(self.db_path)
+            self._conn_pid = pid
+        return self._conn
+
+    def summary(
+        self,
+        by: Sequence[str] = ("sport",),
+        sport: Optional[str] = None,
+        league_id: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Predicciones agrupadas por `by` (sport, league, month, pick), leídas
+        de los agregados. since/until son meses AAAA-MM (inclusive).
+        """
+        by = list(dict.fromkeys(by))
+        unknown = [d for d in by if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Dimensiones no válidas: {', '.join(unknown)} (usa {', '.join(DIMENSIONS)})")
+
+        where, params = [], []
+        if sport:
+            where.append("sport = ?")
+            params.append(sport)
+        if league_id is not None:
+            where.append("league_id = ?")
+            params.append(league_id)
+        since, until = _month(since, "since"), _month(until, "until")
+        if since:
+            where.append("month >= ?")
+            params.append(since)
+        if until:
+            where.append("month <= ?")
+            params.append(until)
+
+        keys = [DIMENSIONS[d] for d in by]
+        select = keys + (["max(league_name)"] if "league" in by else [])
+        sql = (
+            f"SELECT {', '.join(select + ['sum(predictions)', 'sum(with_match_date)', 'min(first_at)', 'max(last_at)'])} "
+            "FROM prediction_rollup"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + (f" GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}" if keys else "")
+        )
+        with self._lock:
+            rows = self._db().execute(sql, params).fetchall()
+
+        out = []
+        total = 0
+        for row in rows:
+            if row[-4] is None:  # sin filas y sin agrupar
+                continue
+            item: Dict[str, Any] = {}
+            for dim, value in zip(by, row):
+                # 0 / '' son "sin dato" en las claves del rollup
+                item[dim] = value or None
+            if "league" in by:
+                item["league_name"] = row[len(keys)] or None
+            item["predictions"], item["with_match_date"], item["first_at"], item["last_at"] = row[-4:]
+            total += item["predictions"]
+            out.append(item)
+        return {"by": by, "total": total, "rows": out}
+
+    def recent(
+        self,
+        sport: Optional[str] = None,
+        match_date: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Últimas predicciones de un deporte (índice sport, created_at) o de
+        una fecha de partido (índice match_date), sin leer extra_info.
+        """
+        where, params = [], []
+        if match_date:
+            where.append("match_date = ?")
+            params.append(match_date)
+        if sport:
+            where.append("sport = ?")
+            params.append(sport)
+        order = "created_at DESC" if sport and not match_date else "id DESC"
+        sql = (
+            f"SELECT {', '.join(RECENT_COLUMNS)} FROM predictions"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + f" ORDER BY {order} LIMIT ?"
+        )
+        with self._lock:
+            rows = self._db().execute(sql, (*params, limit)).fetchall()
+        return [dict(zip(RECENT_COLUMNS, row)) for row in rows]
+
+    def rebuild(self) -> int:
+        """Recalcula los agregados desde la tabla completa (reparación)."""
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute("DELETE FROM prediction_rollup")
+                conn.execute(ROLLUP_REBUILD_SQL)
+            return conn.execute("SELECT count(*) FROM prediction_rollup").fetchone()[0]
+
+
+# ==========================================
+#  CLI
+# ==========================================
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.getenv("DATAMIND_DB_PATH", "datamind_memory.db"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_summary = sub.add_parser("summary", help="predicciones agregadas")
+    p_summary.add_argument("--by", default="sport")
+    p_summary.add_argument("--sport")
+    p_summary.add_argument("--since")
+    p_summary.add_argument("--until")
+    sub.add_parser("rebuild", help="recalcular los agregados desde cero")
+    args = parser.parse_args(argv)
+
+    migrate(args.db)
+    analytics = PredictionAnalytics(args.db)
+    if args.command == "rebuild":
+        print(f"{analytics.rebuild()} filas agregadas")
+        return 0
+    result = analytics.summary(
+        by=[d.strip() for d in args.by.split(",") if d.strip()],
+        sport=args.sport,
+        since=args.since,
+        until=args.until,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
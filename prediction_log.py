@@ -0,0 +1,262 @@
+import os
+import queue
+import sqlite3
+import logging
+import threading
+import time
+import atexit
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger("DataMind")
+
+INSERT_SQL = """
+    INSERT INTO predictions (created_at, sport, raw_query, match_date, main_pick, extra_info)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+Row = Tuple[str, str, str, str, str, str]
+
+# Líneas de entrada de cada lote ya guardadas (batch_predict): se anotan en
+# la misma transacción que sus filas, así que reanudar no inserta dos veces
+BATCH_LINES_SQL = """
+    CREATE TABLE IF NOT EXISTS batch_lines (
+        batch_id TEXT NOT NULL,
+        line INTEGER NOT NULL,
+        PRIMARY KEY (batch_id, line)
+    ) WITHOUT ROWID
+"""
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def write_rows(
+    db_path: str, rows: List[Row], batch_id: Optional[str] = None, lines: Optional[List[int]] = None
+) -> int:
+    """
+    Inserta muchas filas en una sola transacción (procesos por lotes).
+    Con `batch_id`, `lines` da el número de línea de cada fila: las líneas
+    ya anotadas en batch_lines para ese lote se saltan. Devuelve las filas
+    insertadas.
+    """
+    if not rows:
+        return 0
+    conn = connect(db_path)
+    try:
+        if batch_id is not None:
+            conn.execute(BATCH_LINES_SQL)
+        with conn:
+            if batch_id is not None:
+                rows = [
+                    row
+                    for line, row in zip(lines, rows)
+                    if conn.execute(
+                        "INSERT OR IGNORE INTO batch_lines (batch_id, line) VALUES (?, ?)", (batch_id, line)
+                    ).rowcount
+                ]
+            conn.executemany(INSERT_SQL, rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+# ==========================================
+#  ESCRITOR DE PREDICCIONES EN SEGUNDO PLANO
+# ==========================================
+class PredictionLogWriter:
+    """
+    Una conexión SQLite (WAL) por proceso y un hilo que vacía una cola
+    acotada en transacciones con executemany.
+    Se vacía al llegar a `batch_size` filas, cada `flush_interval` segundos
+    y al apagar el proceso.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_queue: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        put_timeout: float = 0.05,
+    ) -> None:
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_queue = max_queue
+
+        self._queue: "queue.Queue[Optional[Row]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        # Contadores de presión
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self.flush_seconds_total = 0.0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.max_queue_depth = 0
+
+    # ---------- ciclo de vida ----------
+    def _ensure_started(self) -> None:
+        # Tras un fork (gunicorn --preload) el hilo del padre no existe en el hijo
+        pid = os.getpid()
+        if self._pid == pid and self._thread is not None:
+            return
+        with self._lock:
+            if self._pid == pid and self._thread is not None:
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="prediction-log-writer", daemon=True
+            )
+            self._pid = pid
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Vacía lo pendiente y detiene el hilo escritor."""
+        if self._thread is None or self._pid != os.getpid() or self._stopped:
+            return
+        self._stopped = True
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            log.error("Cola de predicciones llena al apagar; se pierden filas pendientes")
+            return
+        self._thread.join(timeout)
+
+    # ---------- API pública ----------
+    def submit(self, row: Row, block: bool = True) -> bool:
+        """
+        Encola una fila. Devuelve False si la cola sigue llena o el escritor
+        ya se cerró (se descarta).
+        Con block=False no espera nunca (para el bucle asyncio).
+        """
+        self._ensure_started()
+        if self._stopped:
+            # Tras close() nadie vacía la cola
+            self.dropped += 1
+            log.warning("Escritor de predicciones cerrado; predicción descartada")
+            return False
+        try:
+            if block:
+                self._queue.put(row, timeout=self.put_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            log.warning("Cola de predicciones llena; predicción descartada")
+            return False
+        self.enqueued += 1
+        depth = self._queue.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        flushes = self.flushes
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self.max_queue,
+            "max_queue_depth": self.max_queue_depth,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": flushes,
+            "flush_seconds_total": round(self.flush_seconds_total, 6),
+            "flush_seconds_avg": round(self.flush_seconds_total / flushes, 6) if flushes else 0.0,
+            "flush_seconds_last": round(self.last_flush_seconds, 6),
+            "flush_seconds_max": round(self.max_flush_seconds, 6),
+        }
+
+    # ---------- hilo escritor ----------
+    def _connect(self) -> sqlite3.Connection:
+        return connect(self.db_path)
+
+    def _flush(self, conn: sqlite3.Connection, batch: List[Row]) -> None:
+        start = time.perf_counter()
+        try:
+            with conn:
+                conn.executemany(INSERT_SQL, batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            log.error(f"Error guardando {len(batch)} predicciones en DB: {e}")
+        elapsed = time.perf_counter() - start
+        self.flushes += 1
+        self.flush_seconds_total += elapsed
+        self.last_flush_seconds = elapsed
+        if elapsed > self.max_flush_seconds:
+            self.max_flush_seconds = elapsed
+
+    def _run(self) -> None:
+        q = self._queue
+        conn = self._connect()
+        batch: List[Row] = []
+        deadline = None
+        stopping = False
+
+        try:
+            while not stopping:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = q.get(timeout=timeout)
+                except queue.Empty:
+                    item = ...
+
+                if item is None:
+                    stopping = True
+                elif item is not ...:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+
+                # Drenar lo que ya esté en cola sin bloquear
+                while len(batch) < self.batch_size and not stopping:
+                    try:
+                        item = q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stopping = True
+                    else:
+                        batch.append(item)
+
+                due = deadline is not None and time.monotonic() >= deadline
+                if batch and (stopping or due or len(batch) >= self.batch_size):
+                    self._flush(conn, batch)
+                    batch = []
+                    deadline = None
+        finally:
+            if batch:
+                self._flush(conn, batch)
+            conn.close()
+
+
+_writer: Optional[PredictionLogWriter] = None
+
+
+def get_writer(db_path: str) -> PredictionLogWriter:
+    """Escritor compartido del proceso (se crea la primera vez)."""
+    global _writer
+    if _writer is None:
+        _writer = PredictionLogWriter(
+            db_path,
+            max_queue=int(os.getenv("PREDICTION_LOG_QUEUE", "10000")),
+            batch_size=int(os.getenv("PREDICTION_LOG_BATCH", "200")),
+            flush_interval=float(os.getenv("PREDICTION_LOG_FLUSH_SECONDS", "0.5")),
+        )
+        atexit.register(_writer.close)
+    return _writer
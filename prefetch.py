@@ -0,0 +1,250 @@
+"""
+Precarga de partidos próximos de API-FOOTBALL.
+
+En cada pasada (tarea del planificador de fondo) se piden los próximos
+fixtures de las ligas configuradas, una llamada por liga y temporada, y con
+ellos se dejan en la caché, antes de que nadie los pida:
+- los IDs de equipo (y sus nombres en el índice local de equipos)
+- el próximo enfrentamiento directo de cada pareja, tal como lo guarda
+  get_h2h_fixture, sin gastar una llamada por pareja
+- las estadísticas de temporada de cada equipo, sólo las que faltan o
+  caducan antes de la pasada siguiente
+
+Así /predict de un partido precargado no toca la red.
+
+Las llamadas van con prioridad PRIORITY_PREFETCH (las de /predict pasan
+antes en la cola de fichas). Cada pasada tiene además un máximo de
+llamadas, no deja el cubo por debajo de `token_reserve` fichas y se corta
+en cuanto el proveedor no está disponible; lo pendiente queda para la
+siguiente. Las estadísticas se piden con `concurrency` hilos como mucho.
+"""
+
+import time
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+import upstream
+from upstream import UpstreamScheduler, UpstreamUnavailable
+
+log = logging.getLogger("DataMind")
+
+
+def parse_targets(spec: str) -> List[Tuple[int, int]]:
+    """'262:2025, 39:2025' → [(262, 2025), (39, 2025)] (liga:temporada)."""
+    targets = []
+    for item in spec.replace(";", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        league, _, season = item.partition(":")
+        try:
+            targets.append((int(league), int(season)))
+        except ValueError:
+            log.warning(f"PREFETCH_LEAGUES: '{item}' no es liga:temporada; se ignora")
+    return targets
+
+
+class FixturePrefetcher:
+    def __init__(
+        self,
+        client: UpstreamScheduler,
+        targets: List[Tuple[int, int]],
+        summarize: Callable[[Dict[str, Any]], Dict[str, Any]],
+        team_id: Callable,
+        h2h_fixture: Callable,
+        team_statistics: Callable,
+        team_index: Any = None,
+        fixtures_per_league: int = 20,
+        concurrency: int = 2,
+        max_calls: int = 40,
+        token_reserve: float = 2,
+        refresh_within: float = 3600,
+        timezone: str = "UTC",
+    ) -> None:
+        """
+        `team_id`, `h2h_fixture` y `team_statistics` son los helpers
+        decorados con @cached (se usan su .prime, .ttl_left y .uncached);
+        `summarize` convierte un fixture de API-FOOTBALL en el dict que
+        guarda get_h2h_fixture.
+        """
+        self.client = client
+        self.targets = targets
+        self.summarize = summarize
+        self.team_id = team_id
+        self.h2h_fixture = h2h_fixture
+        self.team_statistics = team_statistics
+        self.team_index = team_index
+        self.fixtures_per_league = fixtures_per_league
+        self.concurrency = max(1, concurrency)
+        self.max_calls = max_calls
+        self.token_reserve = token_reserve
+        self.refresh_within = refresh_within
+        self.timezone = timezone
+
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._halted = False
+
+        self.runs = 0
+        self.calls = 0
+        self.fixtures = 0
+        self.teams = 0
+        self.h2h = 0
+        self.statistics = 0
+        self.statistics_fresh = 0
+        self.deferred = 0
+        self.errors = 0
+        self.last_run: Dict[str, Any] = {}
+
+    # ---------- cuota ----------
+    def _take(self) -> bool:
+        """Reserva una llamada de la pasada si queda presupuesto y cuota."""
+        with self._lock:
+            if self._halted or self._calls >= self.max_calls:
+                return False
+            if self.client.bucket.stats()["tokens"] < self.token_reserve + 1:
+                self._halted = True
+                return False
+            self._calls += 1
+            return True
+
+    def _halt(self, reason: Exception) -> None:
+        with self._lock:
+            if not self._halted:
+                log.info(f"Precarga aplazada: {reason}")
+            self._halted = True
+
+    # ---------- pasos ----------
+    def _upcoming(self, league: int, season: int) -> List[Dict[str, Any]]:
+        data = self.client.get_json(
+            "/fixtures",
+            {"league": league, "season": season, "next": self.fixtures_per_league, "timezone": self.timezone},
+            timeout=15,
+        )
+        fixtures = []
+        for fx in data.get("response") or []:
+            try:
+                fixtures.append(self.summarize(fx))
+            except (KeyError, TypeError, AttributeError):
+                continue
+        return fixtures
+
+    def _prime(self, fixtures: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """IDs de equipo y enfrentamientos directos; sin llamadas a la red."""
+        teams: Dict[int, str] = {}
+        pairs: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        for fx in fixtures:
+            home_id, away_id = fx.get("home_id"), fx.get("away_id")
+            if not home_id or not away_id:
+                continue
+            teams.setdefault(home_id, fx.get("home_name") or "")
+            teams.setdefault(away_id, fx.get("away_name") or "")
+            # La lista viene por fecha: la primera aparición es el próximo partido
+            pairs.setdefault((min(home_id, away_id), max(home_id, away_id)), fx)
+
+        for team_id, name in teams.items():
+            if not name:
+                continue
+            if self.team_index is not None and self.team_index.resolve(name) != team_id:
+                self.team_index.add(name, team_id, canonical=name, source="prefetch")
+            self.team_id.prime(team_id, name)
+        for pair, fx in pairs.items():
+            self.h2h_fixture.prime(fx, *pair)
+        return len(teams), len(pairs)
+
+    def _warm_statistics(self, key: Tuple[int, int, int]) -> bool:
+        if not self._take():
+            return False
+        try:
+            value = self.team_statistics.uncached(*key)
+        except UpstreamUnavailable as e:
+            self._halt(e)
+            return False
+        if not value:
+            return False
+        self.team_statistics.prime(value, *key)
+        return True
+
+    # ---------- pasada ----------
+    def run(self) -> Dict[str, Any]:
+        """Una pasada completa; devuelve su resumen."""
+        start = time.perf_counter()
+        with self._lock:
+            self._calls = 0
+            self._halted = False
+        fixtures: List[Dict[str, Any]] = []
+        errors = 0
+
+        with upstream.priority(upstream.PRIORITY_PREFETCH):
+            for league, season in self.targets:
+                if not self._take():
+                    break
+                try:
+                    fixtures.extend(self._upcoming(league, season))
+                except UpstreamUnavailable as e:
+                    self._halt(e)
+                    break
+                except Exception as e:
+                    errors += 1
+                    log.error(f"Error precargando fixtures de la liga {league}/{season}: {e}")
+
+            teams, pairs = self._prime(fixtures)
+
+            keys = list(dict.fromkeys(
+                (fx[side], fx.get("league_id"), fx.get("season"))
+                for fx in fixtures
+                for side in ("home_id", "away_id")
+                if fx.get(side)
+            ))
+            due = [k for k in keys if (self.team_statistics.ttl_left(*k) or 0) < self.refresh_within]
+            warmed = 0
+            if due:
+                with ThreadPoolExecutor(self.concurrency, thread_name_prefix="datamind-prefetch") as pool:
+                    # Cada hilo hereda la prioridad de precarga
+                    results = pool.map(lambda k: contextvars.copy_context().run(self._warm_statistics, k), due)
+                    warmed = sum(1 for ok in results if ok)
+
+        summary = {
+            "fixtures": len(fixtures),
+            "teams": teams,
+            "h2h": pairs,
+            "statistics": warmed,
+            "statistics_fresh": len(keys) - len(due),
+            "statistics_pending": len(due) - warmed,
+            "calls": self._calls,
+            "deferred": int(self._halted),
+            "errors": errors,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        self.runs += 1
+        self.calls += summary["calls"]
+        self.fixtures += summary["fixtures"]
+        self.teams += teams
+        self.h2h += pairs
+        self.statistics += warmed
+        self.statistics_fresh += summary["statistics_fresh"]
+        self.deferred += summary["deferred"]
+        self.errors += errors
+        self.last_run = summary
+        log.info(
+            f"Precarga: {len(fixtures)} partidos, {pairs} enfrentamientos, "
+            f"{warmed}/{len(due)} estadísticas ({summary['calls']} llamadas)"
+        )
+        return summary
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "targets": len(self.targets),
+            "runs": self.runs,
+            "calls": self.calls,
+            "fixtures": self.fixtures,
+            "teams": self.teams,
+            "h2h": self.h2h,
+            "statistics": self.statistics,
+            "statistics_fresh": self.statistics_fresh,
+            "deferred": self.deferred,
+            "errors": self.errors,
+        }
@@ -0,0 +1,104 @@
+import re
+import sys
+import json
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+
+# ==========================================
+#  PARSER DE CONSULTAS (DEPORTE / EQUIPOS / FECHA)
+# ==========================================
+# Palabras clave por deporte, en orden de prioridad (igual que detect_sport)
+SPORT_KEYWORDS = (
+    ("basket", ("nba", "canastas", "rebotes", "triples", "puntos")),
+    ("beisbol", ("mlb", "home run", "bases llenas", "pitcheo", "innings")),
+    ("nfl", ("nfl", "touchdown", "yardas", "quarterback")),
+)
+DEFAULT_SPORT = "futbol"
+
+DATE_PATTERNS = (
+    r"\d{1,2}/\d{1,2}/\d{4}",
+    r"\d{1,2}-\d{1,2}-\d{4}",
+    r"\d{1,2}\.\d{1,2}\.\d{4}",
+)
+NO_DATE = "Fecha no especificada"
+
+TEAM_SEPARATORS = (" vs ", " v ", " - ", " contra ", " vs. ")
+
+# Las consultas son cortas: recorrer unas tuplas con `in` (búsqueda en C)
+# sale más barato que una sola pasada con alternancias o un autómata
+# conducido desde Python. Ver benchmarks/bench_query_parser.py.
+_DATE_RES = tuple(re.compile(f"({p})") for p in DATE_PATTERNS)
+
+
+class ParsedQuery(NamedTuple):
+    sport: str
+    team1: str
+    team2: str
+    match_date: str
+
+
+def _sport_from_lowered(lowered: str) -> str:
+    for sport, keywords in SPORT_KEYWORDS:
+        for kw in keywords:
+            if kw in lowered:
+                return sport
+    return DEFAULT_SPORT
+
+
+def _teams_from_lowered(text: str, lowered: str) -> Tuple[str, str]:
+    for sep in TEAM_SEPARATORS:
+        if sep in lowered:
+            parts = lowered.split(sep, 2)
+            return parts[0].strip().title(), parts[1].strip().title()
+    return text.title(), ""
+
+
+def detect_sport(text: str) -> str:
+    return _sport_from_lowered(text.lower())
+
+
+def extract_match_date(text: str) -> str:
+    for pattern in _DATE_RES:
+        m = pattern.search(text)
+        if m:
+            return m.group(1)
+    return NO_DATE
+
+
+def split_teams(text: str) -> Tuple[str, str]:
+    return _teams_from_lowered(text, text.lower())
+
+
+def parse_query(text: str) -> ParsedQuery:
+    """Deporte, equipos y fecha de una consulta (bajando a minúsculas una sola vez)."""
+    lowered = text.lower()
+    team1, team2 = _teams_from_lowered(text, lowered)
+    return ParsedQuery(_sport_from_lowered(lowered), team1, team2, extract_match_date(text))
+
+
+def parse_many(texts: Iterable[str]) -> Iterator[ParsedQuery]:
+    """Modo por lotes: procesa un iterable (p. ej. un log) sin cargarlo entero."""
+    for text in texts:
+        yield parse_query(text)
+
+
+def _iter_queries(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            data = json.loads(line)
+            yield data.get("query") or data.get("text") or ""
+        else:
+            yield line
+
+
+if __name__ == "__main__":
+    # Uso: python query_parser.py consultas.jsonl > parseadas.jsonl
+    # Acepta líneas JSON {"query": ...} o texto plano; "-" lee de stdin.
+    source = sys.stdin if len(sys.argv) < 2 or sys.argv[1] == "-" else open(sys.argv[1], encoding="utf-8")
+    with source:
+        for query in _iter_queries(source):
+            parsed = parse_query(query)
+            sys.stdout.write(json.dumps({"query": query, **parsed._asdict()}, ensure_ascii=False) + "\n")
@@ -0,0 +1,252 @@
+"""
+Planificador de tareas periódicas en segundo plano (KeepAlive, purga de
+cachés, recarga del índice de equipos, precarga...).
+
+Un solo hilo por proceso, sea cual sea el número de tareas: espera en una
+Condition hasta la siguiente tarea vencida (montículo por hora de
+ejecución) y las ejecuta de una en una, así que el trabajo de fondo nunca
+ocupa más de un núcleo ni multiplica hilos. Cada intervalo lleva jitter
+para que varios procesos no coincidan. Las tareas pertenecen al proceso
+que las registra: tras un fork el hijo empieza sin tareas ni hilo.
+Al parar (stop, atexit o hooks de gunicorn) se ejecutan los hooks de
+apagado registrados con on_shutdown; esos sí se heredan, porque no
+dependen del proceso (p. ej. vaciar el escritor de predicciones, que
+registra el módulo al importarse, antes del fork de los workers).
+"""
+
+import os
+import time
+import fcntl
+import heapq
+import random
+import atexit
+import logging
+import itertools
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("DataMind")
+
+
+class Job:
+    """Tarea periódica y sus métricas de ejecución."""
+
+    def __init__(self, name: str, fn: Callable[[], Any], interval: float, jitter: float) -> None:
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.jitter = jitter
+
+        self.runs = 0
+        self.failures = 0
+        self.overruns = 0
+        self.seconds_total = 0.0
+        self.seconds_last = 0.0
+        self.seconds_max = 0.0
+        self.last_run_at = 0.0
+        self.next_run_at = 0.0
+
+    def delay(self) -> float:
+        """Próximo intervalo con jitter (± jitter * interval)."""
+        return max(0.0, self.interval * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "overruns": self.overruns,
+            "seconds_total": round(self.seconds_total, 6),
+            "seconds_avg": round(self.seconds_total / self.runs, 6) if self.runs else 0.0,
+            "seconds_last": round(self.seconds_last, 6),
+            "seconds_max": round(self.seconds_max, 6),
+            "last_run_at": round(self.last_run_at, 3),
+            "next_run_in": round(max(0.0, self.next_run_at - time.monotonic()), 3) if self.next_run_at else None,
+        }
+
+
+class ProcessLock:
+    """
+    Candado entre procesos sobre un archivo (flock sin esperar). Quien lo
+    obtiene lo conserva mientras vive; el sistema lo suelta al terminar el
+    proceso, también si muere de golpe. Un hijo tras fork no lo cuenta como
+    suyo.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        if self._fd is not None:
+            # El padre sigue teniendo el suyo abierto: el candado no se suelta
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+
+class Scheduler:
+    def __init__(self, name: str = "datamind-scheduler", jitter: float = 0.1) -> None:
+        self.name = name
+        self.jitter = jitter
+
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._shutdown_hooks: List[Callable[[], Any]] = []
+        self._atexit = False
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # Las tareas y el hilo del padre no son de este proceso, y un lock
+        # nuevo por si el hilo del padre tenía el suyo tomado. Los hooks de
+        # apagado se conservan
+        self._jobs = {}
+        self._heap = []
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._shutdown_hooks = list(self._shutdown_hooks)
+
+    # ---------- registro ----------
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: float,
+        jitter: Optional[float] = None,
+        first_run: Optional[float] = None,
+    ) -> None:
+        """
+        Ejecuta `fn` cada `interval` segundos. `first_run`: segundos hasta
+        la primera ejecución (por defecto un intervalo con jitter).
+        Registrar otra vez el mismo nombre sustituye la tarea.
+        """
+        with self._cond:
+            job = Job(name, fn, float(interval), self.jitter if jitter is None else jitter)
+            self._jobs[name] = job
+            job.next_run_at = time.monotonic() + (job.delay() if first_run is None else first_run)
+            heapq.heappush(self._heap, (job.next_run_at, next(self._seq), name))
+            self._cond.notify_all()
+
+    def remove(self, name: str) -> None:
+        with self._cond:
+            # La entrada del montículo se descarta al salir
+            self._jobs.pop(name, None)
+
+    def on_shutdown(self, fn: Callable[[], Any]) -> None:
+        """Función a ejecutar una vez al parar el planificador."""
+        with self._cond:
+            self._shutdown_hooks.append(fn)
+
+    # ---------- ciclo de vida ----------
+    def start(self) -> None:
+        """Arranca el hilo (una vez por proceso)."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+            if not self._atexit:
+                atexit.register(self.stop)
+                self._atexit = True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Para el hilo (la tarea en curso termina) y ejecuta los hooks de apagado."""
+        with self._cond:
+            if self._stopping:
+                return
+            self._stopping = True
+            thread = self._thread
+            hooks, self._shutdown_hooks = self._shutdown_hooks, []
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                log.error(f"Error en hook de apagado {getattr(hook, '__name__', hook)}: {e}")
+
+    # ---------- hilo ----------
+    def _next_due(self) -> Tuple[Optional[Job], float]:
+        """(tarea vencida, 0) o (None, segundos de espera). Con el lock tomado."""
+        while self._heap:
+            due_at, _, name = self._heap[0]
+            job = self._jobs.get(name)
+            if job is None or job.next_run_at != due_at:
+                heapq.heappop(self._heap)  # eliminada o reprogramada
+                continue
+            wait = due_at - time.monotonic()
+            if wait > 0:
+                return None, wait
+            heapq.heappop(self._heap)
+            return job, 0.0
+        return None, 60.0
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                job, wait = self._next_due()
+                while job is None and not self._stopping:
+                    self._cond.wait(wait)
+                    job, wait = self._next_due()
+                if self._stopping:
+                    return
+            self._execute(job)
+            with self._cond:
+                if self._jobs.get(job.name) is job:
+                    job.next_run_at = time.monotonic() + job.delay()
+                    heapq.heappush(self._heap, (job.next_run_at, next(self._seq), job.name))
+
+    def _execute(self, job: Job) -> None:
+        start = time.perf_counter()
+        job.last_run_at = time.time()
+        try:
+            job.fn()
+        except Exception as e:
+            job.failures += 1
+            log.warning(f"Tarea de fondo '{job.name}' falló: {e}")
+        elapsed = time.perf_counter() - start
+        job.runs += 1
+        job.seconds_total += elapsed
+        job.seconds_last = elapsed
+        if elapsed > job.seconds_max:
+            job.seconds_max = elapsed
+        if elapsed > job.interval:
+            job.overruns += 1
+
+    # ---------- métricas ----------
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            jobs = dict(self._jobs)
+            running = self._thread is not None and self._thread.is_alive()
+        return {"running": running, "jobs": {name: job.stats() for name, job in jobs.items()}}
+
+    def gauges(self) -> Dict[str, Any]:
+        """Métricas planas por tarea (<tarea>_<métrica>) para /metrics."""
+        out: Dict[str, Any] = {}
+        for name, job in self.stats()["jobs"].items():
+            for key in ("runs", "failures", "overruns", "seconds_total", "seconds_last", "seconds_max"):
+                out[f"{name}_{key}"] = job[key]
+        return out
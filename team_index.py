@@ -0,0 +1,315 @@
+"""
+Índice local de equipos (nombre/alias → ID de API-FOOTBALL).
+
+get_team_id lo consulta antes de ir a /teams?search=: coincidencia exacta
+sobre el nombre normalizado y, si no, aproximada por trigramas para
+absorber faltas de ortografía. La búsqueda por red queda como respaldo y
+lo que resuelve se añade aquí automáticamente.
+
+    python team_index.py import equipos.json          # [{"id", "name", "aliases"}] o respuesta de /teams
+    python team_index.py import-league 262 2025       # equipos de una liga vía API-FOOTBALL
+    python team_index.py lookup "Chivas Guadalajra"
+"""
+
+import os
+import re
+import sys
+import json
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger("DataMind")
+
+# Palabras que no distinguen equipos ("Club América" == "América")
+STOPWORDS = frozenset({"fc", "cf", "club", "cd", "sc", "ac", "afc", "fk", "sk", "de", "the", "futbol", "football"})
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(name: str) -> str:
+    """Minúsculas, sin acentos ni signos y sin palabras genéricas."""
+    text = unicodedata.normalize("NFKD", name.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    words = [w for w in _NON_ALNUM.split(text) if w]
+    kept = [w for w in words if w not in STOPWORDS]
+    return " ".join(kept or words)
+
+
+def trigrams(norm: str) -> frozenset:
+    padded = f"  {norm} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+# ==========================================
+#  ÍNDICE
+# ==========================================
+class TeamIndex:
+    """
+    Alias en SQLite (persisten entre reinicios y se comparten entre
+    workers) y copia en memoria: dict para la coincidencia exacta e índice
+    invertido de trigramas para la aproximada. Las tres estructuras van en
+    una sola tupla (_index): reload() las construye aparte y las publica de
+    una vez, y lookup() lee la tupla una vez, sin lock. Con lazy=True la tabla se
+    carga en el primer uso y no al construir el índice. refresh() recarga
+    sólo si la tabla cambió (alias que han añadido otros procesos).
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        threshold: float = 0.6,
+        margin: float = 0.1,
+        lazy: bool = False,
+    ) -> None:
+        self.db_path = db_path
+        self.threshold = threshold
+        self.margin = margin
+
+        # (exacto: alias → (team_id, nombre, posición), alias: [(alias, trigramas, team_id)],
+        #  trigrama → posiciones)
+        self._index: Tuple[Dict[str, Tuple[int, str, int]], List[Tuple[str, frozenset, int]], Dict[str, List[int]]] = (
+            {}, [], defaultdict(list)
+        )
+        self._lock = threading.Lock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._marker: Optional[Tuple[int, Optional[str]]] = None
+
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+
+        self._loaded = not db_path
+        if db_path and not lazy:
+            self.reload()
+
+    # ---------- SQLite ----------
+    def _db(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if self._conn is None or self._conn_pid != pid:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS team_index (
+                    alias TEXT PRIMARY KEY,
+                    team_id INTEGER NOT NULL,
+                    name TEXT,
+                    source TEXT,
+                    updated_at TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_team_index_updated_at ON team_index (updated_at)")
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = pid
+        return self._conn
+
+    def _table_marker(self) -> Tuple[Optional[int], Optional[str]]:
+        # Toda escritura (INSERT OR REPLACE) da a la fila un rowid nuevo o
+        # reutiliza el último con un updated_at mayor. Dos búsquedas en
+        # índice, sin recorrer la tabla: se puede llamar en cada fallo.
+        return tuple(self._db().execute(
+            "SELECT (SELECT max(rowid) FROM team_index), (SELECT max(updated_at) FROM team_index)"
+        ).fetchone())
+
+    def reload(self) -> int:
+        """Vuelve a cargar en memoria todos los alias de la tabla."""
+        with self._lock:
+            self._marker = self._table_marker()
+            rows = self._db().execute("SELECT alias, team_id, name FROM team_index").fetchall()
+            index = ({}, [], defaultdict(list))
+            for alias, team_id, name in rows:
+                self._add_memory(index, alias, team_id, name or alias)
+            self._index = index
+            self._loaded = True
+        return len(rows)
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+
+    def refresh(self) -> bool:
+        """Recarga si la tabla cambió desde la última carga; True si recargó."""
+        if not self.db_path:
+            return False
+        with self._lock:
+            if self._loaded and self._table_marker() == self._marker:
+                return False
+        self.reload()
+        return True
+
+    # ---------- memoria ----------
+    @staticmethod
+    def _add_memory(index: Tuple, norm: str, team_id: int, name: str) -> None:
+        # Sólo añade o sustituye elementos: una búsqueda en curso sobre el
+        # mismo índice nunca ve un alias sin su entrada exacta
+        exact, aliases, postings = index
+        previous = exact.get(norm)
+        if previous is not None:
+            # Alias ya indexado: sólo cambia el destino
+            pos = previous[2]
+            exact[norm] = (team_id, name, pos)
+            aliases[pos] = (norm, aliases[pos][1], team_id)
+            return
+        grams = trigrams(norm)
+        pos = len(aliases)
+        exact[norm] = (team_id, name, pos)
+        aliases.append((norm, grams, team_id))
+        for g in grams:
+            postings[g].append(pos)
+
+    # ---------- API pública ----------
+    def add(self, name: str, team_id: int, canonical: Optional[str] = None, source: str = "api") -> None:
+        """Registra `name` (y el nombre canónico, si se da) como alias de `team_id`."""
+        aliases = {normalize(n) for n in (name, canonical) if n}
+        aliases.discard("")
+        if not aliases:
+            return
+        self.ensure_loaded()
+        display = canonical or name
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            for norm in aliases:
+                self._add_memory(self._index, norm, team_id, display)
+            if self.db_path:
+                try:
+                    conn = self._db()
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO team_index (alias, team_id, name, source, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            [(norm, team_id, display, source, now) for norm in aliases],
+                        )
+                except sqlite3.Error as e:
+                    log.error(f"Error guardando alias de equipo '{name}': {e}")
+
+    def add_many(self, teams: Iterable[Dict[str, Any]], source: str = "import") -> int:
+        """
+        Importa equipos como {"id", "name", "aliases"} o con el formato de
+        API-FOOTBALL ({"team": {"id", "name", "code"}}).
+        """
+        count = 0
+        for entry in teams:
+            team = entry.get("team", entry)
+            team_id = team.get("id")
+            name = team.get("name")
+            if not team_id or not name:
+                continue
+            self.add(name, team_id, source=source)
+            for alias in list(entry.get("aliases") or []) + [team.get("code")]:
+                if alias:
+                    self.add(alias, team_id, canonical=name, source=source)
+            count += 1
+        return count
+
+    def lookup(self, name: str) -> Optional[Tuple[int, str, float]]:
+        """(team_id, nombre, puntuación) del mejor alias, o None si no hay uno claro."""
+        norm = normalize(name or "")
+        if not norm:
+            return None
+        if not self._loaded:
+            self.ensure_loaded()
+
+        exact, aliases, postings = self._index
+        hit = exact.get(norm)
+        if hit is not None:
+            self.exact_hits += 1
+            return hit[0], hit[1], 1.0
+
+        grams = trigrams(norm)
+        shared: Dict[int, int] = defaultdict(int)
+        for g in grams:
+            for pos in postings.get(g, ()):
+                shared[pos] += 1
+
+        # Dice sobre trigramas; el segundo mejor de otro equipo debe quedar lejos
+        best_pos, best, second = -1, 0.0, 0.0
+        n = len(grams)
+        for pos, common in shared.items():
+            score = 2.0 * common / (n + len(aliases[pos][1]))
+            if score > best:
+                if best_pos >= 0 and aliases[best_pos][2] != aliases[pos][2]:
+                    second = best
+                best_pos, best = pos, score
+            elif score > second and aliases[pos][2] != aliases[best_pos][2]:
+                second = score
+
+        if best_pos < 0 or best < self.threshold or best - second < self.margin:
+            self.misses += 1
+            return None
+        self.fuzzy_hits += 1
+        alias, _, team_id = aliases[best_pos]
+        return team_id, exact[alias][1], round(best, 4)
+
+    def resolve(self, name: str) -> Optional[int]:
+        hit = self.lookup(name)
+        return hit[0] if hit else None
+
+    def stats(self) -> Dict[str, Any]:
+        self.ensure_loaded()
+        aliases = self._index[1]
+        return {
+            "aliases": len(aliases),
+            "teams": len({t for _, _, t in aliases}),
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "misses": self.misses,
+            "threshold": self.threshold,
+        }
+
+
+# ==========================================
+#  IMPORTACIÓN
+# ==========================================
+def fetch_league_teams(base_url: str, api_key: str, league: int, season: int) -> List[Dict[str, Any]]:
+    """Equipos de una liga y temporada según API-FOOTBALL (/teams?league=&season=)."""
+    from http_client import get_session
+
+    r = get_session().get(
+        f"{base_url.rstrip('/')}/teams",
+        params={"league": league, "season": season},
+        headers={"x-apisports-key": api_key},
+        timeout=30,
+    )
+    return r.json().get("response") or []
+
+
+def _load_file(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("response") or data.get("teams") or []
+    return data
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+    db_path = os.getenv("DATAMIND_DB_PATH", "datamind_memory.db")
+    index = TeamIndex(db_path)
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+
+    if command == "import" and len(sys.argv) == 3:
+        print(f"Importados {index.add_many(_load_file(sys.argv[2]))} equipos")
+    elif command == "import-league" and len(sys.argv) == 4:
+        teams = fetch_league_teams(
+            os.getenv("API_FOOTBALL_BASE_URL", "https://v3.football.api-sports.io"),
+            os.getenv("API_FOOTBALL_KEY", "").strip(),
+            int(sys.argv[2]),
+            int(sys.argv[3]),
+        )
+        print(f"Importados {index.add_many(teams, source='league')} equipos")
+    elif command == "lookup" and len(sys.argv) == 3:
+        print(index.lookup(sys.argv[2]))
+    else:
+        print(__doc__)
+        sys.exit(1)
+    print(json.dumps(index.stats(), ensure_ascii=False))
@@ -0,0 +1,31 @@
+"""
+Rutas para pytest (los módulos de la raíz y el paquete de la app web como
+`app`, que en este checkout vive en logic/, igual que en benchmarks/) y el
+fixture `dm`: datamind_server con la DB en un directorio temporal.
+"""
+
+import os
+import sys
+import importlib
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from _bootstrap import setup_paths  # noqa: E402
+
+setup_paths()
+
+
+@pytest.fixture
+def dm(tmp_path, monkeypatch):
+    """datamind_server recargado con su DB en tmp_path (no toca la del repo)."""
+    import prediction_log
+    import datamind_server
+
+    monkeypatch.setenv("DATAMIND_DB_PATH", str(tmp_path / "datamind.db"))
+    # El escritor es único por proceso: uno nuevo para la DB temporal
+    monkeypatch.setattr(prediction_log, "_writer", None)
+    module = importlib.reload(datamind_server)
+    yield module
+    module.prediction_writer.close()
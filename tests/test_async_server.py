@@ -0,0 +1,112 @@
+"""
+/predict asíncrono: lo que trae la precarga (también los resultados vacíos)
+llega al builder, que no repite llamadas ni gasta cupo; un 503 lleva
+Retry-After como en el servidor Flask.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+import async_server  # noqa: E402
+from upstream import UpstreamUnavailable  # noqa: E402
+
+FIXTURE = {
+    "fixture": {"id": 9, "date": "2024-05-01T20:00:00", "venue": {"name": "Jalisco"}},
+    "league": {"id": 262, "name": "Liga MX", "season": 2024},
+    "teams": {"home": {"id": 1, "name": "Atlas"}, "away": {"id": 2, "name": "Chivas"}},
+}
+
+
+@pytest.fixture
+def setup(dm, monkeypatch):
+    monkeypatch.setattr(dm, "API_FOOTBALL_KEY", "key")
+    monkeypatch.setattr(dm, "detect_sport", lambda text: "futbol")
+
+    # Cupo gastado por el camino síncrono (builders)
+    acquired = []
+    monkeypatch.setattr(dm.upstream_scheduler, "acquire", lambda: acquired.append(1))
+
+    seen = {}
+
+    def build(sport, text):
+        fixture = dm.get_next_fixture(*dm.split_teams(text))
+        seen["fixture"] = fixture
+        seen["stats"] = dm.get_fixture_statistics(fixture)
+        return {"sport": sport, "prediction": "ok", "main_pick": "", "extra_info": {}}
+
+    monkeypatch.setattr(dm, "build_analysis", build)
+    return dm, acquired, seen
+
+
+def _predict(dm, monkeypatch, get):
+    client = async_server.AsyncFootballClient(api_key="key")
+    monkeypatch.setattr(client, "_get", get)
+
+    async def run():
+        try:
+            return await async_server.predict_async(client, {"query": "Atlas vs Chivas"})
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_builder_reuses_prefetched_data(setup, monkeypatch):
+    dm, acquired, seen = setup
+    paths = []
+
+    async def get(path, params, timeout):
+        paths.append(path)
+        if path == "/teams":
+            team_id = 1 if params["search"] == "Atlas" else 2
+            return {"response": [{"team": {"id": team_id, "name": params["search"]}}]}
+        if path == "/fixtures":
+            return {"response": [FIXTURE]}
+        return {"response": {"team": {"id": params["team"]}}}
+
+    status, body, headers = _predict(dm, monkeypatch, get)
+    assert status == 200 and headers == {}
+    assert sorted(paths) == ["/fixtures", "/teams", "/teams", "/teams/statistics", "/teams/statistics"]
+    assert seen["fixture"]["home_id"] == 1
+    assert seen["stats"] == ({"team": {"id": 1}}, {"team": {"id": 2}})
+    assert acquired == []
+
+
+def test_empty_results_are_not_fetched_again(setup, monkeypatch):
+    dm, acquired, seen = setup
+
+    async def get(path, params, timeout):
+        return {"response": []}
+
+    status, body, headers = _predict(dm, monkeypatch, get)
+    assert status == 200
+    assert seen["fixture"] == {}
+    assert acquired == []
+
+
+def test_prefetch_timeout_does_not_spend_quota_again(setup, monkeypatch):
+    dm, acquired, seen = setup
+    monkeypatch.setattr(dm, "PREDICT_DEADLINE_SECONDS", 0.05)
+
+    async def get(path, params, timeout):
+        await asyncio.sleep(1)
+        return {"response": []}
+
+    status, body, headers = _predict(dm, monkeypatch, get)
+    assert status == 200
+    assert acquired == []
+
+
+def test_unavailable_upstream_sends_retry_after(setup, monkeypatch):
+    dm, acquired, seen = setup
+
+    async def get(path, params, timeout):
+        raise UpstreamUnavailable("API-FOOTBALL respondió 503", 30)
+
+    status, body, headers = _predict(dm, monkeypatch, get)
+    assert status == 503
+    assert headers == {"Retry-After": "30"}
+    assert b"Retry-After: 30\r\n" in async_server._response(status, body, True, headers)
@@ -0,0 +1,70 @@
+import sqlite3
+
+from prediction_log import write_rows
+
+SCHEMA = """
+    CREATE TABLE predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TEXT, sport TEXT, raw_query TEXT, match_date TEXT, main_pick TEXT, extra_info TEXT
+    )
+"""
+
+
+def make_db(tmp_path):
+    path = str(tmp_path / "batch.db")
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.close()
+    return path
+
+
+def count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT count(*) FROM predictions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def rows_for(lines):
+    return [("2026-01-01T00:00:00", "futbol", f"consulta {n}", "", "Local", "{}") for n in lines]
+
+
+def test_repeated_chunk_is_not_inserted_twice(tmp_path):
+    path = make_db(tmp_path)
+    assert write_rows(path, rows_for([1, 2, 3]), batch_id="lote", lines=[1, 2, 3]) == 3
+    # Reanudación tras una interrupción: el bloque se repite con una línea nueva
+    assert write_rows(path, rows_for([2, 3, 4]), batch_id="lote", lines=[2, 3, 4]) == 1
+    assert count(path) == 4
+    # Otro lote con los mismos números de línea sí se guarda
+    assert write_rows(path, rows_for([1]), batch_id="otro", lines=[1]) == 1
+    assert count(path) == 5
+
+
+def test_without_batch_id_inserts_everything(tmp_path):
+    path = make_db(tmp_path)
+    write_rows(path, rows_for([1, 2]))
+    write_rows(path, rows_for([1, 2]))
+    assert count(path) == 4
+
+
+def test_completed_lines_trims_a_partial_last_line(tmp_path):
+    from batch_predict import completed_lines
+
+    out = tmp_path / "out.ndjson"
+    out.write_bytes(b'{"line": 1}\n{"line": 3}\nno es json\n{"line": 4, "qu')
+    assert completed_lines(str(out)) == {1, 3}
+    assert out.read_bytes() == b'{"line": 1}\n{"line": 3}\nno es json\n'
+    assert completed_lines(str(out)) == {1, 3}
+    assert completed_lines(str(tmp_path / "no_existe.ndjson")) == set()
+
+
+def test_submit_after_close_is_rejected(tmp_path):
+    from prediction_log import PredictionLogWriter
+
+    writer = PredictionLogWriter(make_db(tmp_path), flush_interval=0.01)
+    assert writer.submit(rows_for([1])[0])
+    writer.close()
+    assert count(writer.db_path) == 1
+    assert not writer.submit(rows_for([2])[0])
+    assert writer.stats()["dropped"] == 1
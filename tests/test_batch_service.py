@@ -0,0 +1,41 @@
+"""
+Motor por lotes: un item no válido devuelve su propio error y el resto
+del lote se calcula igual que en el endpoint individual.
+"""
+
+from app.datamind.services.batch_service import analyze_batch
+
+
+def test_invalid_items_get_per_item_errors():
+    items = [
+        {"name": "José Peña", "birthdate": "1990-05-17"},
+        {"name": 10},
+        {"name": "Messi", "text": ["a", "b"]},
+        "Messi",
+        {"name": None, "text": "Messi 10"},
+    ]
+    results = analyze_batch(items)
+
+    assert len(results) == len(items)
+    assert results[1] == {"error": "Campo 'name' debe ser texto"}
+    assert results[2] == {"error": "Campo 'text' debe ser texto"}
+    assert results[3] == {"error": "Se espera un objeto"}
+    assert results[0] == analyze_batch([items[0]])[0]
+    assert results[0]["name"] == "José Peña"
+    assert results[4]["text"] == "Messi 10"
+
+
+def test_batch_endpoint_does_not_fail_whole_batch(tmp_path):
+    from app.app import create_app
+
+    client = create_app(pattern_memory_db=str(tmp_path / "memory.db")).test_client()
+    resp = client.post("/datamind/analyze/batch", json={"items": [{"name": 7}, {"name": "Ana"}]})
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert body["count"] == 2
+    assert body["errors"] == 1
+    assert body["datamind"][0] == {"error": "Campo 'name' debe ser texto"}
+    assert body["datamind"][1]["name"] == "Ana"
+
+    resp = client.post("/datamind/analyze/batch", json={"items": {"name": "Ana"}})
+    assert resp.status_code == 400
@@ -0,0 +1,109 @@
+"""
+fast_json frente a json.dumps(separators=(",", ":")): escapes de
+ensure_ascii (fuera del BMP, DEL, barras invertidas), floats que orjson
+escribe distinto, enteros grandes y NaN/Infinity (siempre null).
+"""
+
+import json
+import math
+import random
+import dataclasses
+
+import pytest
+
+import fast_json
+
+STRINGS = [
+    "José Peña", "€", "😀", "𝄞 clave", "a\x7fb", "\x00\x1f\n\t", "\\", "\\é", "\\😀",
+    '"comillas"', "/", "  ", "퟿￿", "\\U0001f600", "\\xe9", "",
+]
+FLOATS = [
+    0.0, -0.0, 0.1, 1.5, 100.0, 1e15, 1e16, 1e20, 1e21, 1e22, 1e-5, 1e-7, 0.0001, 0.00001,
+    2.5e-10, 123456789.123, 5e-324, 1.7976931348623157e308, -1e100,
+]
+INTS = [0, -1, 2 ** 63 - 1, 2 ** 64, -(2 ** 70)]
+
+
+def reference(obj, ensure_ascii=False, sort_keys=False, indent=False):
+    return json.dumps(
+        obj,
+        ensure_ascii=ensure_ascii,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    )
+
+
+def _random(rnd, depth=0):
+    kind = rnd.randint(0, 5 if depth < 3 else 3)
+    if kind == 0:
+        return "".join(rnd.choice(STRINGS) for _ in range(rnd.randint(0, 3)))
+    if kind == 1:
+        return rnd.choice(FLOATS) * rnd.choice((1, -1, 3.3))
+    if kind == 2:
+        return rnd.choice(INTS + [rnd.randint(-10 ** 6, 10 ** 6)])
+    if kind == 3:
+        return rnd.choice((None, True, False))
+    if kind == 4:
+        return [_random(rnd, depth + 1) for _ in range(rnd.randint(0, 4))]
+    return {rnd.choice(STRINGS): _random(rnd, depth + 1) for _ in range(rnd.randint(0, 4))}
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+@pytest.mark.parametrize("sort_keys", [True, False])
+def test_same_bytes_as_stdlib(ensure_ascii, sort_keys):
+    for value in STRINGS + FLOATS + INTS:
+        obj = {"v": value, "l": [value], value if isinstance(value, str) else "k": 1}
+        assert fast_json.dumps(obj, ensure_ascii=ensure_ascii, sort_keys=sort_keys) == reference(
+            obj, ensure_ascii, sort_keys
+        ), repr(value)
+
+    rnd = random.Random(5)
+    for _ in range(3000):
+        obj = _random(rnd)
+        if any(isinstance(v, float) and not math.isfinite(v) for v in _floats(obj)):
+            continue
+        assert fast_json.dumps(obj, ensure_ascii=ensure_ascii, sort_keys=sort_keys) == reference(
+            obj, ensure_ascii, sort_keys
+        ), repr(obj)
+
+
+def _floats(obj):
+    if isinstance(obj, float):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _floats(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _floats(v)
+
+
+def test_indent_matches_stdlib():
+    obj = {"nombre": "Zoé 😀", "n": [1, 2.5, {"x": None}]}
+    assert fast_json.dumps(obj, indent=True) == reference(obj, indent=True)
+    assert fast_json.dumps(obj, indent=True, ensure_ascii=True) == reference(obj, ensure_ascii=True, indent=True)
+
+
+@pytest.mark.parametrize("with_orjson", [True, False])
+def test_nan_and_infinity_are_null(monkeypatch, with_orjson):
+    if not with_orjson:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    nan, inf = float("nan"), float("inf")
+    assert fast_json.dumps({"a": nan, "b": [inf, -inf]}) == '{"a":null,"b":[null,null]}'
+    # 1e+20 obliga a pasar por la stdlib también con orjson
+    assert fast_json.dumps({"a": nan, "b": 1e20}) == '{"a":null,"b":1e+20}'
+    assert fast_json.loads(fast_json.dumps([nan])) == [None]
+
+
+def test_dataclasses_and_round_trip():
+    @dataclasses.dataclass
+    class Punto:
+        x: float
+        y: str
+
+    assert fast_json.dumps(Punto(1e-7, "é"), ensure_ascii=True) == '{"x":1e-07,"y":"\\u00e9"}'
+    assert fast_json.dumps(Punto(float("nan"), "é")) == '{"x":null,"y":"é"}'
+    obj = {"s": "😀\\x", "f": 0.00001, "i": 2 ** 64}
+    assert fast_json.loads(fast_json.dumps(obj, ensure_ascii=True)) == obj
+    assert fast_json.loads(memoryview(fast_json.dumps_bytes(obj))) == obj
@@ -0,0 +1,112 @@
+"""
+Gematría unificada (gematria_core) frente a las versiones que sustituye.
+En texto ASCII todas coinciden con la anterior; con acentos, Ñ o ß el
+resultado cambia a propósito (reglas en gematria_core).
+"""
+
+import re
+import random
+import unicodedata
+
+import pytest
+
+from app.datamind.services.gematria_core import gematria_value, gematria_values, letters_value, _slow_sum
+from app.datamind.services.gematria_service import gematria_value as service_value
+from app.datamind.services.numerology_service import numerology_from_name
+from app.datamind.services.batch_service import analyze_batch
+from app.logic import predictor
+from app.logic.utils import simple_gematria
+
+# ---------- versiones anteriores (copiadas tal cual) ----------
+LETTER_MAP = {chr(i + 65): i + 1 for i in range(26)}
+
+
+def legacy_gematria(text):
+    text = re.sub(r"[^A-Za-z0-9ÁÉÍÓÚáéíóúÑñ ]", "", text).strip().upper()
+    total = 0
+    for ch in text:
+        if ch.isalpha():
+            total += LETTER_MAP.get(ch, 0)
+        elif ch.isdigit():
+            total += int(ch)
+    return total
+
+
+def legacy_name(name):
+    return sum(ord(c.upper()) - 64 for c in name if c.isalpha())
+
+
+def legacy_simple(text):
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return sum(letters.index(c) + 1 for c in text.upper() if c in letters)
+
+
+ASCII = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 -.,'!?"
+ASCII_LETTERS = ASCII[:52] + " -.,'!?"
+ACCENTED = "áéíóúÁÉÍÓÚñÑüÜçÇàèìòùâêîôûãõ"
+FOLD = {ch: unicodedata.normalize("NFKD", ch)[0] for ch in ACCENTED}
+EXTRA = "ß中ΩЖ😀ﬁµ²ªºᵃＡ"
+
+
+def random_texts(seed, alphabet, count=2000, length=30):
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, length))) for _ in range(count)]
+
+
+SAMPLES = random_texts(7, ASCII + ACCENTED + EXTRA)
+
+
+def test_ascii_matches_legacy_text_gematria():
+    for text in random_texts(1, ASCII):
+        expected = legacy_gematria(text)
+        assert gematria_value(text) == service_value(text) == predictor.gematria_value(text) == expected, text
+        if text:
+            assert predictor.numerology_from_name(text).name_value == expected, text
+        assert simple_gematria(text) == letters_value(text) == legacy_simple(text), text
+
+
+def test_ascii_names_without_digits_match_legacy_numerology():
+    for text in random_texts(2, ASCII_LETTERS):
+        assert numerology_from_name(text).name_value == legacy_name(text), text
+
+
+def test_name_numerology_now_counts_digits():
+    # Antes /datamind/analyze ignoraba los dígitos del nombre y /analyze no
+    assert legacy_name("Messi 10") == 65
+    assert numerology_from_name("Messi 10").name_value == 66
+    assert predictor.numerology_from_name("Messi 10").name_value == 66
+
+
+def test_properties():
+    for s, t in zip(SAMPLES, reversed(SAMPLES)):
+        value = gematria_value(s)
+        assert value == _slow_sum(s, {}, True), s
+        assert gematria_value(s + t) == value + gematria_value(t), (s, t)
+        assert gematria_value("".join(c.upper() if len(c.upper()) == 1 else c for c in s)) == value, s
+        assert gematria_value("".join(FOLD.get(c, c) for c in s)) == value, s
+        assert letters_value(s) == value - sum(int(c) for c in s if "0" <= c <= "9"), s
+
+
+def test_batch_matches_scalar():
+    assert gematria_values(SAMPLES) == [gematria_value(s) for s in SAMPLES]
+    items = [{"name": s, "text": t} for s, t in zip(SAMPLES, reversed(SAMPLES))]
+    for item, result in zip(items, analyze_batch(items)):
+        assert result.gematria == gematria_value(result.text), item
+        if result.name:
+            assert result.numerology.by_name.name_value == numerology_from_name(result.name).name_value, item
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", 0), ("ABC", 6), ("abc", 6), ("Messi 10", 66), ("José", 49), ("JOSE", 49),
+    ("PEÑA", 36), ("Ñandú", 54), ("ñ", 14), ("Müller", 81), ("Ç", 3), ("ß", 0), ("Straße", 63),
+    ("ﬁ", 15), ("中国", 0), ("Ωmega", 26), ("L'Hôpital", 93),
+    ("ª", 0), ("º", 0), ("1ª división", 1 + gematria_value("division")), ("2º", 2), ("ᵃ", 0), ("Ａ", 1),
+])
+def test_examples(text, expected):
+    assert gematria_value(text) == expected
+
+
+def test_eszett_no_longer_fails():
+    with pytest.raises(TypeError):
+        legacy_name("Straße")
+    assert numerology_from_name("Straße").name_value == 63
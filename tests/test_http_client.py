@@ -0,0 +1,25 @@
+import pytest
+
+from http_client import run_parallel
+from upstream import UpstreamUnavailable
+
+
+def unavailable():
+    raise UpstreamUnavailable("sin proveedor")
+
+
+def broken():
+    raise ValueError("respuesta rara")
+
+
+def test_failures_become_default():
+    assert run_parallel([lambda: 1, broken], default=0) == [1, 0]
+    assert run_parallel([broken], default=0) == [0]
+
+
+@pytest.mark.parametrize("calls", [[unavailable], [lambda: 1, unavailable]])
+def test_reraise_propagates_upstream_outage(calls):
+    with pytest.raises(UpstreamUnavailable):
+        run_parallel(calls, reraise=(UpstreamUnavailable,))
+    # Sin reraise se sigue tratando como un fallo cualquiera
+    assert run_parallel(calls)[-1] is None
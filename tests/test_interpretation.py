@@ -0,0 +1,45 @@
+"""
+data/cycles.json llega a la salida a través de las plantillas "cycle" y se
+recarga en caliente como las reglas.
+"""
+
+import json
+import shutil
+
+import pytest
+
+import config
+from app.datamind.services import interpretation_service
+
+
+@pytest.fixture
+def cycles_file(tmp_path, monkeypatch):
+    path = tmp_path / "cycles.json"
+    shutil.copy(config.CYCLES_FILE, path)
+    monkeypatch.setenv("INTERPRETATION_CYCLES_FILE", str(path))
+    interpretation_service.reload_rules()
+    yield path
+    monkeypatch.delenv("INTERPRETATION_CYCLES_FILE")
+    interpretation_service.reload_rules()
+
+
+def test_cycle_meaning_follows_the_birth_block(cycles_file):
+    result = interpretation_service.build_interpretation({"name_core": 7}, {"birth_core": 5}, 0)
+    assert result.details == (
+        "Vibración del nombre: 7.",
+        "Energía introspectiva y espiritual.",
+        "Camino de vida: 5.",
+        "Camino de libertad y transformación.",
+        "Ciclo 5: Cambio, movimiento.",
+    )
+    # Los números maestros no tienen significado en cycles.json
+    assert interpretation_service.build_interpretation({}, {"birth_core": 11}, 0).details == ("Camino de vida: 11.",)
+
+
+def test_editing_cycles_reloads(cycles_file, monkeypatch):
+    cycles = json.loads(cycles_file.read_text(encoding="utf-8"))
+    cycles["4"] = "Cimientos"
+    cycles_file.write_text(json.dumps(cycles, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(interpretation_service, "RULES_CHECK_SECONDS", 0)
+    engine = interpretation_service.get_engine()
+    assert engine.predictor(0, 4).details == ("Camino de vida 4.", "Ciclo 4: Cimientos.")
@@ -0,0 +1,11 @@
+def test_dropped_prediction_is_not_observed(dm, monkeypatch):
+    dm.ensure_db()
+    dm.learning.refresh()
+    before = dm.learning.observed
+    monkeypatch.setattr(dm.prediction_writer, "submit", lambda row, block=True: False)
+    dm.log_prediction("futbol", "A vs B", "", "Local", {"fixture": {"home_id": 1, "away_id": 2}})
+    assert dm.learning.observed == before
+
+    monkeypatch.setattr(dm.prediction_writer, "submit", lambda row, block=True: True)
+    dm.log_prediction("futbol", "A vs B", "", "Local", {"fixture": {"home_id": 1, "away_id": 2}})
+    assert dm.learning.observed == before + 1
@@ -0,0 +1,45 @@
+import os
+import json
+
+from app.logic.pattern_memory import PatternMemory, open_memory
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "memory_log.json"
+    legacy.write_text(json.dumps([{"name": "Ana", "core": 3, "keyword": "exito"}]), encoding="utf-8")
+    db = str(tmp_path / "memory.db")
+    assert open_memory(db, str(legacy)).count() == 1
+    memory = open_memory(db, str(legacy))
+    assert memory.count() == 1
+    memory.append({"name": "Ana", "core": 7})
+    assert [r["core"] for r in memory.find(name="ANA")] == [7, 3]
+
+
+def test_reopens_connection_after_fork(tmp_path):
+    memory = PatternMemory(str(tmp_path / "memory.db"))
+    memory.append({"name": "padre", "core": 1})
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        memory.append({"name": "hijo", "core": 2})
+        os.write(write_fd, str(memory.count()).encode())
+        os._exit(0)
+    os.close(write_fd)
+    child = os.read(read_fd, 16).decode()
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child == "2"
+    assert memory.count() == 2
+    assert memory.find(core=2)[0]["name"] == "hijo"
+
+
+def test_analyze_appends_to_the_given_database(tmp_path):
+    from app.app import create_app
+
+    db = str(tmp_path / "memory.db")
+    client = create_app(pattern_memory_db=db).test_client()
+    assert client.post("/analyze", json={"name": "Zoé", "birthdate": "1990-05-17"}).status_code == 200
+    items = client.get("/patterns?name=zoé").get_json()["items"]
+    assert [r["numerology"]["by_name"]["name"] for r in items] == ["Zoé"]
+    assert len(PatternMemory(db).find(name="Zoé")) == 1
@@ -0,0 +1,40 @@
+import os
+
+from scheduler import Scheduler, ProcessLock
+
+
+def test_shutdown_hooks_survive_fork():
+    sched = Scheduler("test-scheduler")
+    sched.on_shutdown(lambda: None)
+    sched.add("job", lambda: None, 60)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, f"{len(sched._shutdown_hooks)} {len(sched._jobs)}".encode())
+        os._exit(0)
+    os.close(write_fd)
+    child = os.read(read_fd, 64).decode()
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child == "1 0"
+
+
+def test_stop_runs_hooks_once():
+    calls = []
+    sched = Scheduler("test-scheduler")
+    sched.on_shutdown(lambda: calls.append(1))
+    sched.start()
+    sched.stop()
+    sched.stop()
+    assert calls == [1]
+
+
+def test_process_lock_single_holder(tmp_path):
+    path = str(tmp_path / "background.lock")
+    first, second = ProcessLock(path), ProcessLock(path)
+    assert first.try_acquire() and first.held
+    assert not second.try_acquire() and not second.held
+    os.close(first._fd)
+    first._fd = None
+    assert second.try_acquire()
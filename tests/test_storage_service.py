@@ -0,0 +1,73 @@
+"""
+Historial: paginación por clave con filtros de tipo y de fecha, y
+exportación NDJSON con el mismo recorrido.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import text  # noqa: E402
+
+from app.datamind.services import storage_service  # noqa: E402
+
+
+@pytest.fixture
+def history(tmp_path):
+    storage_service.init_db(f"sqlite:///{tmp_path / 'history.db'}")
+    rows = []
+    with storage_service._engine.begin() as conn:
+        for i in range(300):
+            # Fechas repetidas y no monótonas respecto al id
+            created = f"2024-01-{(i * 7) % 28 + 1:02d}T00:00:00"
+            kind = "a" if i % 3 else "b"
+            conn.execute(
+                text("INSERT INTO analyses (kind, input_json, output_json, created_at) VALUES (:k, '{}', '{}', :c)"),
+                {"k": kind, "c": created},
+            )
+            rows.append((created, i + 1, kind))
+    yield rows
+    storage_service._engine.dispose()
+    storage_service._engine = None
+
+
+def _pages(limit, **filters):
+    ids, cursor = [], None
+    while True:
+        page = storage_service.get_history_page(limit=limit, cursor=cursor, fields=("id",), **filters)
+        ids.extend(r.id for r in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("kind", [None, "a"])
+def test_time_range_pages_cover_the_range_once(history, kind):
+    since, until = "2024-01-05", "2024-01-20"
+    expected = sorted(
+        (r for r in history if since <= r[0] < until and (kind is None or r[2] == kind)),
+        reverse=True,
+    )
+    assert _pages(7, kind=kind, since=since, until=until) == [r[1] for r in expected]
+
+    exported = "".join(storage_service.export_history_ndjson(kind=kind, since=since, until=until,
+                                                             fields=("id",), batch_size=11))
+    assert [int(line[7:-1]) for line in exported.splitlines()] == [r[1] for r in reversed(expected)]
+
+
+def test_id_pages_without_dates(history):
+    assert _pages(50) == list(range(300, 0, -1))
+    assert _pages(50, kind="b") == [r[1] for r in reversed(history) if r[2] == "b"]
+
+
+def test_time_range_query_uses_an_index(history):
+    with storage_service._engine.connect() as conn:
+        plan = " ".join(
+            str(row[-1]) for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM analyses WHERE "
+                "(created_at, id) < ((SELECT created_at FROM analyses WHERE id = 100), 100) "
+                "AND created_at >= '2024-01-05' ORDER BY created_at DESC, id DESC LIMIT 10"
+            ))
+        )
+    assert "SEARCH analyses USING COVERING INDEX idx_analyses_created_id" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,80 @@
+import random
+import string
+import threading
+
+from team_index import TeamIndex
+
+
+def test_refresh_sees_aliases_from_other_process(tmp_path):
+    path = str(tmp_path / "teams.db")
+    reader = TeamIndex(path)
+    writer = TeamIndex(path)
+    assert reader.resolve("Chivas") is None
+    assert not reader.refresh()
+
+    writer.add("Chivas", 2282, canonical="Guadalajara Chivas", source="prefetch")
+    assert reader.resolve("Chivas") is None
+    assert reader.refresh()
+    assert reader.resolve("chivas") == 2282
+    assert not reader.refresh()
+
+
+def test_refresh_without_db():
+    index = TeamIndex()
+    index.add("América", 2287)
+    assert not index.refresh()
+    assert index.resolve("Club America") == 2287
+
+
+def test_lookup_during_reload(tmp_path):
+    path = str(tmp_path / "teams.db")
+    index = TeamIndex(path)
+    rnd = random.Random(3)
+    names = ["".join(rnd.choice(string.ascii_lowercase) for _ in range(12)) for _ in range(2000)]
+    index.add_many({"id": 1000 + i, "name": name} for i, name in enumerate(names))
+
+    stop = threading.Event()
+
+    def reload_loop():
+        while not stop.is_set():
+            index.reload()
+
+    thread = threading.Thread(target=reload_loop)
+    thread.start()
+    try:
+        for _ in range(2):
+            for i, name in enumerate(names):
+                assert index.resolve(name) == 1000 + i
+                assert index.resolve(name[:5] + name[6:]) == 1000 + i
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_refresh_sees_replaced_latest_alias(tmp_path):
+    path = str(tmp_path / "teams.db")
+    reader = TeamIndex(path)
+    writer = TeamIndex(path)
+    writer.add("Chivas", 2282)
+    assert reader.refresh()
+    # REPLACE de la última fila puede reutilizar su rowid: cuenta updated_at
+    writer.add("Chivas", 9999)
+    assert reader.refresh()
+    assert reader.resolve("Chivas") == 9999
+
+
+def test_refresh_marker_does_not_scan(tmp_path):
+    index = TeamIndex(str(tmp_path / "teams.db"))
+    plan = index._db().execute(
+        "EXPLAIN QUERY PLAN SELECT (SELECT max(rowid) FROM team_index), (SELECT max(updated_at) FROM team_index)"
+    ).fetchall()
+    assert not any(row[-1].startswith("SCAN team_index") for row in plan)
+
+
+def test_updating_an_alias_keeps_one_entry():
+    index = TeamIndex()
+    index.add("América", 2287)
+    index.add("Club America", 2288)
+    aliases = index._index[1]
+    assert [a for a in aliases if a[0] == "america"] == [("america", aliases[0][1], 2288)]
+    assert index.resolve("Américaa") == 2288
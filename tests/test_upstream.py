@@ -0,0 +1,41 @@
+import upstream
+from upstream import TokenBucket, UpstreamScheduler
+
+
+def test_header_limit_keeps_worker_share():
+    client = UpstreamScheduler("http://upstream.invalid", {}, rate_per_minute=300 / 4, share=4)
+    client.check_response(200, {"X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "200"}, {})
+    stats = client.bucket.stats()
+    assert stats["rate_per_minute"] == 75
+    assert stats["capacity"] == 75
+    assert stats["tokens"] <= 50
+
+
+def test_header_limit_can_only_lower_the_rate():
+    bucket = TokenBucket(10)
+    bucket.update(30, 5)
+    assert bucket.stats()["rate_per_minute"] == 10
+    assert bucket.stats()["capacity"] == 10
+    assert bucket.stats()["tokens"] <= 5
+
+    bucket.update(6, None)
+    assert bucket.stats()["rate_per_minute"] == 6
+    assert bucket.stats()["capacity"] == 6
+    # Si el proveedor vuelve a subir la cuota, hasta lo configurado
+    bucket.update(30, None)
+    assert bucket.stats()["rate_per_minute"] == 10
+
+
+def test_header_limit_above_worker_share_is_capped():
+    client = UpstreamScheduler("http://upstream.invalid", {}, rate_per_minute=20, share=4)
+    client.check_response(200, {"X-RateLimit-Limit": "300"}, {})
+    assert client.bucket.stats()["rate_per_minute"] == 20
+
+
+def test_from_env_splits_quota(monkeypatch):
+    monkeypatch.setenv("DATAMIND_WORKERS", "3")
+    monkeypatch.setenv("API_FOOTBALL_RATE_PER_MINUTE", "90")
+    client = upstream.from_env("http://upstream.invalid", {})
+    assert client.bucket.stats()["rate_per_minute"] == 30
+    client.bucket.update(90, None)
+    assert client.bucket.stats()["rate_per_minute"] == 30
@@ -0,0 +1,437 @@
+import os
+import time
+import heapq
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from http_client import get_session, remaining, request_timeout
+
+log = logging.getLogger("DataMind")
+
+# Prioridades (menor = antes)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 5
+PRIORITY_BACKGROUND = 10
+
+
+# ==========================================
+#  ERRORES
+# ==========================================
+class UpstreamUnavailable(Exception):
+    """El proveedor no puede atender ahora; conviene servir datos antiguos."""
+
+    def __init__(self, message: str, retry_after: float = 0.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimited(UpstreamUnavailable):
+    pass
+
+
+class CircuitOpen(UpstreamUnavailable):
+    pass
+
+
+# ==========================================
+#  PRIORIDAD POR CONTEXTO
+# ==========================================
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "datamind_upstream_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Prioridad de las llamadas a API-FOOTBALL hechas dentro del bloque."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# ==========================================
+#  TOKEN BUCKET CON COLA DE PRIORIDAD
+# ==========================================
+class TokenBucket:
+    """
+    Cubo de fichas por minuto. Quien espera ficha hace cola por prioridad
+    (y por orden de llegada dentro de la misma prioridad). Las cabeceras de
+    cuota del proveedor sólo pueden bajar las fichas disponibles: la cuota
+    es de la cuenta, no de este proceso. Con `share` procesos repartiéndose
+    la cuenta, a este le toca 1/share de lo que digan las cabeceras.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None, share: int = 1) -> None:
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or rate_per_minute)
+        # Lo configurado es el techo: las cabeceras no lo suben
+        self.max_rate = self.rate
+        self.max_capacity = self.capacity
+        self.share = max(1, share)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _wait_for_token(self, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate if self.rate > 0 else 60.0)
+        return wait
+
+    def acquire(self, level: int, timeout: float) -> bool:
+        """Espera una ficha como mucho `timeout` segundos."""
+        give_up = time.monotonic() + max(0.0, timeout)
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._wait_for_token(now)
+                    if wait <= 0 and self._waiters[0] == entry:
+                        heapq.heappop(self._waiters)
+                        self.tokens -= 1
+                        return True
+                    left = give_up - now
+                    if left <= 0:
+                        return False
+                    # Si hay ficha pero no es nuestro turno, esperamos al aviso
+                    self._cond.wait(min(left, wait) if wait > 0 else left)
+            finally:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                self._cond.notify_all()
+
+    def try_acquire(self, level: int) -> float:
+        """Sin esperar: 0 si se obtuvo ficha, o segundos hasta poder reintentar."""
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_for_token(now)
+            if wait <= 0 and (not self._waiters or self._waiters[0][0] > level):
+                self.tokens -= 1
+                return 0.0
+            return max(wait, 0.05)
+
+    def update(self, limit: Optional[int], left: Optional[int]) -> None:
+        """Ajusta el ritmo y las fichas a las cabeceras por minuto del proveedor."""
+        with self._cond:
+            self._refill(time.monotonic())
+            if limit:
+                self.rate = min(self.max_rate, limit / self.share / 60.0)
+                self.capacity = min(self.max_capacity, float(limit) / self.share)
+                self.tokens = min(self.tokens, self.capacity)
+            if left is not None:
+                self.tokens = min(self.tokens, float(left) / self.share)
+
+    def block(self, seconds: float) -> None:
+        """No entrega fichas durante `seconds` (429, cuota diaria agotada...)."""
+        with self._cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            self._refill(time.monotonic())
+            return {
+                "tokens": round(self.tokens, 3),
+                "capacity": self.capacity,
+                "rate_per_minute": round(self.rate * 60, 3),
+                "waiting": len(self._waiters),
+                "blocked_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+            }
+
+
+# ==========================================
+#  CIRCUIT BREAKER
+# ==========================================
+class CircuitBreaker:
+    """
+    Cerrado → abierto tras `failure_threshold` fallos seguidos; abierto
+    rechaza al instante durante `reset_timeout` s; después deja pasar una
+    sola llamada de prueba (semiabierto) que decide si se vuelve a cerrar.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial = False
+            if self.state == "half_open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._trial = False
+
+    def release(self) -> None:
+        """La llamada de prueba terminó sin veredicto (p. ej. sin ficha): otra podrá probar."""
+        with self._lock:
+            if self.state == "half_open":
+                self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opens += 1
+                    log.warning(f"Circuito de API-FOOTBALL abierto tras {self.failures} fallos")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial = False
+
+
+# ==========================================
+#  PLANIFICADOR DE LLAMADAS
+# ==========================================
+class _InFlight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _seconds_to_utc_midnight() -> float:
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+class UpstreamScheduler:
+    """
+    Todas las llamadas GET a API-FOOTBALL pasan por aquí:
+    - Peticiones idénticas en curso se unen en una sola (single-flight).
+    - Cada llamada necesita una ficha del TokenBucket; se espera por
+      prioridad como mucho `max_wait` s (o lo que quede del plazo).
+    - 429, errores de cuota, 5xx y fallos de red alimentan el circuit breaker.
+    Cuando no hay ficha a tiempo o el circuito está abierto se lanza
+    UpstreamUnavailable para que la caché sirva el último dato conocido.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        rate_per_minute: float = 10,
+        max_wait: float = 5.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        share: int = 1,
+    ) -> None:
+        """`rate_per_minute` ya es la parte de este proceso; `share`, entre cuántos se reparte la cuenta."""
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate_per_minute, share=share)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._inflight: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], _InFlight] = {}
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.failures = 0
+
+    # ---------- admisión ----------
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpen("API-FOOTBALL no disponible (circuito abierto)", self.breaker.retry_after())
+
+    def _wait_budget(self) -> float:
+        left = remaining()
+        return self.max_wait if left is None else max(0.0, min(self.max_wait, left))
+
+    def _no_token(self) -> UpstreamUnavailable:
+        self.rate_limited += 1
+        wait = self.bucket.stats()
+        return RateLimited(
+            "Cuota de API-FOOTBALL agotada por ahora",
+            max(wait["blocked_seconds"], 60.0 / max(wait["rate_per_minute"], 1e-6)),
+        )
+
+    def acquire(self) -> None:
+        """Circuito + ficha para una llamada (bloqueante, por prioridad)."""
+        self._admit()
+        if not self.bucket.acquire(_priority.get(), self._wait_budget()):
+            self.breaker.release()
+            raise self._no_token()
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> None:
+        """Versión para asyncio: reintenta sin bloquear el bucle."""
+        import asyncio  # sólo el servidor asíncrono lo necesita
+
+        self._admit()
+        loop = asyncio.get_running_loop()
+        give_up = loop.time() + (self.max_wait if timeout is None else timeout)
+        level = _priority.get()
+        while True:
+            wait = self.bucket.try_acquire(level)
+            if wait <= 0:
+                return
+            if loop.time() + wait > give_up:
+                self.breaker.release()
+                raise self._no_token()
+            await asyncio.sleep(wait)
+
+    # ---------- respuesta ----------
+    def check_response(self, status: int, headers: Mapping[str, str], data: Any) -> Any:
+        """Aplica cabeceras de cuota y errores del proveedor; devuelve `data`."""
+        self.bucket.update(
+            _header_int(headers, "X-RateLimit-Limit"), _header_int(headers, "X-RateLimit-Remaining")
+        )
+        if _header_int(headers, "x-ratelimit-requests-remaining") == 0:
+            self.bucket.block(_seconds_to_utc_midnight())
+
+        if status == 429:
+            retry_after = float(_header_int(headers, "Retry-After") or 60)
+            self.bucket.block(retry_after)
+            self.rate_limited += 1
+            self.breaker.record_failure()
+            raise RateLimited("API-FOOTBALL respondió 429", retry_after)
+        if status >= 500:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise UpstreamUnavailable(f"API-FOOTBALL respondió {status}", self.breaker.retry_after())
+
+        # API-FOOTBALL informa de la cuota en el cuerpo con HTTP 200
+        errors = data.get("errors") if isinstance(data, dict) else None
+        if isinstance(errors, dict) and ("rateLimit" in errors or "requests" in errors):
+            seconds = 60.0 if "rateLimit" in errors else _seconds_to_utc_midnight()
+            self.bucket.block(seconds)
+            self.rate_limited += 1
+            raise RateLimited(f"Cuota de API-FOOTBALL: {errors}", seconds)
+
+        self.breaker.record_success()
+        return data
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.breaker.record_failure()
+
+    # ---------- llamadas ----------
+    def _fetch(self, path: str, params: Dict[str, Any], timeout: float) -> Any:
+        import requests  # ya cargado por get_session(); no se importa al arrancar
+
+        # Con el plazo agotado no se gasta cupo ni se espera turno
+        request_timeout(timeout)
+        self.acquire()
+        self.requests += 1
+        try:
+            try:
+                r = get_session().get(
+                    f"{self.base_url}{path}",
+                    params=params,
+                    headers=self.headers,
+                    timeout=request_timeout(timeout),
+                )
+                data = r.json() if r.status_code < 500 and r.status_code != 429 else None
+            except (requests.RequestException, ValueError) as e:
+                self.record_failure()
+                raise UpstreamUnavailable(
+                    f"Error de red con API-FOOTBALL: {e}", self.breaker.retry_after()
+                ) from e
+            return self.check_response(r.status_code, r.headers, data)
+        finally:
+            self.breaker.release()
+
+    def get_json(self, path: str, params: Dict[str, Any], timeout: float = 15) -> Any:
+        """GET a `path` con una sola llamada real por petición idéntica en curso."""
+        key = (path, tuple(sorted(params.items())))
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _InFlight()
+
+        if not leader:
+            self.coalesced += 1
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self._fetch(path, params, timeout)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "circuit_open": int(self.breaker.state != "closed"),
+            "circuit_opens": self.breaker.opens,
+            **self.bucket.stats(),
+        }
+
+
+def from_env(base_url: str, headers: Dict[str, str]) -> UpstreamScheduler:
+    # La cuota es de la cuenta: con varios workers (gunicorn.conf.py) cada
+    # proceso se queda con su parte
+    workers = max(1, int(os.getenv("DATAMIND_WORKERS", 1)))
+    return UpstreamScheduler(
+        base_url,
+        headers,
+        rate_per_minute=float(os.getenv("API_FOOTBALL_RATE_PER_MINUTE", 10)) / workers,
+        max_wait=float(os.getenv("API_FOOTBALL_MAX_WAIT", 5)),
+        failure_threshold=int(os.getenv("API_FOOTBALL_BREAKER_FAILURES", 5)),
+        reset_timeout=float(os.getenv("API_FOOTBALL_BREAKER_RESET", 30)),
+        share=workers,
+    )